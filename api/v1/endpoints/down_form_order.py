@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, Query, Body
+import os
+import orjson
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Query, Body, HTTPException
+from fastapi.responses import Response, FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Literal
 from core.db import get_async_session
 from services.order.down_form_order_read_service import DownFormOrderReadService
 from services.order.down_form_order_create_service import DownFormOrderCreateService
+from services.order.down_form_order_excel_export_service import DownFormOrderExcelExportService
 from schemas.order.request.down_form_order_request import DownFormOrderCreate, DownFormOrderUpdate, DownFormOrderDelete
 from schemas.order.response.down_form_order_response import DownFormOrderListResponse, DownFormOrderBulkResponse, DownFormOrderItem
 from schemas.order.down_form_order_dto import DownFormOrderDto
@@ -46,6 +52,58 @@ async def list_down_form_orders(
         }]
     )
 
+def _orjson_default(value):
+    # Decimal 은 DownFormOrderDto JSON 직렬화와 같게 문자열로
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+@router.get("/cursor", response_class=Response)
+async def list_down_form_orders_cursor(
+    after_id: int = Query(0, ge=0, description="이전 페이지의 next_cursor (첫 페이지는 0)"),
+    limit: int = Query(100, ge=1, le=1000),
+    template_code: Optional[str] = Query(
+        None,
+        description="form_name 필터링: 'all'은 전체, ''(빈값)은 form_name이 NULL 또는 빈 값, 그 외는 해당 값과 일치하는 항목 조회"
+    ),
+    count: Literal['none', 'approximate', 'cached', 'exact'] = Query(
+        'none', description="전체 건수: none(계산 안 함), approximate(통계 기반 추정), cached(캐시된 정확한 값), exact(매번 count)"
+    ),
+    down_form_order_read_service: DownFormOrderReadService = Depends(get_down_form_order_read_service),
+):
+    """
+    다운폼 주문 키셋(id) 페이지 조회. OFFSET/DTO 변환 없이 DB 행을 바로 JSON 으로 직렬화함.
+    """
+    rows, next_cursor, total = await down_form_order_read_service.get_down_form_order_rows_after(
+        after_id, limit, template_code, count
+    )
+    return Response(
+        content=orjson.dumps(
+            {"items": rows, "next_cursor": next_cursor, "total": total, "count_mode": count},
+            default=_orjson_default,
+        ),
+        media_type="application/json",
+    )
+
+@router.get("/excel", response_class=FileResponse)
+async def export_down_form_orders_excel(
+    template_code: str = Query(..., min_length=1, description="내보낼 템플릿 코드 (form_name 이 일치하는 항목, 헤더는 템플릿 컬럼 매핑)"),
+):
+    """
+    다운폼 주문을 템플릿(ERP / 합포) 엑셀 파일로 내보내기 (write-only 워크북이라 건수와 상관없이 메모리 사용량이 일정함)
+    """
+    excel_export_service = DownFormOrderExcelExportService(template_code)
+    try:
+        file_path, _ = await excel_export_service.export_to_file()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FileResponse(
+        file_path,
+        media_type=DownFormOrderExcelExportService.MEDIA_TYPE,
+        filename=excel_export_service.get_file_name(),
+        background=BackgroundTask(os.remove, file_path),
+    )
+
 @router.post("/bulk", response_model=DownFormOrderBulkResponse)
 async def bulk_create_down_form_orders(
     request: DownFormOrderCreate,
@@ -73,15 +131,24 @@ async def bulk_update_down_form_orders(
 ):
     logger.info(f"[bulk_update] 요청: {request}")
     try:
-        result = await down_form_order_create_service.bulk_update_down_form_orders(request.items)
-        logger.info(f"[bulk_update] 성공: {len(request.items)}건 수정")
-        return DownFormOrderBulkResponse(results=[
-            DownFormOrderItem(
-                data=[item],
-                status=RowStatus.SUCCESS,
-                message=None
-            ) for item in request.items
-        ])
+        updated_ids = await down_form_order_create_service.bulk_update_down_form_orders(request.items)
+        logger.info(f"[bulk_update] 성공: {len(updated_ids)}/{len(request.items)}건 수정")
+        # 같은 id 가 여러 번 오면 마지막 항목만 반영됨
+        last_positions = {item.id: position for position, item in enumerate(request.items)}
+        results = []
+        for position, item in enumerate(request.items):
+            if item.id is None:
+                status, message = RowStatus.ERROR, "id 가 없습니다."
+            elif last_positions[item.id] != position:
+                status, message = RowStatus.SKIPPED, "같은 id 의 뒤 항목으로 수정되었습니다."
+            elif not DownFormOrderCreateService.has_update_fields(item.model_dump(exclude_unset=True)):
+                status, message = RowStatus.SKIPPED, "수정할 필드가 없습니다."
+            elif item.id in updated_ids:
+                status, message = RowStatus.SUCCESS, None
+            else:
+                status, message = RowStatus.ERROR, "존재하지 않는 id 입니다."
+            results.append(DownFormOrderItem(id=item.id, data=[item], status=status, message=message))
+        return DownFormOrderBulkResponse(results=results)
     except Exception as e:
         logger.error(f"[bulk_update] 실패: {str(e)}", e)
         raise
@@ -93,13 +160,14 @@ async def bulk_delete_down_form_orders(
 ):
     logger.info(f"[bulk_delete] 요청: {request}")
     try:
-        result = await down_form_order_create_service.bulk_delete_down_form_orders(request.ids)
-        logger.info(f"[bulk_delete] 성공: {len(request.ids)}건 삭제")
+        deleted_ids = await down_form_order_create_service.bulk_delete_down_form_orders(request.ids)
+        logger.info(f"[bulk_delete] 성공: {len(deleted_ids)}/{len(request.ids)}건 삭제")
         return DownFormOrderBulkResponse(results=[
             DownFormOrderItem(
+                id=id,
                 data=[],
-                status=RowStatus.SUCCESS,
-                message=None
+                status=RowStatus.SUCCESS if id in deleted_ids else RowStatus.ERROR,
+                message=None if id in deleted_ids else "존재하지 않는 id 입니다."
             ) for id in request.ids
         ])
     except Exception as e:
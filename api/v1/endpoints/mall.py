@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query
+from schemas.mall.response.mall_response import MallResponse, MallListResponse
+from services.mall_list.mall_registry_service import get_mall_registry
+
+
+router = APIRouter(
+    prefix="/mall",
+    tags=["mall"],
+)
+
+
+@router.get("", response_model=MallListResponse)
+async def get_mall_list(
+    force_refresh: bool = Query(False, description="캐시를 무시하고 사방넷에서 다시 조회"),
+):
+    """
+    쇼핑몰 목록 조회 (캐시/스냅샷 우선, TTL 이 지나면 백그라운드 갱신)
+    """
+    mall_list = await get_mall_registry().get_mall_list(force_refresh=force_refresh)
+    return MallListResponse(
+        total_count=len(mall_list),
+        items=[MallResponse(**mall) for mall in mall_list],
+    )
+
+
+@router.post("/invalidate")
+async def invalidate_mall_list():
+    """
+    쇼핑몰 목록 캐시 무효화. 다음 조회 시 사방넷에서 다시 받아옴.
+    """
+    get_mall_registry().invalidate()
+    return {"message": "쇼핑몰 목록 캐시를 비웠습니다."}
+
+
+@router.get("/{mall_id}", response_model=MallResponse)
+async def get_mall(mall_id: str):
+    mall_name = get_mall_registry().get_mall_name(mall_id)
+    if mall_name is None:
+        raise HTTPException(status_code=404, detail=f"쇼핑몰을 찾을 수 없습니다. (mall_id: {mall_id})")
+    return MallResponse(mall_id=mall_id, mall_name=mall_name)
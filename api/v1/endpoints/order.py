@@ -1,18 +1,23 @@
 from core.db import get_async_session
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, Request, Query
+from fastapi import APIRouter, Depends, Request, Query, HTTPException, status
 from services.order.order_read_service import OrderReadService
 from services.order.order_create_service import OrderCreateService
-from schemas.order.request.order_xml_template_request import OrderXmlTemplateRequest
-from schemas.order.response.order_response import OrderResponse, OrderResponseList, OrderBulkCreateResponse
+from services.order.order_sync_service import OrderSyncService
+from services.order.order_export_service import OrderExportService
+from services.order.order_ingest_job_service import OrderIngestJobService, get_order_ingest_job_service
+from schemas.order.response.order_ingest_job_response import OrderIngestJobResponse
+from schemas.order.request.order_xml_template_request import OrderXmlTemplateRequest, OrderShardedCollectRequest, OrderSyncRequest
+from schemas.order.response.order_response import OrderResponse, OrderResponseList, OrderCursorResponseList, OrderBulkCreateResponse, OrderSyncResponse
 from services.order.data_processing_pipeline import DataProcessingPipeline
-from schemas.order.data_processing import ProcessDataRequest, ProcessDataResponse
-from repository.receive_order_repository import ReceiveOrderRepository
-from typing import Optional
+from schemas.order.data_processing import ProcessDataRequest, ProcessDataResponse, ProcessDataMultiRequest, ProcessDataMultiResponse
+from typing import Optional, Literal
+from datetime import date
 from services.order.down_form_order_template_service import DownFormOrderTemplateService
 from schemas.order.down_form_order_dto import DownFormOrderRequest, DownFormOrderResponse
 from repository.template_config_repository import TemplateConfigRepository
+from services.order.template_config_cache import TemplateConfigCache, get_template_config_cache
 
 
 router = APIRouter(
@@ -29,6 +34,10 @@ def get_order_create_service(session: AsyncSession = Depends(get_async_session))
     return OrderCreateService(session=session)
 
 
+def get_order_sync_service(session: AsyncSession = Depends(get_async_session)) -> OrderSyncService:
+    return OrderSyncService(session=session)
+
+
 @router.get("/all", response_model=OrderResponseList)
 async def get_orders(
     request: Request,
@@ -55,6 +64,59 @@ async def get_orders_pagination(
     return OrderResponseList.from_dto(await order_read_service.get_orders_pagination(page, page_size))
 
 
+@router.get("/cursor", response_model=OrderCursorResponseList)
+async def get_orders_by_cursor(
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0, description="이전 응답의 next_cursor (처음 조회 시 비움)"),
+    limit: int = Query(20, ge=1, le=200, description="조회할 건수"),
+    order_read_service: OrderReadService = Depends(get_order_read_service),
+):
+    """
+    주문 수집 데이터 커서 기반 조회 (페이지가 깊어져도 조회 속도 일정)
+    """
+    dto, next_cursor = await order_read_service.get_orders_after(after_id, limit)
+    return OrderCursorResponseList.from_dto_with_cursor(dto, next_cursor)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="내보내기 형식"),
+    order_date_from: Optional[date] = Query(None, description="주문일자 시작"),
+    order_date_to: Optional[date] = Query(None, description="주문일자 종료"),
+    mall_id: Optional[str] = Query(None, description="쇼핑몰 ID"),
+    order_status: Optional[str] = Query(None, description="주문 상태"),
+):
+    """
+    주문 수집 데이터 스트리밍 내보내기 (건수 제한 없음, 가공 조회와 같은 필터)
+    """
+    order_export_service = OrderExportService(export_format)
+    filters = {
+        "order_date_from": order_date_from,
+        "order_date_to": order_date_to,
+        "mall_id": mall_id,
+        "order_status": order_status,
+    }
+    return StreamingResponse(
+        order_export_service.stream_orders(filters),
+        media_type=order_export_service.media_type,
+        headers={"Content-Disposition": f"attachment; filename={order_export_service.get_file_name()}"},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=OrderIngestJobResponse)
+async def get_order_ingest_job(
+    job_id: str,
+    order_ingest_job_service: OrderIngestJobService = Depends(get_order_ingest_job_service),
+):
+    """
+    주문 수집 백그라운드 작업 상태 조회 (단계, 파싱/저장/중복 건수, 단계별 소요 시간)
+    """
+    job = order_ingest_job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다. (job_id: {job_id})")
+    return job.to_response()
+
+
 @router.get("/{idx}", response_model=OrderResponse)
 async def get_order(
     request: Request,
@@ -73,8 +135,14 @@ async def process_data(
     session: AsyncSession = Depends(get_async_session)
 ):
     try:
-        raw_data = await ReceiveOrderRepository(session).fetch_raw_data_from_receive_orders(request.filters.dict() if request.filters else {})
-        if not raw_data:
+        pipeline = DataProcessingPipeline(session)
+        processed_count, inserted_count, updated_count = await pipeline.process_receive_orders_to_down_form_orders(
+            request.filters.dict() if request.filters else {},
+            request.template_code,
+            request.chunk_size,
+            request.delta,
+        )
+        if not processed_count:
             return ProcessDataResponse(
                 success=False,
                 template_code=request.template_code,
@@ -82,17 +150,15 @@ async def process_data(
                 saved_count=0,
                 message="No data found to process"
             )
-        pipeline = DataProcessingPipeline(session)
-        saved_count = await pipeline.process_raw_data_to_down_form_orders(
-            raw_data,
-            request.template_code
-        )
+        saved_count = inserted_count + updated_count
         return ProcessDataResponse(
             success=True,
             template_code=request.template_code,
-            processed_count=len(raw_data),
+            processed_count=processed_count,
             saved_count=saved_count,
-            message=f"Successfully processed {len(raw_data)} records and saved {saved_count} records"
+            inserted_count=inserted_count,
+            updated_count=updated_count,
+            message=f"Successfully processed {processed_count} records and saved {saved_count} records"
         )
     except Exception as e:
         return ProcessDataResponse(
@@ -104,6 +170,40 @@ async def process_data(
         )
 
 
+@router.post("/process-data/multi", response_model=ProcessDataMultiResponse)
+async def process_data_multi(
+    request: ProcessDataMultiRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    원본 주문을 한 번만 조회해서 여러 템플릿으로 변환 -> 한 트랜잭션으로 저장 (템플릿별 건수/소요 시간 반환)
+    """
+    try:
+        pipeline = DataProcessingPipeline(session)
+        processed_count, results = await pipeline.process_receive_orders_to_multiple_templates(
+            request.filters.dict() if request.filters else {},
+            request.template_codes,
+        )
+        if not processed_count:
+            return ProcessDataMultiResponse(
+                success=False,
+                processed_count=0,
+                message="No data found to process"
+            )
+        return ProcessDataMultiResponse(
+            success=True,
+            processed_count=processed_count,
+            results=results,
+            message=f"Successfully processed {processed_count} records with {len(results)} templates"
+        )
+    except Exception as e:
+        return ProcessDataMultiResponse(
+            success=False,
+            processed_count=0,
+            message=f"Error: {str(e)}"
+        )
+
+
 @router.get("/down-form-orders")
 async def get_down_form_orders(
     template_code: Optional[str] = None,
@@ -116,6 +216,18 @@ async def get_down_form_orders(
     return {"data": data}
 
 
+@router.post("/template-configs/invalidate")
+async def invalidate_template_configs(
+    template_code: Optional[str] = Query(None, description="무효화할 템플릿 코드 (없으면 전체)"),
+    template_config_cache: TemplateConfigCache = Depends(get_template_config_cache),
+):
+    """
+    템플릿 config 캐시 무효화. 템플릿/컬럼 매핑을 DB 에서 수정한 뒤 호출.
+    """
+    template_config_cache.invalidate(template_code)
+    return {"invalidated": template_code or "all"}
+
+
 @router.post("/down-form-orders/process", response_model=DownFormOrderResponse)
 async def process_down_form_orders(
     request: DownFormOrderRequest,
@@ -123,8 +235,13 @@ async def process_down_form_orders(
 ):
     service = DownFormOrderTemplateService(session)
     try:
-        saved_count = await service.process_and_save(request.template_code, request.raw_data)
-        return DownFormOrderResponse(saved_count=saved_count, message="Success")
+        inserted_count, updated_count = await service.process_and_save(request.template_code, request.raw_data)
+        return DownFormOrderResponse(
+            saved_count=inserted_count + updated_count,
+            inserted_count=inserted_count,
+            updated_count=updated_count,
+            message="Success",
+        )
     except Exception as e:
         return DownFormOrderResponse(saved_count=0, message=f"Error: {str(e)}")
 
@@ -167,6 +284,7 @@ def make_and_get_order_xml_template(
 @router.post("/orders-from-xml", response_model=OrderBulkCreateResponse)
 async def save_orders_to_db(
     request: OrderXmlTemplateRequest,
+    streaming: bool = Query(False, description="응답을 스트리밍으로 읽으며 배치 단위로 저장 (대량 수집용)"),
     order_create_service: OrderCreateService = Depends(get_order_create_service),
 ):
     """
@@ -178,5 +296,59 @@ async def save_orders_to_db(
         order_status=request.order_status
     )
     xml_url = order_create_service.get_xml_url_from_minio(xml_file_path)
-    xml_content = order_create_service.get_orders_from_sabangnet(xml_url)
-    return await order_create_service.save_orders_to_db_from_xml(xml_content)
\ No newline at end of file
+    if streaming:
+        return await order_create_service.save_orders_to_db_from_sabangnet_stream(xml_url)
+    xml_content = await order_create_service.get_orders_from_sabangnet(xml_url)
+    return await order_create_service.save_orders_to_db_from_xml(xml_content)
+
+
+@router.post("/orders-from-xml/jobs", response_model=OrderIngestJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_order_ingest_job(
+    request: OrderXmlTemplateRequest,
+    streaming: bool = Query(False, description="응답을 스트리밍으로 읽으며 배치 단위로 저장 (대량 수집용)"),
+    order_ingest_job_service: OrderIngestJobService = Depends(get_order_ingest_job_service),
+):
+    """
+    주문 수집을 백그라운드 작업으로 등록하고 작업 ID를 바로 반환함. 진행 상태는 /order/jobs/{job_id} 로 조회.
+    """
+    job = order_ingest_job_service.submit(
+        start_date=request.start_date,
+        end_date=request.end_date,
+        order_status=request.order_status.value,
+        streaming=streaming,
+    )
+    return job.to_response()
+
+
+@router.post("/orders-from-xml/sharded", response_model=OrderBulkCreateResponse)
+async def save_orders_to_db_sharded(
+    request: OrderShardedCollectRequest,
+    order_create_service: OrderCreateService = Depends(get_order_create_service),
+):
+    """
+    주문 수집 기간을 일 단위(window_days)와 상태코드별로 나눠서 동시에 수집하고, idx 기준으로 중복 제거 후 저장함.
+    """
+    return await order_create_service.save_orders_to_db_sharded(
+        ord_st_date=request.start_date,
+        ord_ed_date=request.end_date,
+        order_statuses=[order_status.value for order_status in request.order_statuses],
+        window_days=request.window_days,
+        concurrency=request.concurrency,
+    )
+
+
+@router.post("/sync", response_model=OrderSyncResponse)
+async def sync_orders(
+    request: OrderSyncRequest,
+    order_sync_service: OrderSyncService = Depends(get_order_sync_service),
+):
+    """
+    (주문 상태, 쇼핑몰)별 마지막 수집 기준점 이후 기간만 수집하여 저장하고 기준점을 전진시킴.
+    """
+    return await order_sync_service.sync_orders(
+        order_status=request.order_status.value,
+        mall_id=request.mall_id,
+        overlap_days=request.overlap_days,
+        initial_days=request.initial_days,
+        update_changed=request.update_changed,
+    )
@@ -69,7 +69,7 @@ async def db_to_xml_all():
         logger.info(f"파일 서버에 업로드된 XML URL: {xml_url}")
 
         # 해당 파일을 사방넷 상품등록 요청 후 결과 값 중 PRODUCT_ID 값 db 에 저장.
-        response_xml = ProductCreateService.request_product_create_via_url(xml_url)
+        response_xml = await ProductCreateService.request_product_create_via_url(xml_url)
         logger.info(f"사방넷 상품등록 결과: {response_xml}")
         async with AsyncSessionLocal() as session:
             await ProductRegistrationXml().input_product_id_to_db(response_xml, session)
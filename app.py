@@ -96,11 +96,20 @@ def create_mall_price_registration_xml():
     asyncio.run(_create_mall_price_registration_xml())
 
 @app.command(help="쇼핑몰 목록을 조회합니다")
-def mall_list():
+def mall_list(
+    refresh: bool = typer.Option(False, help="캐시/스냅샷을 쓰지 않고 사방넷에서 직접 조회"),
+):
     """쇼핑몰 목록 조회 명령어"""
     try:
         logger.info("쇼핑몰 목록 조회를 시작합니다...")
-        fetch_mall_list()
+        if refresh:
+            fetch_mall_list()
+            return
+        from services.mall_list.mall_registry_service import get_mall_registry
+        mall_list = asyncio.run(get_mall_registry().get_mall_list())
+        for mall in mall_list:
+            typer.echo(f"{mall['mall_id']:<15} {mall['mall_name']}")
+        typer.echo(f"총 {len(mall_list)}개 쇼핑몰")
     except Exception as e:
         logger.error(f"쇼핑몰 목록 조회 중 오류 발생: {e}")
         handle_error(e)
@@ -151,6 +160,177 @@ def test_db_write_command(value: str = typer.Argument(..., help="테스트로 
     asyncio.run(_test())
 
 
+@app.command(help="신규 관리 테이블 생성 (이미 있으면 건너뜀)")
+def create_tables():
+    from core.db import create_tables as create_db_tables
+    from models.order.order_sync_watermark import OrderSyncWatermark
+    from models.order.down_form_process_watermark import DownFormProcessWatermark
+
+    async def _create_tables():
+        try:
+            await create_db_tables([OrderSyncWatermark, DownFormProcessWatermark])
+            typer.echo("테이블 생성 완료!")
+        except Exception as e:
+            typer.echo(f"테이블 생성 실패: {e}")
+    asyncio.run(_create_tables())
+
+
+@app.command(help="모델에 선언된 인덱스 생성 (CONCURRENTLY, 이미 있으면 건너뜀)")
+def create_indexes():
+    from core.db import create_indexes_concurrently
+    from models.order.down_form_order import BaseDownFormOrder
+
+    async def _create_indexes():
+        try:
+            created = await create_indexes_concurrently([ReceiveOrder, BaseDownFormOrder])
+            typer.echo(f"인덱스 생성 완료: {', '.join(created)}")
+        except Exception as e:
+            typer.echo(f"인덱스 생성 실패: {e}")
+    asyncio.run(_create_indexes())
+
+
+@app.command(help="주문 증분 수집 (마지막 수집 기준점 이후만 수집)")
+def sync_orders(
+    order_status: str = typer.Option("004", help="주문 상태 코드"),
+    mall_id: str = typer.Option(None, help="쇼핑몰 ID (비우면 전체)"),
+    overlap_days: int = typer.Option(1, help="기준점 이전으로 겹쳐서 다시 요청할 일수"),
+    update_changed: bool = typer.Option(False, help="이미 저장된 주문도 값이 바뀌었으면 덮어씀 (다운폼 증분 가공 대상)"),
+):
+    from services.order.order_sync_service import OrderSyncService
+
+    async def _sync_orders():
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await OrderSyncService(session).sync_orders(order_status, mall_id, overlap_days, update_changed=update_changed)
+                logger.info(f"증분 수집 결과: {result}")
+        except Exception as e:
+            logger.error(f"증분 수집 중 오류 발생: {e}")
+            handle_error(e)
+    asyncio.run(_sync_orders())
+
+
+@app.command(help="개인정보 마스킹 성능 비교 (기존 건별 마스킹 vs 일괄 마스킹)")
+def benchmark_masking(
+    rows: int = typer.Option(100000, help="생성할 가상 주문 수"),
+    process_pool_threshold: int = typer.Option(None, help="프로세스 풀 사용 기준 고유값 수 (0이면 사용 안함)"),
+):
+    import copy
+    import random
+    import time
+    from services.order.order_batch_masker import OrderBatchMasker
+
+    order_create_service = OrderCreateService(session=None)
+    masking_rules = {field_name.lower(): mask_type for field_name, mask_type in OrderCreateService._MASKING_RULES.items()}
+    # 같은 주문번호/구매자가 여러 상품 행으로 반복되는 실제 수집 결과와 비슷하게 생성
+    order_dict_list = []
+    for i in range(rows):
+        order_no = i // 3
+        order_dict_list.append({
+            'user_name': f"홍길동{order_no % 5000}",
+            'receive_name': f"김철수{order_no % 5000}",
+            'user_id': f"user{order_no % 20000}",
+            'receive_tel': f"02-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
+            'receive_cel': f"010-{order_no % 10000:04d}-{random.randint(1000, 9999)}",
+            'user_cel': f"010-{order_no % 10000:04d}-1234",
+            'receive_addr': f"서울특별시 강남구 테헤란로 {order_no % 500}길 {order_no % 100}",
+            'receive_zipcode': f"{order_no % 100000:05d}",
+            'order_id': f"ORD{order_no:010d}",
+            'mall_order_id': f"M{order_no:012d}",
+            'mall_user_id': f"mall_user{order_no % 20000}",
+        })
+
+    expected = copy.deepcopy(order_dict_list)
+    started = time.perf_counter()
+    for order_detail in expected:
+        for field_name, mask_type in masking_rules.items():
+            if order_detail.get(field_name):
+                order_detail[field_name] = order_create_service._mask_personal_info(order_detail[field_name], mask_type)
+    legacy_elapsed = time.perf_counter() - started
+
+    actual = copy.deepcopy(order_dict_list)
+    started = time.perf_counter()
+    OrderBatchMasker(masking_rules, process_pool_threshold=process_pool_threshold).mask_orders(actual)
+    batch_elapsed = time.perf_counter() - started
+
+    typer.echo(f"주문 {rows}건")
+    typer.echo(f"기존 건별 마스킹: {legacy_elapsed:.3f}초")
+    typer.echo(f"일괄 마스킹: {batch_elapsed:.3f}초 ({legacy_elapsed / batch_elapsed:.1f}배)")
+    typer.echo(f"결과 일치: {expected == actual}")
+
+
+@app.command(help="다운폼 변환 성능 비교 (기존 행별 매핑 vs 컴파일된 변환 계획)")
+def benchmark_mapping(
+    rows: int = typer.Option(50000, help="생성할 가상 주문 수"),
+):
+    import time
+    import random
+    from schemas.order.down_form_order_mapper import map_raw_to_down_form, map_aggregated_to_down_form
+    from schemas.order.down_form_order_mapping_plan import get_mapping_plan
+    from utils.formula_engine import compile_formula
+
+    column_mappings = [
+        {"source_field": "idx", "field_type": "variable", "aggregation_type": "first"},
+        {"source_field": "order_id", "field_type": "variable", "aggregation_type": "first"},
+        {"source_field": "product_name", "field_type": "variable", "aggregation_type": "concat"},
+        {"source_field": "sale_cnt", "field_type": "variable", "aggregation_type": "sum"},
+        {"source_field": "pay_cost", "field_type": "variable", "aggregation_type": "sum"},
+        {"source_field": "receive_name", "field_type": "variable", "aggregation_type": "none"},
+        {"source_field": "sku_alias", "field_type": "formula", "aggregation_type": "first",
+         "transform_config": {"source": "sku_alias + ' ' + str(sale_cnt) + '개'"}},
+        {"source_field": "etc_msg", "field_type": "empty", "aggregation_type": "first"},
+    ]
+    simple_config = {"template_code": "benchmark", "is_aggregated": False, "group_by_fields": [], "column_mappings": column_mappings}
+    aggregated_config = {**simple_config, "is_aggregated": True, "group_by_fields": ["order_id", "receive_name"]}
+    raw_data = [
+        {
+            "idx": f"IDX{i:010d}",
+            "order_id": f"ORD{i // 3:08d}",
+            "product_name": f"상품{i % 200}",
+            "sale_cnt": random.randint(1, 5),
+            "pay_cost": random.randint(1000, 50000),
+            "receive_name": f"수취인{i // 3 % 5000}",
+            "sku_alias": f"옵션{i % 50}",
+        }
+        for i in range(rows)
+    ]
+
+    def _without_process_dt(processed_data):
+        return [{k: v for k, v in row.items() if k != "process_dt"} for row in processed_data]
+
+    # 기존 방식: 행마다 config 를 다시 읽고 field_type 을 분기하며, 수식도 행마다 다시 파싱함
+    # (행별 매퍼는 변환 계획과 같은 수식 컴파일 캐시를 쓰므로 호출 전마다 캐시를 비워서 기존 행별 eval 과 같은 조건으로 측정)
+    started = time.perf_counter()
+    legacy_simple = []
+    for seq, row in enumerate(raw_data, start=1):
+        compile_formula.cache_clear()
+        legacy_simple.append({"form_name": "benchmark", "seq": seq, **map_raw_to_down_form(row, simple_config)})
+    grouped = {}
+    for row in raw_data:
+        grouped.setdefault(tuple(row.get(f) for f in aggregated_config["group_by_fields"]), []).append(row)
+    legacy_aggregated = []
+    for seq, group_rows in enumerate(grouped.values(), start=1):
+        compile_formula.cache_clear()
+        legacy_aggregated.append({"form_name": "benchmark", "seq": seq, **map_aggregated_to_down_form(group_rows, aggregated_config)})
+    legacy_elapsed = time.perf_counter() - started
+
+    # 변환 계획은 수식 캐시가 빈 상태에서 계획 컴파일까지 포함해서 측정
+    compile_formula.cache_clear()
+
+    started = time.perf_counter()
+    plan_simple = get_mapping_plan(simple_config).transform(raw_data)
+    plan_aggregated = get_mapping_plan(aggregated_config).transform(raw_data)
+    plan_elapsed = time.perf_counter() - started
+
+    matched = (
+        _without_process_dt(plan_simple) == legacy_simple
+        and _without_process_dt(plan_aggregated) == legacy_aggregated
+    )
+    typer.echo(f"주문 {rows}건 (단순 {len(plan_simple)}건 + 집계 {len(plan_aggregated)}건)")
+    typer.echo(f"기존 행별 매핑: {legacy_elapsed:.3f}초")
+    typer.echo(f"컴파일된 변환 계획: {plan_elapsed:.3f}초 ({legacy_elapsed / plan_elapsed:.1f}배)")
+    typer.echo(f"결과 일치: {matched}")
+
+
 @app.command(help="ReceiveOrder 모델 기본 조회 테스트")
 def test_receive_order():
     """ReceiveOrder 모델 기본 조회 테스트 - 동기 함수로 변경"""
@@ -1,3 +1,4 @@
+import asyncio
 from sabangnet_handler import SabangNetMallAPI
 from file_server_handler import upload_to_file_server, get_file_server_url, upload_xml_content_to_file_server
 from pathlib import Path
@@ -26,7 +27,7 @@ def fetch_mall_list():
             print(f"파일 서버에 업로드된 XML 파일 이름: {object_name}")
             xml_url = get_file_server_url(object_name)
             print(f"파일 서버에 업로드된 XML URL: {xml_url}")
-            mall_list = api.get_mall_list_via_url(xml_url)
+            mall_list = asyncio.run(api.get_mall_list_via_url(xml_url))
         elif choice == "2":
             # 2. XML 내용을 직접 파일 서버에 업로드
             xml_content = api.create_request_xml()
@@ -37,13 +38,13 @@ def fetch_mall_list():
             print(f"파일 서버에 업로드된 XML 파일 이름: {object_name}")
             xml_url = get_file_server_url(object_name)
             print(f"파일 서버에 업로드된 XML URL: {xml_url}")
-            mall_list = api.get_mall_list_via_url(xml_url)
+            mall_list = asyncio.run(api.get_mall_list_via_url(xml_url))
         elif choice == "3":
             xml_url = input("\nXML 파일의 URL을 입력하세요 (예: http://www.abc.co.kr/aa.xml): ").strip()
             if not xml_url:
                 print("유효한 XML URL을 입력해주세요.")
                 return
-            mall_list = api.get_mall_list_via_url(xml_url)
+            mall_list = asyncio.run(api.get_mall_list_via_url(xml_url))
             print(f"XML URL 요청 결과: {mall_list}")
         else:
             print("잘못된 선택입니다.")
@@ -61,14 +61,15 @@ async def fetch_order_list(session: AsyncSession):
         print("주문 수집 방법을 선택합니다.")
         print("1. 파일(XML) 업로드 후 URL로 호출 (권장)")
         print("2. XML URL을 직접 입력하여 호출")
-        choice = input("\n선택하세요 (1 또는 2): ").strip()
+        print("3. 기간을 일 단위로 나눠서 병렬 수집 (대량 기간 권장)")
+        choice = input("\n선택하세요 (1, 2 또는 3): ").strip()
         if choice == "1":
             # XML 생성 및 파일로 저장
             xml_file_path = order_create_service.create_request_xml(ord_st_date, ord_ed_date, order_status)
             # 파일 서버 업로드
             object_name = order_create_service.get_xml_url_from_minio(xml_file_path)
             # 주문 수집
-            xml_content = order_create_service.get_orders_from_sabangnet(object_name)
+            xml_content = await order_create_service.get_orders_from_sabangnet(object_name)
             # 주문 수집 결과 파싱
             order_bulk_create_response: OrderBulkCreateResponse = await order_create_service.save_orders_to_db_from_xml(xml_content)
             # 주문 수집 결과 출력
@@ -78,9 +79,14 @@ async def fetch_order_list(session: AsyncSession):
             if not xml_url:
                 print("유효한 XML URL을 입력해주세요.")
                 return
-            xml_content = order_create_service.get_orders_from_sabangnet(xml_url)
+            xml_content = await order_create_service.get_orders_from_sabangnet(xml_url)
             order_bulk_create_response: OrderBulkCreateResponse = await order_create_service.save_orders_to_db_from_xml(xml_content)
             logger.info(f"주문 수집 결과: {order_bulk_create_response}")
+        elif choice == "3":
+            order_bulk_create_response: OrderBulkCreateResponse = await order_create_service.save_orders_to_db_sharded(
+                ord_st_date, ord_ed_date, [order_status]
+            )
+            logger.info(f"주문 수집 결과: {order_bulk_create_response}")
         else:
             print("잘못된 선택입니다.")
             return
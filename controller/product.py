@@ -29,13 +29,13 @@ def request_product_create(file_name: str, sheet_name: str):
             print(f"파일 서버에 업로드된 XML 파일 이름: {object_name}")
             xml_url = get_file_server_url(object_name)
             print(f"파일 서버에 업로드된 XML URL: {xml_url}")
-            create_product_response = ProductCreateService.request_product_create_via_url(xml_url)
+            create_product_response = asyncio.run(ProductCreateService.request_product_create_via_url(xml_url))
         elif choice == "2":
             xml_url = input("\nXML 파일의 URL을 입력하세요 (예: http://www.abc.co.kr/aa.xml): ").strip()
             if not xml_url:
                 print("유효한 XML URL을 입력해주세요.")
                 return
-            create_product_response = ProductCreateService.request_product_create_via_url(xml_url)
+            create_product_response = asyncio.run(ProductCreateService.request_product_create_via_url(xml_url))
         else:
             print("잘못된 선택입니다.")
             return
@@ -3,6 +3,7 @@ from typing import Optional
 from core.settings import SETTINGS
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from utils.sabangnet_logger import get_logger
+from models.base_model import Base
 
 logger = get_logger(__name__)
 
@@ -10,6 +11,16 @@ DB_DSN = f"postgresql://{SETTINGS.DB_USER}:{SETTINGS.DB_PASSWORD}@{SETTINGS.DB_H
 
 _pool: Optional[asyncpg.Pool] = None
 
+# PostgreSQL 한 쿼리에 바인딩 가능한 최대 파라미터 수
+PG_MAX_BIND_PARAMS = 32767
+
+
+def calc_batch_size(column_count: int, max_params: int = PG_MAX_BIND_PARAMS) -> int:
+    """
+    컬럼 수와 파라미터 한계로 한 번에 넣을 수 있는 최대 row 수를 계산함.
+    """
+    return max(1, max_params // max(1, column_count))
+
 async def get_db_pool() -> asyncpg.Pool:
     global _pool
     if _pool is None:
@@ -38,6 +49,92 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+async def create_tables(models: list) -> None:
+    """
+    지정한 모델의 테이블이 없으면 생성함. (기존 테이블은 건드리지 않음)
+    """
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+
+async def create_indexes_concurrently(models: list) -> list[str]:
+    """
+    모델에 선언된 인덱스를 CREATE INDEX CONCURRENTLY IF NOT EXISTS 로 생성함.
+    모델의 OBSOLETE_INDEXES 에 있는 (대체된) 인덱스는 DROP INDEX CONCURRENTLY IF EXISTS 로 삭제하고,
+    OBSOLETE_CONSTRAINTS 에 있는 (대체된) 제약은 새 인덱스를 만든 뒤 ALTER TABLE ... DROP CONSTRAINT IF EXISTS 로 삭제함.
+    CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 asyncpg 커넥션에서 자동 커밋으로 실행함.
+    """
+    created = []
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        for model in models:
+            table = model.__table__
+            for index_name in getattr(model, "OBSOLETE_INDEXES", ()):
+                query = f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
+                logger.info(query)
+                await conn.execute(query)
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                columns = ", ".join(f'"{column.name}"' for column in index.columns)
+                unique = "UNIQUE " if index.unique else ""
+                query = f'CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS "{index.name}" ON "{table.name}" ({columns})'
+                logger.info(query)
+                await conn.execute(query)
+                created.append(index.name)
+            for constraint_name in getattr(model, "OBSOLETE_CONSTRAINTS", ()):
+                query = f'ALTER TABLE "{table.name}" DROP CONSTRAINT IF EXISTS "{constraint_name}"'
+                logger.info(query)
+                await conn.execute(query)
+    return created
+
+# 여러 워커가 동시에 시작해도 스키마 마이그레이션은 하나만 실행하도록 잡는 advisory lock 키
+_SCHEMA_MIGRATION_LOCK_KEY = 2024_0522_01
+
+async def ensure_unique_indexes(models: list) -> list[str]:
+    """
+    ON CONFLICT 대상으로 쓰는 모델의 유니크 인덱스를 보장하는 스키마 마이그레이션 (서버 시작 시 실행).
+    - 유니크 인덱스가 없거나 (CONCURRENTLY 생성이 중단되어) 유효하지 않으면 CREATE UNIQUE INDEX CONCURRENTLY 로 다시 만듦
+    - 그 뒤 모델의 OBSOLETE_CONSTRAINTS 에 있는 (대체된) 제약을 삭제함
+    Raises:
+        RuntimeError: 인덱스를 만들 수 없는 경우 (기존 데이터 중복 등). 저장이 모두 실패하는 상태로 서버가 뜨지 않도록 함
+    Returns:
+        새로 만든 인덱스 이름 리스트
+    """
+    created = []
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        await conn.execute("SELECT pg_advisory_lock($1)", _SCHEMA_MIGRATION_LOCK_KEY)
+        try:
+            for model in models:
+                table = model.__table__
+                for index in sorted(table.indexes, key=lambda index: index.name):
+                    if not index.unique:
+                        continue
+                    is_valid = await conn.fetchval(
+                        "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = $1",
+                        index.name,
+                    )
+                    if is_valid:
+                        continue
+                    columns = ", ".join(f'"{column.name}"' for column in index.columns)
+                    try:
+                        if is_valid is False:
+                            await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"')
+                        query = f'CREATE UNIQUE INDEX CONCURRENTLY "{index.name}" ON "{table.name}" ({columns})'
+                        logger.info(query)
+                        await conn.execute(query)
+                    except Exception as e:
+                        raise RuntimeError(
+                            f'{table.name} 유니크 인덱스 {index.name} ({columns}) 를 만들 수 없습니다: {e}. '
+                            f'중복 데이터를 정리한 뒤 다시 시작하세요.'
+                        ) from e
+                    created.append(index.name)
+                for constraint_name in getattr(model, "OBSOLETE_CONSTRAINTS", ()):
+                    query = f'ALTER TABLE "{table.name}" DROP CONSTRAINT IF EXISTS "{constraint_name}"'
+                    logger.info(query)
+                    await conn.execute(query)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", _SCHEMA_MIGRATION_LOCK_KEY)
+    return created
+
 async def get_async_session():
     async with AsyncSessionLocal() as session:
         return session
@@ -0,0 +1,157 @@
+import httpx
+import asyncio
+from typing import Optional, AsyncIterator
+from contextlib import asynccontextmanager
+from core.settings import SETTINGS
+from utils.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class SabangNetClient:
+    """
+    사방넷 API 공용 비동기 클라이언트.
+    - keep-alive 커넥션 풀 재사용
+    - 엔드포인트별 타임아웃
+    - 재시도 + 지수 백오프 (backup/sabangnet_mall_api.py 의 Retry 설정과 동일, POST 등 멱등이 아닌 요청은 전송 전 연결 오류만 재시도)
+    - 동시 요청 수 제한
+    """
+
+    # 엔드포인트별 읽기 타임아웃(초), 주문 수집은 응답이 커서 길게 잡음
+    _TIMEOUTS = {
+        '/RTL_API/xml_order_info.html': 120.0,
+        '/RTL_API/xml_mall_info.html': 30.0,
+        '/RTL_API/xml_goods_info.html': 60.0,
+        '/RTL_API/xml_goods_info3.html': 60.0,
+    }
+    _DEFAULT_TIMEOUT = 30.0
+    _CONNECT_TIMEOUT = 10.0
+
+    # 재시도 설정 (Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504]))
+    _RETRY_TOTAL = 3
+    _BACKOFF_FACTOR = 1.0
+    _STATUS_FORCELIST = frozenset({429, 500, 502, 503, 504})
+    # 응답 상태/읽기 오류까지 재시도하는 메소드 (urllib3 Retry 기본 allowed_methods 와 같이 멱등 메소드만)
+    _IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+    # 요청이 서버로 전송되기 전에 난 오류 (멱등이 아니어도 다시 보내도 안전함)
+    _NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+    # 응답 헤더에 charset이 없을 때 사용할 인코딩 (사방넷 응답 XML은 EUC-KR)
+    _DEFAULT_ENCODING = 'euc-kr'
+
+    def __init__(self, base_url: str = None, max_connections: int = None, max_concurrency: int = None):
+        self.base_url = base_url or SETTINGS.SABANG_ADMIN_URL
+        max_connections = max_connections or SETTINGS.SABANG_MAX_CONNECTIONS
+        max_concurrency = max_concurrency or SETTINGS.SABANG_MAX_CONCURRENCY
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url or '',
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(self._DEFAULT_TIMEOUT, connect=self._CONNECT_TIMEOUT),
+            default_encoding=self._DEFAULT_ENCODING,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._loop = asyncio.get_running_loop()
+
+    def _get_timeout(self, path: str) -> httpx.Timeout:
+        return httpx.Timeout(self._TIMEOUTS.get(path, self._DEFAULT_TIMEOUT), connect=self._CONNECT_TIMEOUT)
+
+    def _get_backoff(self, attempt: int) -> float:
+        return self._BACKOFF_FACTOR * (2 ** (attempt - 1))
+
+    async def _send(self, method: str, path: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        재시도를 포함한 요청 전송. 재시도 대상 상태코드/네트워크 오류면 백오프 후 다시 시도함.
+        POST 처럼 멱등이 아닌 요청은 서버가 이미 처리했을 수 있으므로 연결 전 오류만 재시도함 (상품 등록/가격 수정 중복 방지).
+        """
+        request = self._client.build_request(method, path, timeout=self._get_timeout(path), **kwargs)
+        idempotent = request.method in self._IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt > self._RETRY_TOTAL or not (idempotent or isinstance(e, self._NOT_SENT_ERRORS)):
+                    logger.error(f"사방넷 요청 실패 ({method} {path}): {e}")
+                    raise
+                backoff = self._get_backoff(attempt)
+                logger.warning(f"사방넷 요청 오류, {backoff:.1f}초 후 재시도 ({attempt}/{self._RETRY_TOTAL}): {e}")
+                await asyncio.sleep(backoff)
+                continue
+
+            if idempotent and response.status_code in self._STATUS_FORCELIST and attempt <= self._RETRY_TOTAL:
+                await response.aclose()
+                backoff = self._get_backoff(attempt)
+                logger.warning(f"사방넷 응답 {response.status_code}, {backoff:.1f}초 후 재시도 ({attempt}/{self._RETRY_TOTAL})")
+                await asyncio.sleep(backoff)
+                continue
+
+            if response.is_error:
+                await response.aclose()
+            response.raise_for_status()
+            return response
+
+    async def get_text(self, path: str, params: dict = None) -> str:
+        async with self._semaphore:
+            response = await self._send('GET', path, params=params)
+            return response.text
+
+    async def post_text(self, path: str, data: dict = None) -> str:
+        async with self._semaphore:
+            response = await self._send('POST', path, data=data)
+            return response.text
+
+    @asynccontextmanager
+    async def stream(self, method: str, path: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        응답 본문을 읽지 않은 상태로 반환하는 스트리밍 요청. 블록이 끝날 때까지 동시 요청 슬롯을 점유함.
+        """
+        async with self._semaphore:
+            response = await self._send(method, path, stream=True, **kwargs)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_client: Optional[SabangNetClient] = None
+# 루프가 바뀌어 교체된 클라이언트를 닫는 작업 (완료 전에 GC 되지 않도록 보관)
+_closing_tasks: set[asyncio.Task] = set()
+
+
+async def _close_stale_client(client: SabangNetClient):
+    try:
+        await client.aclose()
+    except Exception as e:
+        # 이전 루프가 이미 닫혔으면 커넥션 정리가 실패할 수 있음 (소켓은 GC 때 닫힘)
+        logger.warning(f"이전 사방넷 클라이언트 종료 실패: {e}")
+
+
+def get_sabangnet_client() -> SabangNetClient:
+    """
+    현재 이벤트 루프에서 공유하는 사방넷 클라이언트를 반환함.
+    CLI 처럼 asyncio.run 이 여러 번 호출되는 경우 루프가 바뀌면 이전 클라이언트를 닫고 새로 만듦.
+    """
+    global _client
+    loop = asyncio.get_running_loop()
+    if _client is None or _client._loop is not loop:
+        if _client is not None:
+            task = loop.create_task(_close_stale_client(_client))
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+        _client = SabangNetClient()
+    return _client
+
+
+async def close_sabangnet_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -10,6 +10,14 @@ class Settings(BaseSettings):
     SABANG_ADMIN_URL: Optional[str] = None
     SABANG_SEND_GOODS_CD_RT: Optional[str] = ""
     SABANG_RESULT_TYPE: Optional[str] = "XML"
+    SABANG_MAX_CONNECTIONS: Optional[int] = 10
+    SABANG_MAX_CONCURRENCY: Optional[int] = 4
+    MALL_LIST_CACHE_TTL_SECONDS: Optional[int] = 86400
+    ORDER_INGEST_WORKERS: Optional[int] = 2
+    TEMPLATE_CONFIG_CACHE_TTL_SECONDS: Optional[int] = 300
+    DOWN_FORM_DELTA_OVERLAP_SECONDS: Optional[int] = 300
+    DOWN_FORM_COUNT_CACHE_TTL_SECONDS: Optional[int] = 60
+    DOWN_FORM_TRANSFORM_WORKERS: Optional[int] = 2
 
     # MinIO
     MINIO_ROOT_USER: Optional[str] = None
@@ -14,7 +14,15 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from core.db import AsyncSessionLocal, ensure_unique_indexes
+from models.order.down_form_order import BaseDownFormOrder
+from core.sabangnet_client import close_sabangnet_client
 from api.v1.endpoints.order import router as order_router
+from api.v1.endpoints.mall import router as mall_router
+from services.mall_list.mall_registry_service import get_mall_registry
+from services.order.order_ingest_job_service import get_order_ingest_job_service
+from services.order.template_config_cache import get_template_config_cache
+from services.order.template_transform_pool import get_template_transform_pool
 from api.v1.endpoints.products import router as products_router
 from api.v1.endpoints.mall_price import router as mall_price_router
 from utils.sabangnet_logger import get_logger, HTTPLoggingMiddleware
@@ -29,8 +37,23 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # FastAPI 서버 시작 전 작업영역
+    # 다운폼 저장(ON CONFLICT (idx, form_name))에 필요한 유니크 인덱스 마이그레이션 (실패하면 서버를 시작하지 않음)
+    await ensure_unique_indexes([BaseDownFormOrder])
+    # 쇼핑몰 목록 스냅샷을 미리 메모리에 올려둠 (사방넷 요청은 하지 않음)
+    get_mall_registry().preload()
+    # 템플릿 config 를 미리 캐시에 올려둠 (실패해도 요청 시점에 다시 읽으므로 서버는 그대로 시작)
+    try:
+        async with AsyncSessionLocal() as session:
+            await get_template_config_cache().preload(session)
+    except Exception as e:
+        logger.warning(f"템플릿 config 캐시 미리 적재 실패: {e}")
+    await get_order_ingest_job_service().start()
+    get_template_transform_pool().start()
     yield
     # FastAPI 서버 종료 후 작업영역
+    await get_order_ingest_job_service().stop()
+    get_template_transform_pool().stop()
+    await close_sabangnet_client()
 
 
 # 메인 라우터
@@ -56,6 +79,7 @@ master_router.include_router(mall_price_router)
 master_router.include_router(one_one_price_router)
 master_router.include_router(order_router)
 master_router.include_router(down_form_order_router)
+master_router.include_router(mall_router)
 
 app.include_router(master_router)
 app.include_router(product_registration_router)
@@ -3,7 +3,7 @@ from datetime import datetime
 from models.base_model import Base
 from schemas.order.order_dto import OrderDto
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import TIMESTAMP, Integer, String, Text, Numeric
+from sqlalchemy import TIMESTAMP, Index, Integer, String, Text, Numeric
 
 
 
@@ -13,12 +13,19 @@ class BaseDownFormOrder(Base):
     """
 
     __tablename__ = "down_form_orders"
+    __table_args__ = (
+        # 같은 주문(idx)을 템플릿(form_name)마다 한 행씩 저장 (bulk_upsert 의 ON CONFLICT 대상)
+        Index("uq_down_form_orders_idx_form_name", "idx", "form_name", unique=True),
+    )
+
+    # (idx, form_name) 유니크 인덱스로 대체된 idx 단독 유니크 제약 (서버 시작 시 ensure_unique_indexes 에서 삭제)
+    OBSOLETE_CONSTRAINTS = ("down_form_orders_idx_key",)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     process_dt: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=False))
     form_name: Mapped[str | None] = mapped_column(String(30))
     seq: Mapped[int | None] = mapped_column(Integer)
-    idx: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)  # 사방넷주문번호
+    idx: Mapped[str] = mapped_column(String(50), nullable=False)  # 사방넷주문번호
     order_id: Mapped[str | None] = mapped_column(String(100))
     mall_order_id: Mapped[str | None] = mapped_column(Text)
     product_id: Mapped[str | None] = mapped_column(Text)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base_model import Base
+
+
+class DownFormProcessWatermark(Base):
+    """
+    다운폼 증분 가공 기준점 테이블(down_form_process_watermarks)의 ORM 매핑 모델
+    (템플릿 코드, 조회 필터)별로 마지막으로 가공이 끝난 시점의 receive_orders.updated_at 기준 시각 저장
+    """
+    __tablename__ = "down_form_process_watermarks"
+    __table_args__ = (
+        UniqueConstraint("template_code", "filter_key", name="uq_down_form_process_watermarks_template_filter"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    template_code: Mapped[str] = mapped_column(String(50), nullable=False)
+    # 가공 조회 필터를 정렬된 JSON 문자열로 저장 (필터가 다르면 기준점도 따로 관리)
+    filter_key: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    last_processed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_processed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,25 @@
+from datetime import date
+from sqlalchemy import BigInteger, Date, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base_model import Base
+
+
+class OrderSyncWatermark(Base):
+    """
+    주문 증분 수집 기준점 테이블(order_sync_watermarks)의 ORM 매핑 모델
+    (주문 상태, 쇼핑몰)별로 마지막으로 수집이 완료된 주문일자 저장
+    """
+    __tablename__ = "order_sync_watermarks"
+    __table_args__ = (
+        UniqueConstraint("order_status", "mall_id", name="uq_order_sync_watermarks_status_mall"),
+    )
+
+    # 전체 쇼핑몰 대상으로 수집한 경우의 mall_id 값
+    ALL_MALLS = ""
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    order_status: Mapped[str] = mapped_column(String(10), nullable=False)
+    mall_id: Mapped[str] = mapped_column(String(100), nullable=False, default=ALL_MALLS)
+    last_synced_date: Mapped[date] = mapped_column(Date, nullable=False)
+    last_synced_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
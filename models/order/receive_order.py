@@ -4,7 +4,7 @@ from decimal import Decimal
 from datetime import datetime
 
 from sqlalchemy import (
-    TIMESTAMP, Date, Integer, Numeric, String, Text, text, BigInteger
+    TIMESTAMP, Date, Integer, Numeric, String, Text, text, BigInteger, Index
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,6 +16,17 @@ class ReceiveOrder(Base):
     주문 수집 테이블(receive_orders)의 ORM 매핑 모델
     """
     __tablename__ = "receive_orders"
+    __table_args__ = (
+        # 가공 대상 조회 (fetch_raw_data_from_receive_orders) 필터 조합: 등호 조건 컬럼 -> 범위 조건 컬럼 순
+        Index("ix_receive_orders_mall_id_order_status_order_date", "mall_id", "order_status", "order_date"),
+        # 합포장 배송지 조회 필터 조합
+        Index("ix_receive_orders_receive_zipcode_addr_name", "receive_zipcode", "receive_addr", "receive_name"),
+        # 다운폼 증분 가공 (updated_at 기준 변경분 조회)
+        Index("ix_receive_orders_updated_at", "updated_at"),
+    )
+
+    # 컬럼 순서가 바뀌어 대체된 인덱스 (create-indexes 실행 시 삭제)
+    OBSOLETE_INDEXES = ("ix_receive_orders_order_date_mall_id_order_status",)
 
     # 기본 정보
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -1,17 +1,33 @@
-from sqlalchemy import select
+import json
+from typing import Any, AsyncIterator
+from sqlalchemy import select, text
+from core.db import calc_batch_size
+from utils.sabangnet_logger import get_logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.order.down_form_order import BaseDownFormOrder
 from schemas.order.down_form_order_dto import DownFormOrderDto
-from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import func, literal_column, update, delete, values, column, bindparam, any_, Integer
+
+
+logger = get_logger(__name__)
 
 
 class DownFormOrderRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_down_form_order_by_idx(self, idx: str) -> BaseDownFormOrder:
+    async def get_down_form_order_by_idx(self, idx: str, form_name: str = None) -> BaseDownFormOrder:
+        """
+        같은 idx 는 템플릿(form_name)마다 한 행씩 있으므로 form_name 이 없으면 가장 먼저 저장된 행을 반환
+        """
         try:
             query = select(BaseDownFormOrder).where(BaseDownFormOrder.idx == idx)
+            if form_name is not None:
+                query = query.where(BaseDownFormOrder.form_name == form_name)
+            query = query.order_by(BaseDownFormOrder.id).limit(1)
             result = await self.session.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -20,15 +36,74 @@ class DownFormOrderRepository:
         finally:
             await self.session.close()
 
+    @staticmethod
+    def _template_condition(template_code: str = None):
+        """
+        form_name 필터: 'all' 은 전체(None 반환), None/'' 은 form_name 이 NULL 또는 빈 값, 그 외는 일치
+        """
+        if template_code == 'all':
+            return None
+        if template_code is None or template_code == '':
+            return (BaseDownFormOrder.form_name == None) | (BaseDownFormOrder.form_name == '')
+        return BaseDownFormOrder.form_name == template_code
+
+    async def get_down_form_order_rows_after(self, after_id: int = 0, limit: int = 100, template_code: str = None) -> list[dict]:
+        """
+        id 기준 키셋 페이지 조회 (OFFSET 없이 id > after_id 부터 limit 건). ORM 객체 대신 컬럼 값 dict 로 반환
+        """
+        query = select(*BaseDownFormOrder.__table__.columns).where(BaseDownFormOrder.id > after_id)
+        condition = self._template_condition(template_code)
+        if condition is not None:
+            query = query.where(condition)
+        query = query.order_by(BaseDownFormOrder.id).limit(limit)
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def stream_down_form_order_values(
+            self,
+            fields: list[str],
+            template_code: str = None,
+            chunk_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[Any, ...]]]:
+        """
+        fields 컬럼 값만 id 순으로 서버 사이드 커서를 사용해 chunk_size 단위로 읽는 제너레이터 (행은 fields 순서의 튜플)
+        down_form_orders 에 없는 필드는 None 으로 채움
+        """
+        table_columns = BaseDownFormOrder.__table__.columns
+        # 같은 필드가 여러 번 나와도 자리마다 값이 나오도록 위치별 라벨을 붙임
+        query = select(*[
+            (table_columns[field] if field in table_columns else literal_column("NULL")).label(f"c{index}")
+            for index, field in enumerate(fields)
+        ]).select_from(BaseDownFormOrder)
+        condition = self._template_condition(template_code)
+        if condition is not None:
+            query = query.where(condition)
+        query = query.order_by(BaseDownFormOrder.id).execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for partition in result.partitions(chunk_size):
+            yield [tuple(row) for row in partition]
+
+    async def estimate_count(self, template_code: str = None) -> int:
+        """
+        실행 계획의 예상 행 수로 대략적인 건수를 구함 (count(*) 처럼 테이블을 훑지 않음, 통계 기준이라 오차 있음)
+        """
+        query = select(BaseDownFormOrder.id)
+        condition = self._template_condition(template_code)
+        if condition is not None:
+            query = query.where(condition)
+        compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = await self.session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def get_down_form_orders(self, skip: int = None, limit: int = None, template_code: str = None) -> list[BaseDownFormOrder]:
         try:
             query = select(BaseDownFormOrder).order_by(BaseDownFormOrder.id)
-            if template_code == 'all':
-                pass  # no filter, fetch all
-            elif template_code is None or template_code == '':
-                query = query.where((BaseDownFormOrder.form_name == None) | (BaseDownFormOrder.form_name == ''))
-            else:
-                query = query.where(BaseDownFormOrder.form_name == template_code)
+            condition = self._template_condition(template_code)
+            if condition is not None:
+                query = query.where(condition)
             if skip:
                 query = query.offset(skip)
             if limit:
@@ -65,26 +140,136 @@ class DownFormOrderRepository:
         await self.session.commit()
         return len(objects)
 
-    async def bulk_update(self, objects: list[BaseDownFormOrder]):
+    async def get_max_seq(self, form_name: str) -> int:
+        """
+        템플릿(form_name)에 저장된 행의 최대 순번 (없으면 0)
+        """
+        query = select(func.coalesce(func.max(BaseDownFormOrder.seq), 0)).where(BaseDownFormOrder.form_name == form_name)
+        result = await self.session.execute(query)
+        return result.scalar_one()
+
+    async def bulk_upsert(self, rows: list[dict], commit: bool = True, keep_columns: tuple[str, ...] = ()) -> tuple[int, int]:
+        """
+        다운폼 주문 행 dict 를 배치 단위로 INSERT ... ON CONFLICT (idx, form_name) DO UPDATE 로 저장 (ORM 객체를 만들지 않음)
+        같은 주문을 같은 템플릿으로 다시 처리해도 실패하지 않고 기존 행을 갱신하며, 다른 템플릿의 행은 건드리지 않음.
+        Args:
+            rows: down_form_orders 컬럼명을 키로 갖는 dict 리스트 (idx, form_name 필수 - form_name 이 NULL 이면 충돌로 보지 않고 새로 저장됨)
+            commit: False 면 커밋하지 않음 (여러 저장을 한 트랜잭션으로 묶을 때, 실패 시 롤백도 호출한 쪽에서 처리)
+            keep_columns: 이미 있는 행을 갱신할 때 바꾸지 않을 컬럼 (새로 저장하는 행에는 그대로 저장)
+        Returns:
+            (신규 저장 건수, 갱신 건수)
+        """
+        if not rows:
+            return 0, 0
+        # 한 INSERT 문 안에서 같은 행을 두 번 갱신할 수 없으므로 (idx, form_name) 기준으로 마지막 행만 남김
+        rows_by_key = {(row['idx'], row.get('form_name')): row for row in rows}
+        if len(rows_by_key) < len(rows):
+            logger.warning(f"같은 (idx, form_name) 이 중복된 행 {len(rows) - len(rows_by_key)}개는 마지막 값으로 저장")
+        # 입력에 있는 컬럼만 저장/갱신 (id 는 자동 증가, 없는 값은 NULL)
+        present_columns = set().union(*rows_by_key.values())
+        columns = [
+            column.name for column in BaseDownFormOrder.__table__.columns
+            if column.name != 'id' and column.name in present_columns
+        ]
+        update_columns = [
+            column for column in columns
+            if column not in ('idx', 'form_name', 'created_at', 'updated_at') and column not in keep_columns
+        ]
+        batch_size = calc_batch_size(len(columns))
+        normalized_rows = [{column: row.get(column) for column in columns} for row in rows_by_key.values()]
+
+        inserted_count = 0
+        try:
+            for i in range(0, len(normalized_rows), batch_size):
+                batch = normalized_rows[i:i + batch_size]
+                stmt = pg_insert(BaseDownFormOrder).values(batch)
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['idx', 'form_name'],
+                        # Core INSERT 의 ON CONFLICT 갱신에는 onupdate 가 적용되지 않으므로 updated_at 을 직접 갱신
+                        set_={
+                            **{column: stmt.excluded[column] for column in update_columns},
+                            'updated_at': func.now(),
+                        },
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=['idx', 'form_name'])
+                # xmax = 0 이면 새로 들어간 행, 아니면 ON CONFLICT 로 갱신된 행
+                stmt = stmt.returning(literal_column("xmax = 0").label("inserted"))
+                result = await self.session.execute(stmt)
+                inserted_count += sum(1 for inserted in result.scalars().all() if inserted)
+            if commit:
+                await self.session.commit()
+        except Exception as e:
+            # 트랜잭션을 호출한 쪽이 관리하는 경우(commit=False)에는 롤백하지 않음
+            if commit:
+                await self.session.rollback()
+            raise e
+        updated_count = len(normalized_rows) - inserted_count
+        logger.info(f"다운폼 주문 저장 완료: 신규 {inserted_count}건, 갱신 {updated_count}건")
+        return inserted_count, updated_count
+
+    async def bulk_update(self, rows: list[dict]) -> set[int]:
+        """
+        id 기준 일괄 수정. 같은 컬럼 조합을 수정하는 행끼리 묶어서
+        UPDATE down_form_orders SET ... FROM (VALUES ...) WHERE id = v.id RETURNING id 한 문장으로 처리함.
+        Args:
+            rows: id 와 수정할 컬럼만 담은 dict 리스트 (없는 컬럼은 건드리지 않음)
+        Returns:
+            실제로 수정된 id 집합 (없는 id 는 빠짐)
+        """
+        table = BaseDownFormOrder.__table__
+        # 수정할 컬럼 조합별로 묶음 (요청에 없는 컬럼을 NULL 로 덮어쓰지 않도록)
+        rows_by_columns: dict[tuple[str, ...], list[dict]] = {}
+        for row in rows:
+            columns = tuple(column.name for column in table.columns if column.name != 'id' and column.name in row)
+            if columns:
+                rows_by_columns.setdefault(columns, []).append(row)
+
+        updated_ids: set[int] = set()
         try:
-            for obj in objects:
-                self.session.merge(obj)
+            for columns, column_rows in rows_by_columns.items():
+                batch_size = calc_batch_size(len(columns) + 1)
+                for i in range(0, len(column_rows), batch_size):
+                    batch = column_rows[i:i + batch_size]
+                    source = values(
+                        *[column(name, table.c[name].type) for name in ('id', *columns)],
+                        name='v',
+                    ).data([tuple(row.get(name) for name in ('id', *columns)) for row in batch])
+                    stmt = (
+                        update(BaseDownFormOrder)
+                        .where(BaseDownFormOrder.id == source.c.id)
+                        .values({name: source.c[name] for name in columns})
+                        .returning(BaseDownFormOrder.id)
+                    )
+                    result = await self.session.execute(stmt)
+                    updated_ids.update(result.scalars().all())
             await self.session.commit()
-            return len(objects)
+            return updated_ids
         except Exception as e:
             await self.session.rollback()
             raise e
         finally:
             await self.session.close()
 
-    async def bulk_delete(self, ids: list[int]):
+    async def bulk_delete(self, ids: list[int]) -> set[int]:
+        """
+        DELETE FROM down_form_orders WHERE id = ANY(:ids) RETURNING id 한 문장으로 일괄 삭제
+        Returns:
+            실제로 삭제된 id 집합 (없는 id 는 빠짐)
+        """
+        if not ids:
+            return set()
         try:
-            for id in ids:
-                db_obj = await self.session.get(BaseDownFormOrder, id)
-                if db_obj:
-                    await self.session.delete(db_obj)
+            stmt = (
+                delete(BaseDownFormOrder)
+                .where(BaseDownFormOrder.id == any_(bindparam('ids', list(ids), type_=ARRAY(Integer))))
+                .returning(BaseDownFormOrder.id)
+            )
+            result = await self.session.execute(stmt)
+            deleted_ids = set(result.scalars().all())
             await self.session.commit()
-            return len(ids)
+            return deleted_ids
         except Exception as e:
             await self.session.rollback()
             raise e
@@ -94,12 +279,9 @@ class DownFormOrderRepository:
     async def count_all(self, template_code: str = None) -> int:
         try:
             query = select(func.count()).select_from(BaseDownFormOrder)
-            if template_code == 'all':
-                pass  # no filter, fetch all
-            elif template_code is None or template_code == '':
-                query = query.where((BaseDownFormOrder.form_name == None) | (BaseDownFormOrder.form_name == ''))
-            else:
-                query = query.where(BaseDownFormOrder.form_name == template_code)
+            condition = self._template_condition(template_code)
+            if condition is not None:
+                query = query.where(condition)
             result = await self.session.execute(query)
             return result.scalar_one()
         except Exception as e:
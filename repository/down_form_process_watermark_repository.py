@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from models.order.down_form_process_watermark import DownFormProcessWatermark
+
+
+class DownFormProcessWatermarkRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def make_filter_key(filters: dict = None) -> str:
+        """
+        값이 있는 필터만 키 순으로 정렬한 JSON 문자열 (같은 조건이면 같은 키)
+        """
+        return json.dumps(
+            {key: value for key, value in (filters or {}).items() if value},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+
+    async def get_watermark(self, template_code: str, filter_key: str) -> DownFormProcessWatermark | None:
+        query = select(DownFormProcessWatermark).where(
+            DownFormProcessWatermark.template_code == template_code,
+            DownFormProcessWatermark.filter_key == filter_key
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_db_now(self) -> datetime:
+        """
+        기준 시각은 DB 시각으로 맞춤 (receive_orders.updated_at 과 같은 시계)
+        """
+        result = await self.session.execute(select(func.now()))
+        return result.scalar_one()
+
+    async def advance_watermark(
+            self,
+            template_code: str,
+            filter_key: str,
+            processed_at: datetime,
+            processed_count: int
+        ) -> None:
+        """
+        기준점을 processed_at 으로 전진 (이미 더 뒤의 시각이면 유지)
+        커밋하지 않으므로 호출한 쪽에서 커밋해야 함.
+        """
+        stmt = pg_insert(DownFormProcessWatermark).values(
+            template_code=template_code,
+            filter_key=filter_key,
+            last_processed_at=processed_at,
+            last_processed_count=processed_count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DownFormProcessWatermark.template_code, DownFormProcessWatermark.filter_key],
+            set_={
+                "last_processed_at": func.greatest(DownFormProcessWatermark.last_processed_at, stmt.excluded.last_processed_at),
+                "last_processed_count": stmt.excluded.last_processed_count,
+                "updated_at": func.now(),
+            }
+        )
+        await self.session.execute(stmt)
@@ -0,0 +1,45 @@
+from datetime import date
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from models.order.order_sync_watermark import OrderSyncWatermark
+
+
+class OrderSyncWatermarkRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_watermark(self, order_status: str, mall_id: str = OrderSyncWatermark.ALL_MALLS) -> OrderSyncWatermark | None:
+        query = select(OrderSyncWatermark).where(
+            OrderSyncWatermark.order_status == order_status,
+            OrderSyncWatermark.mall_id == mall_id
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def advance_watermark(
+            self,
+            order_status: str,
+            mall_id: str,
+            synced_date: date,
+            synced_count: int
+        ) -> None:
+        """
+        기준점을 synced_date 로 전진 (이미 더 뒤의 날짜면 유지)
+        커밋하지 않으므로 주문 저장과 같은 트랜잭션 안에서 호출해야 함.
+        """
+        stmt = pg_insert(OrderSyncWatermark).values(
+            order_status=order_status,
+            mall_id=mall_id,
+            last_synced_date=synced_date,
+            last_synced_count=synced_count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OrderSyncWatermark.order_status, OrderSyncWatermark.mall_id],
+            set_={
+                "last_synced_date": func.greatest(OrderSyncWatermark.last_synced_date, stmt.excluded.last_synced_date),
+                "last_synced_count": stmt.excluded.last_synced_count,
+                "updated_at": func.now(),
+            }
+        )
+        await self.session.execute(stmt)
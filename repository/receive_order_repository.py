@@ -1,16 +1,24 @@
-from typing import Any
-from sqlalchemy import select, and_
+from typing import Any, AsyncIterator
+from sqlalchemy import select, and_, text, func, literal, literal_column, null, cast, Text, Integer, Numeric, Float, String
 from datetime import date, datetime
+from core.db import calc_batch_size
 from utils.sabangnet_logger import get_logger
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.order.receive_order import ReceiveOrder
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from utils.receive_order_conversion_plan import RECEIVE_ORDER_CONVERSION_PLAN
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by
 
 
 logger = get_logger(__name__)
 
 
 class ReceiveOrderRepository:
+    # COPY로 적재할 임시 스테이징 테이블 (트랜잭션 종료 시 자동 삭제)
+    _STAGING_TABLE = "receive_orders_staging"
+    # 수집할 때마다 바뀌는 컬럼 (이 컬럼만 달라진 주문은 변경으로 보지 않음)
+    _VOLATILE_COLUMNS = ('receive_dt',)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -82,6 +90,28 @@ class ReceiveOrderRepository:
         finally:
             await self.session.close()
 
+    async def get_orders_after(self, after_id: int = None, limit: int = 20) -> list[ReceiveOrder]:
+        """
+        주문 데이터 커서(id) 기반 조회. OFFSET 없이 id 인덱스로 바로 다음 위치부터 읽음.
+        Args:
+            after_id: 이전 페이지의 마지막 id (없으면 처음부터)
+            limit: 조회할 개수
+        Returns:
+            ReceiveOrder 리스트
+        """
+        try:
+            query = select(ReceiveOrder).order_by(ReceiveOrder.id).limit(limit)
+            if after_id is not None:
+                query = query.where(ReceiveOrder.id > after_id)
+            result = await self.session.execute(query)
+            content = result.scalars().all()
+            return content
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+        finally:
+            await self.session.close()
+
     async def get_orders_by_receive_zipcode_and_receive_addr_and_receive_name(
             self,
             receive_zipcode: str,
@@ -159,29 +189,25 @@ class ReceiveOrderRepository:
         finally:
             await self.session.close()
 
-    async def bulk_insert_orders(self, orders: list[dict]) -> list[ReceiveOrder]:
+    async def bulk_insert_orders(self, orders: list[dict]) -> list[str]:
         """
         주문 데이터 배치 삽입 (중복 시 무시)
         Args:
             orders: 주문 데이터 dict 리스트
         Returns:
-            저장된 ReceiveOrder 모델 리스트
+            저장된 주문의 idx 리스트
         """
         try:
-            normalized_orders = []
-            for order in orders:
-                # 누락된 필드를 None으로 채워 넣기
-                normalized_order = {}
-                for column in ReceiveOrder.__table__.columns:
-                    if column.name != 'id':  # auto increment 필드 제외
-                        normalized_order[column.name] = order.get(column.name)
-                normalized_orders.append(normalized_order)
+            column_names = RECEIVE_ORDER_CONVERSION_PLAN.column_names
+            # 누락된 필드를 None으로 채워 넣은 컬럼 순서 행을 dict로 변환
+            normalized_orders = [
+                dict(zip(column_names, record))
+                for record in RECEIVE_ORDER_CONVERSION_PLAN.to_records(orders)
+            ]
             
-            # 배치 크기 제한 (PostgreSQL 파라미터 한계 고려)
-            # receive_orders 테이블은 컬럼이 많아서 배치 크기를 작게 설정
-            # 100개 × 100컬럼 = 10,000 파라미터 (안전한 범위)
-            batch_size = 50  # 한 번에 50개씩 처리 (더 안전하게)
-            all_success_models = []
+            # 배치 크기는 컬럼 수와 PostgreSQL 파라미터 한계로 자동 계산
+            batch_size = calc_batch_size(len(column_names))
+            all_success_idx = []
             
             total_attempted = len(normalized_orders)
             total_batches = (total_attempted + batch_size - 1) // batch_size
@@ -191,25 +217,24 @@ class ReceiveOrderRepository:
                 batch_num = i // batch_size + 1
                 logger.info(f"배치 처리 중: {batch_num}/{total_batches} ({len(batch)}개 시도)")
                 
-                # PostgreSQL bulk insert
+                # PostgreSQL bulk insert (성공 건수 확인용으로 idx만 반환)
                 stmt = pg_insert(ReceiveOrder).values(batch)
                 stmt = stmt.on_conflict_do_nothing(index_elements=['idx'])
-                stmt = stmt.returning(ReceiveOrder)
+                stmt = stmt.returning(ReceiveOrder.idx)
                 result = await self.session.execute(stmt)
                 
                 # 배치별 결과 수집
-                returned_rows = result.fetchall()
-                batch_success_models = [row[0] for row in returned_rows]
-                all_success_models.extend(batch_success_models)
+                batch_success_idx = list(result.scalars().all())
+                all_success_idx.extend(batch_success_idx)
                 
                 # 배치별 통계 로그
                 batch_attempted = len(batch)
-                batch_success = len(batch_success_models)
+                batch_success = len(batch_success_idx)
                 batch_duplicated = batch_attempted - batch_success
                 
                 if batch_duplicated > 0:
                     # 중복된 idx 값들 찾기 (선택적으로 로그 출력)
-                    success_idx_set = {model.idx for model in batch_success_models}
+                    success_idx_set = set(batch_success_idx)
                     attempted_idx_list = [item.get('idx') for item in batch]
                     duplicated_idx_list = [idx for idx in attempted_idx_list if idx not in success_idx_set]
                     
@@ -221,11 +246,11 @@ class ReceiveOrderRepository:
             await self.session.commit()
             
             # 전체 결과 요약
-            total_success = len(all_success_models)
+            total_success = len(all_success_idx)
             total_duplicated = total_attempted - total_success
             
             logger.info(f"전체 결과: {total_attempted}개 시도, {total_success}개 성공, {total_duplicated}개 중복값 무시")
-            return all_success_models
+            return all_success_idx
             
         except Exception as e:
             await self.session.rollback()
@@ -234,6 +259,121 @@ class ReceiveOrderRepository:
         finally:
             await self.session.close()
 
+    async def bulk_copy_orders(self, orders: list[dict], commit: bool = True) -> list[str]:
+        """
+        주문 데이터 COPY 적재 (중복 시 무시)
+        asyncpg copy_records_to_table 로 임시 스테이징 테이블에 적재한 뒤,
+        한 번의 INSERT ... SELECT ... ON CONFLICT DO NOTHING 으로 receive_orders 에 병합함.
+        Args:
+            orders: 주문 데이터 dict 리스트
+            commit: False 이면 커밋하지 않고 호출한 쪽의 트랜잭션에 맡김
+        Returns:
+            새로 저장된 주문의 idx 리스트
+        """
+        inserted_idx, _ = await self._copy_merge_orders(orders, commit, update_changed=False)
+        return inserted_idx
+
+    async def bulk_copy_upsert_orders(self, orders: list[dict], commit: bool = True) -> tuple[list[str], int]:
+        """
+        주문 데이터 COPY 적재 (이미 있는 주문은 값이 바뀐 경우에만 덮어씀)
+        bulk_copy_orders 와 같지만 ON CONFLICT (idx) DO UPDATE 로 병합함.
+        - 값이 하나라도 달라진 주문만 갱신하고 updated_at 을 현재 시각으로 올림 (다운폼 증분 가공 기준)
+        - 값이 같은 주문은 건드리지 않음 (updated_at 유지)
+        - 같은 idx 가 여러 번 들어오면 마지막 행을 사용 (idx 가 없는 행은 그대로 적재)
+        저장된 주문을 덮어쓰므로 같은 safe_mode 로 수집한 데이터에만 사용해야 함 (마스킹 여부가 섞이지 않도록).
+        Args:
+            orders: 주문 데이터 dict 리스트
+            commit: False 이면 커밋하지 않고 호출한 쪽의 트랜잭션에 맡김
+        Returns:
+            (새로 저장된 주문의 idx 리스트, 변경되어 갱신된 주문 수)
+        """
+        return await self._copy_merge_orders(orders, commit, update_changed=True)
+
+    async def _copy_merge_orders(self, orders: list[dict], commit: bool, update_changed: bool) -> tuple[list[str], int]:
+        if not orders:
+            return [], 0
+        if update_changed:
+            # ON CONFLICT DO UPDATE 는 한 문장에서 같은 행을 두 번 갱신할 수 없으므로 COPY 전에 idx 별로 마지막 행만 남김
+            orders = self._dedupe_last_by_idx(orders)
+        try:
+            column_names = RECEIVE_ORDER_CONVERSION_PLAN.column_names
+            quoted_columns = ", ".join(f'"{name}"' for name in column_names)
+
+            # 스테이징 테이블 생성 (ON COMMIT DROP 이라 같은 트랜잭션 안에서만 재사용됨)
+            await self.session.execute(text(
+                f'CREATE TEMP TABLE IF NOT EXISTS {self._STAGING_TABLE} ON COMMIT DROP AS '
+                f'SELECT {quoted_columns} FROM {ReceiveOrder.__tablename__} WITH NO DATA'
+            ))
+
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            asyncpg_connection = raw_connection.driver_connection
+
+            batch_size = calc_batch_size(len(column_names))
+            for i in range(0, len(orders), batch_size):
+                records = RECEIVE_ORDER_CONVERSION_PLAN.to_records(orders[i:i + batch_size])
+                await asyncpg_connection.copy_records_to_table(
+                    self._STAGING_TABLE, records=records, columns=column_names
+                )
+
+            # 스테이징 -> receive_orders 병합
+            table_name = ReceiveOrder.__tablename__
+            if update_changed:
+                update_columns = [name for name in column_names if name != 'idx']
+                compare_columns = [name for name in update_columns if name not in self._VOLATILE_COLUMNS]
+                set_clause = ", ".join(f'"{name}" = EXCLUDED."{name}"' for name in update_columns)
+                current_values = ", ".join(f'{table_name}."{name}"' for name in compare_columns)
+                new_values = ", ".join(f'EXCLUDED."{name}"' for name in compare_columns)
+                conflict_clause = (
+                    f'ON CONFLICT (idx) DO UPDATE SET {set_clause}, "updated_at" = now() '
+                    f'WHERE ({current_values}) IS DISTINCT FROM ({new_values}) '
+                    f'RETURNING idx, (xmax = 0) AS inserted'
+                )
+            else:
+                conflict_clause = 'ON CONFLICT (idx) DO NOTHING RETURNING idx, true AS inserted'
+            result = await self.session.execute(text(
+                f'INSERT INTO {table_name} ({quoted_columns}) '
+                f'SELECT {quoted_columns} FROM {self._STAGING_TABLE} '
+                f'{conflict_clause}'
+            ))
+            inserted_idx = []
+            updated_count = 0
+            for idx, inserted in result.all():
+                if inserted:
+                    inserted_idx.append(idx)
+                else:
+                    updated_count += 1
+            await self.session.execute(text(f'TRUNCATE {self._STAGING_TABLE}'))
+
+            if commit:
+                await self.session.commit()
+
+            skipped_count = len(orders) - len(inserted_idx) - updated_count
+            logger.info(f"COPY 적재 결과: {len(orders)}개 시도, {len(inserted_idx)}개 성공, {updated_count}개 변경 갱신, {skipped_count}개 중복값 무시")
+            return inserted_idx, updated_count
+
+        except Exception as e:
+            # 트랜잭션을 호출한 쪽이 관리하는 경우(commit=False)에는 롤백하지 않음
+            if commit:
+                await self.session.rollback()
+            logger.error(f"COPY 적재 실패: {e}")
+            raise e
+        finally:
+            if commit:
+                await self.session.close()
+
+    @staticmethod
+    def _dedupe_last_by_idx(orders: list[dict]) -> list[dict]:
+        """
+        같은 idx 가 여러 번 있으면 마지막 행만 남김 (idx 가 없는 행은 모두 그대로 두고, 남는 행의 순서는 유지)
+        """
+        last_positions = {order.get('idx'): position for position, order in enumerate(orders) if order.get('idx') is not None}
+        if len(last_positions) == len(orders):
+            return orders
+        return [
+            order for position, order in enumerate(orders)
+            if order.get('idx') is None or last_positions[order['idx']] == position
+        ]
 
     def _parse_date(self, val):
         if isinstance(val, date):
@@ -243,22 +383,146 @@ class ReceiveOrderRepository:
         return val
 
 
-    async def fetch_raw_data_from_receive_orders(self, filters: dict = None) -> list[dict[str, Any]]:
-        query = select(ReceiveOrder)
+    def _build_filter_conditions(self, filters: dict = None, model=ReceiveOrder) -> list:
+        """
+        가공/내보내기 조회에서 공통으로 쓰는 필터 조건 (주문일자 범위, 쇼핑몰, 주문 상태)
+        증분 가공용 조건
+        - updated_after: updated_at 이 이 시각 이후인 주문만
+        - updated_group_fields: (집계 템플릿) 주어지면 updated_after 이후 바뀐 주문이 하나라도 있는 그룹의 주문 전체
+        """
         conditions = []
         if filters:
             if 'order_date_from' in filters and filters['order_date_from']:
-                conditions.append(ReceiveOrder.order_date >= self._parse_date(filters['order_date_from']))
+                conditions.append(model.order_date >= self._parse_date(filters['order_date_from']))
             if 'order_date_to' in filters and filters['order_date_to']:
-                conditions.append(ReceiveOrder.order_date <= self._parse_date(filters['order_date_to']))
+                conditions.append(model.order_date <= self._parse_date(filters['order_date_to']))
             if 'mall_id' in filters and filters['mall_id']:
-                conditions.append(ReceiveOrder.mall_id == filters['mall_id'])
+                conditions.append(model.mall_id == filters['mall_id'])
             if 'order_status' in filters and filters['order_status']:
-                conditions.append(ReceiveOrder.order_status == filters['order_status'])
+                conditions.append(model.order_status == filters['order_status'])
+            if 'updated_after' in filters and filters['updated_after']:
+                if filters.get('updated_group_fields') is None:
+                    conditions.append(model.updated_at > filters['updated_after'])
+                else:
+                    # 같은 필터 안에서 바뀐 주문과 묶음 기준 값이 같은(NULL 포함) 주문이 있으면 그룹 전체를 다시 집계
+                    changed = aliased(ReceiveOrder)
+                    changed_filters = {key: value for key, value in filters.items() if key != 'updated_group_fields'}
+                    group_conditions = [
+                        getattr(changed, field).is_not_distinct_from(getattr(model, field))
+                        for field in filters['updated_group_fields'] if field in ReceiveOrder.__table__.columns
+                    ]
+                    conditions.append(
+                        select(changed.id)
+                        .where(*self._build_filter_conditions(changed_filters, changed), *group_conditions)
+                        .exists()
+                    )
+        return conditions
+
+    async def fetch_raw_data_from_receive_orders(self, filters: dict = None, fields: list[str] = None) -> list[dict[str, Any]]:
+        """
+        fields 를 주면 해당 컬럼만 조회함 (idx 는 항상 포함, receive_orders 에 없는 컬럼은 무시)
+        """
+        table_columns = ReceiveOrder.__table__.columns
+        if fields is None:
+            query = select(*table_columns)
+        else:
+            selected = dict.fromkeys(['idx', *(field for field in fields if field in table_columns)])
+            query = select(*(table_columns[field] for field in selected))
+        conditions = self._build_filter_conditions(filters)
         if conditions:
             query = query.where(and_(*conditions))
         query = query.order_by(ReceiveOrder.id)
         result = await self.session.execute(query)
-        rows = result.scalars().all()
-        # dict 변환 (기존 asyncpg와 유사하게)
-        return [row.__dict__ for row in rows] 
+        # 컬럼 값만 dict 로 변환 (ORM 객체 __dict__ 의 _sa_instance_state 는 포함하지 않음)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def stream_raw_data_from_receive_orders(
+            self,
+            filters: dict = None,
+            chunk_size: int = 1000,
+            order_by_fields: list[str] = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        fetch_raw_data_from_receive_orders 와 같은 조건으로, 서버 사이드 커서를 사용해 chunk_size 단위로 읽는 제너레이터.
+        결과 건수와 상관없이 메모리에는 한 묶음만 올라감.
+        order_by_fields 를 주면 해당 컬럼 순으로 먼저 정렬함 (같은 값을 가진 행이 연속으로 나옴, receive_orders 에 없는 컬럼은 무시)
+        """
+        table_columns = ReceiveOrder.__table__.columns
+        query = select(*table_columns)
+        conditions = self._build_filter_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+        order_by = [table_columns[field] for field in order_by_fields or [] if field in table_columns]
+        query = query.order_by(*order_by, ReceiveOrder.id).execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+
+    @staticmethod
+    def can_aggregate_in_db(aggregations: list[tuple[str, str]]) -> bool:
+        """
+        집계 컬럼 목록을 DB 집계(stream_aggregated_raw_data_from_receive_orders)로 처리할 수 있는지 확인.
+        sum 은 정수/소수 컬럼, concat 은 문자열/정수/소수 컬럼만 파이썬 집계와 같은 결과를 보장함.
+        (날짜/시각은 문자열 표현이 달라서 제외, receive_orders 에 없는 필드는 상수로 처리)
+        """
+        table_columns = ReceiveOrder.__table__.columns
+        for field, agg_type in aggregations:
+            column = table_columns.get(field)
+            if column is None or agg_type == 'first':
+                continue
+            column_type = column.type
+            is_number = isinstance(column_type, Integer) or (
+                isinstance(column_type, Numeric) and not isinstance(column_type, Float)
+            )
+            if agg_type == 'sum' and not is_number:
+                return False
+            if agg_type == 'concat' and not (is_number or isinstance(column_type, String)):
+                return False
+        return True
+
+    async def stream_aggregated_raw_data_from_receive_orders(
+            self,
+            filters: dict,
+            group_by_fields: list[str],
+            aggregations: list[tuple[str, str]],
+            chunk_size: int = 1000,
+    ) -> AsyncIterator[list[list[Any]]]:
+        """
+        group_by_fields 로 묶어서 DB 에서 집계한 결과를 서버 사이드 커서로 chunk_size 단위로 읽는 제너레이터.
+        파이썬 집계(DownFormGroupAggregator)와 같은 규칙으로 계산함.
+        - sum: COALESCE(SUM(컬럼), 0)
+        - first: 그룹 안에서 id 가 가장 작은 행의 값 (NULL 포함)
+        - concat: id 순으로 ',' 연결 (NULL 은 파이썬 str(None) 과 같게 'None')
+        그룹 순서는 group_by_fields 순 (stream_raw_data_from_receive_orders(order_by_fields=...) 와 같음)
+        Args:
+            aggregations: (필드명, 'sum' | 'first' | 'concat') 리스트. can_aggregate_in_db 로 먼저 확인할 것.
+        Returns:
+            aggregations 순서대로 값을 담고 마지막에 그룹의 원본 행 수를 붙인 리스트의 묶음
+        """
+        table_columns = ReceiveOrder.__table__.columns
+        selected = []
+        for field, agg_type in aggregations:
+            column = table_columns.get(field)
+            if agg_type == 'sum':
+                expression = literal(0) if column is None else func.coalesce(func.sum(column), 0)
+            elif agg_type == 'concat':
+                value = literal('') if column is None else func.coalesce(cast(column, Text), 'None')
+                expression = func.string_agg(value, aggregate_order_by(literal_column("','"), ReceiveOrder.id))
+            else:
+                expression = null() if column is None else func.array_agg(
+                    aggregate_order_by(column, ReceiveOrder.id)
+                )[1]
+            selected.append(expression)
+        # receive_orders 에 없는 묶음 기준 필드는 모든 행이 같은 값이므로 제외
+        group_by_columns = [table_columns[field] for field in group_by_fields if field in table_columns]
+
+        query = select(*selected, func.count())
+        conditions = self._build_filter_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+        # 묶음 기준이 없어도 대상 행이 없으면 결과 행을 만들지 않음
+        query = query.group_by(*group_by_columns).having(func.count() > 0)
+        query = query.order_by(*group_by_columns).execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for partition in result.partitions(chunk_size):
+            yield [list(row) for row in partition]
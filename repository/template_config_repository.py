@@ -5,54 +5,27 @@ from typing import Optional, List
 from models.order.down_form_order import BaseDownFormOrder
 
 class TemplateConfigRepository:
-    DEFAULT_TEMPLATE_META_QUERY = """
-        SELECT id, template_code, template_name, is_aggregated, group_by_fields
-        FROM export_templates
-        WHERE template_code = :template_code
+    # 템플릿 메타 + 컬럼 매핑을 한 번에 조회 (기본 템플릿과 요청 템플릿)
+    TEMPLATE_CONFIG_QUERY = """
+        SELECT t.id, t.template_code, t.template_name, t.is_aggregated, t.group_by_fields,
+               m.column_order, m.target_column, m.source_field, m.field_type, m.aggregation_type, m.transform_config
+        FROM export_templates t
+        LEFT JOIN template_column_mappings m ON m.template_id = t.id AND m.is_active = TRUE
+        WHERE t.template_code IN ('default', :template_code)
+        ORDER BY t.id, m.column_order
     """
-    COLUMN_MAPPINGS_QUERY = """
-        SELECT column_order, target_column, source_field, field_type, aggregation_type, transform_config
-        FROM template_column_mappings
-        WHERE template_id = :template_id AND is_active = TRUE
-        ORDER BY column_order
+    # 전체 템플릿 메타 + 컬럼 매핑 (캐시 미리 채우기용)
+    ALL_TEMPLATE_CONFIGS_QUERY = """
+        SELECT t.id, t.template_code, t.template_name, t.is_aggregated, t.group_by_fields,
+               m.column_order, m.target_column, m.source_field, m.field_type, m.aggregation_type, m.transform_config
+        FROM export_templates t
+        LEFT JOIN template_column_mappings m ON m.template_id = t.id AND m.is_active = TRUE
+        ORDER BY t.id, m.column_order
     """
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def _get_template_meta(self, template_code: str) -> Optional[dict]:
-        result = await self.session.execute(
-            text(self.DEFAULT_TEMPLATE_META_QUERY),
-            {"template_code": template_code}
-        )
-        row = result.first()
-        if not row:
-            return None
-        return {
-            "id": row[0],
-            "template_code": row[1],
-            "template_name": row[2],
-            "is_aggregated": row[3],
-            "group_by_fields": row[4] or []
-        }
-
-    async def _get_column_mappings(self, template_id: int) -> List[dict]:
-        result = await self.session.execute(
-            text(self.COLUMN_MAPPINGS_QUERY),
-            {"template_id": template_id}
-        )
-        return [
-            {
-                "column_order": row[0],
-                "target_column": row[1],
-                "source_field": row[2],
-                "field_type": row[3],
-                "aggregation_type": row[4],
-                "transform_config": json.loads(row[5]) if isinstance(row[5], str) else row[5] or {}
-            }
-            for row in result.fetchall()
-        ]
-
     def _merge_columns(self, default_columns: List[dict], input_columns: List[dict]) -> List[dict]:
         columns_by_target = {col["target_column"]: col for col in default_columns}
         for col in input_columns:
@@ -63,21 +36,46 @@ class TemplateConfigRepository:
         merged = {**default_meta, **input_meta}
         return merged
 
-    async def get_template_config(self, template_code: str) -> Optional[dict]:
-        # 1. Get 'default' template meta and columns
-        default_meta = await self._get_template_meta("default")
-        if not default_meta:
+    def _build_templates(self, rows) -> dict[str, tuple[dict, List[dict]]]:
+        """
+        조인 결과 행을 {template_code: (메타, 컬럼 매핑 리스트)} 로 묶음
+        """
+        templates: dict[str, tuple[dict, List[dict]]] = {}
+        for row in rows:
+            template_code = row[1]
+            if template_code not in templates:
+                templates[template_code] = ({
+                    "id": row[0],
+                    "template_code": row[1],
+                    "template_name": row[2],
+                    "is_aggregated": row[3],
+                    "group_by_fields": row[4] or []
+                }, [])
+            # LEFT JOIN 이므로 매핑이 없는 템플릿은 매핑 컬럼이 모두 NULL
+            if row[6] is None:
+                continue
+            templates[template_code][1].append({
+                "column_order": row[5],
+                "target_column": row[6],
+                "source_field": row[7],
+                "field_type": row[8],
+                "aggregation_type": row[9],
+                "transform_config": json.loads(row[10]) if isinstance(row[10], str) else row[10] or {}
+            })
+        return templates
+
+    def _build_config(self, templates: dict[str, tuple[dict, List[dict]]], template_code: str) -> Optional[dict]:
+        """
+        기본 템플릿에 요청 템플릿의 메타/컬럼 매핑을 덮어써서 병합함
+        """
+        if "default" not in templates:
             return None
-        default_id = default_meta["id"]
-        default_columns = await self._get_column_mappings(default_id)
-        # 2. Get input template meta and columns
-        input_meta = await self._get_template_meta(template_code)
-        if not input_meta:
+        default_meta, default_columns = templates["default"]
+        if template_code not in templates:
             merged_meta = default_meta
             merged_columns = default_columns
         else:
-            input_id = input_meta["id"]
-            input_columns = await self._get_column_mappings(input_id)
+            input_meta, input_columns = templates[template_code]
             merged_columns = self._merge_columns(default_columns, input_columns)
             merged_meta = self._merge_meta(default_meta, input_meta)
         return {
@@ -85,6 +83,30 @@ class TemplateConfigRepository:
             "column_mappings": merged_columns
         }
 
+    async def get_template_config(self, template_code: str) -> Optional[dict]:
+        """
+        기본 템플릿(default)과 요청 템플릿의 메타/컬럼 매핑을 한 번의 조인 쿼리로 읽어서 병합
+        (요청 템플릿이 없으면 기본 템플릿 그대로, 기본 템플릿이 없으면 None)
+        """
+        result = await self.session.execute(
+            text(self.TEMPLATE_CONFIG_QUERY),
+            {"template_code": template_code}
+        )
+        return self._build_config(self._build_templates(result.fetchall()), template_code)
+
+    async def get_all_template_configs(self) -> dict[str, dict]:
+        """
+        등록된 모든 템플릿의 병합된 config 를 한 번의 쿼리로 조회 ({template_code: config})
+        """
+        result = await self.session.execute(text(self.ALL_TEMPLATE_CONFIGS_QUERY))
+        templates = self._build_templates(result.fetchall())
+        configs = {}
+        for template_code in templates:
+            config = self._build_config(templates, template_code)
+            if config is not None:
+                configs[template_code] = config
+        return configs
+
     async def get_down_form_orders(self, template_code: Optional[str], limit: int = 100, offset: int = 0) -> List[dict]:
         query = select(BaseDownFormOrder)
         if template_code:
@@ -1,12 +1,12 @@
-import requests
+import httpx
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import List, Dict
-from urllib.parse import urljoin
 import json
 from pathlib import Path
 from utils.sabangnet_logger import get_logger
 from core.settings import SETTINGS
+from core.sabangnet_client import get_sabangnet_client
 
 logger = get_logger(__name__)
 
@@ -52,18 +52,15 @@ class SabangNetMallAPI:
             logger.error(f"응답 파싱 중 오류: {e}")
             raise
 
-    def get_mall_list_via_url(self, xml_url: str) -> List[Dict[str, str]]:
+    async def get_mall_list_via_url(self, xml_url: str) -> List[Dict[str, str]]:
         try:
-            api_url = urljoin(self.admin_url, '/RTL_API/xml_mall_info.html')
-            full_url = f"{api_url}?xml_url={xml_url}"
-            logger.info(f"최종 요청 URL: {full_url}")
-            print(f"최종 요청 URL: {full_url}")
-            response = requests.get(full_url, timeout=30)
-            print(f"API 요청 결과: {response.text}")
-            response.raise_for_status()
-            response_xml = self.parse_response_xml(response.text)
+            logger.info(f"쇼핑몰 목록 요청 XML URL: {xml_url}")
+            print(f"쇼핑몰 목록 요청 XML URL: {xml_url}")
+            response_text = await get_sabangnet_client().get_text('/RTL_API/xml_mall_info.html', params={'xml_url': xml_url})
+            print(f"API 요청 결과: {response_text}")
+            response_xml = self.parse_response_xml(response_text)
             return response_xml
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API 요청 실패: {e}")
             raise
         except Exception as e:
@@ -0,0 +1,18 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class MallResponse(BaseModel):
+    """
+    쇼핑몰 정보 응답 객체
+    """
+    mall_id: str = Field(..., description="쇼핑몰 ID")
+    mall_name: str = Field(..., description="쇼핑몰 이름")
+
+
+class MallListResponse(BaseModel):
+    """
+    쇼핑몰 목록 응답 객체
+    """
+    total_count: int = Field(..., description="쇼핑몰 수")
+    items: List[MallResponse] = Field(default_factory=list, description="쇼핑몰 목록")
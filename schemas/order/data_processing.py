@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from datetime import date
 
 class Filters(BaseModel):
@@ -12,10 +12,32 @@ class ProcessDataRequest(BaseModel):
     template_code: str
     filters: Optional[Filters] = None
     source_table: str = "receive_orders"
+    chunk_size: int = Field(5000, ge=1, description="receive_orders 를 한 번에 읽어서 변환/저장할 건수")
+    delta: bool = Field(False, description="True 면 템플릿/필터별 기준점 이후 새로 들어오거나 바뀐 주문만 가공")
 
 class ProcessDataResponse(BaseModel):
     success: bool
     template_code: str
     processed_count: int
     saved_count: int
-    message: str 
\ No newline at end of file
+    inserted_count: int = 0
+    updated_count: int = 0
+    message: str 
+
+class ProcessDataMultiRequest(BaseModel):
+    template_codes: List[str] = Field(..., min_length=1, description="적용할 템플릿 코드 목록 (원본은 한 번만 조회)")
+    filters: Optional[Filters] = None
+
+class TemplateProcessResult(BaseModel):
+    template_code: str
+    output_count: int = Field(..., description="변환된 행 수")
+    inserted_count: int
+    updated_count: int
+    transform_seconds: float = Field(..., description="변환 소요 시간(초)")
+    save_seconds: float = Field(..., description="저장 소요 시간(초)")
+
+class ProcessDataMultiResponse(BaseModel):
+    success: bool
+    processed_count: int
+    results: List[TemplateProcessResult] = []
+    message: str
@@ -0,0 +1,101 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _sum_column(field: str) -> Callable[[List[dict]], List[Any]]:
+    return lambda rows: [row.get(field, 0) or 0 for row in rows]
+
+
+def _concat_column(field: str) -> Callable[[List[dict]], List[Any]]:
+    return lambda rows: [str(row.get(field, '')) for row in rows]
+
+
+def _first_column(field: str) -> Callable[[List[dict]], List[Any]]:
+    return lambda rows: [row.get(field) for row in rows]
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # 튜플/리스트 값이 다차원 배열로 펼쳐지지 않도록 1차원 object 배열을 먼저 만들고 채움
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class DownFormGroupAggregator:
+    """
+    집계(합포) 템플릿용 컬럼 단위 집계기.
+    원본 행을 컬럼 배열로 한 번만 뽑은 뒤, 그룹 번호를 매겨 정렬해 두고
+    모든 컬럼의 sum / first / concat 을 같은 정렬 결과로 한 번에 계산함.
+    결과는 기존 dict 그룹핑 + 그룹별 집계와 같음 (그룹 순서 = 처음 나온 순서).
+    """
+
+    def __init__(self, column_mappings: List[dict], group_by_fields: List[str]):
+        self.group_by_fields = list(group_by_fields)
+        self._columns: List[Tuple[str, str, Callable[[List[dict]], List[Any]]]] = []
+        for col in column_mappings:
+            field = col['source_field']
+            agg_type = col.get('aggregation_type')
+            if agg_type == 'sum':
+                self._columns.append((field, 'sum', _sum_column(field)))
+            elif agg_type == 'concat':
+                self._columns.append((field, 'concat', _concat_column(field)))
+            else:
+                # first / none: 첫 행 값
+                self._columns.append((field, 'first', _first_column(field)))
+
+    @property
+    def aggregations(self) -> List[Tuple[str, str]]:
+        """
+        (source_field, 'sum' | 'concat' | 'first') 목록 (column_mappings 순서)
+        """
+        return [(field, agg_type) for field, agg_type, _ in self._columns]
+
+    def group_codes(self, raw_data: List[Dict[str, Any]], missing: Any = None) -> np.ndarray:
+        """
+        행마다 그룹 번호를 매김. 그룹 번호는 처음 나온 순서대로 0, 1, 2 ...
+        """
+        codes = np.zeros(len(raw_data), dtype=np.int64)
+        for field in self.group_by_fields:
+            field_codes, _ = pd.factorize(
+                _object_array([row.get(field, missing) for row in raw_data]),
+                sort=False,
+                use_na_sentinel=False,
+            )
+            # 앞 필드까지의 그룹 번호와 이번 필드 값 번호를 합쳐서 다시 번호를 매김 (처음 나온 순서 유지)
+            codes, _ = pd.factorize(codes * (int(field_codes.max()) + 1) + field_codes, sort=False)
+        return codes
+
+    def aggregate(self, raw_data: List[Dict[str, Any]], missing: Any = None) -> List[Dict[str, Any]]:
+        """
+        원본 행 목록을 그룹별로 집계한 행 목록으로 변환 (같은 source_field 가 여러 번 나오면 마지막 값 사용)
+        """
+        if not raw_data:
+            return []
+        codes = self.group_codes(raw_data, missing)
+        # 그룹 순으로 정렬 (그룹 안에서는 원래 순서 유지)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        ends = np.r_[starts[1:], len(raw_data)]
+        first_index = order[starts]
+        # sum 은 그룹마다 0 을 앞에 끼워 넣고 누적해서 sum() 과 같은 순서로 더함 (0 + a + b ...)
+        sum_starts = starts + np.arange(len(starts))
+
+        fields = []
+        columns = []
+        for field, agg_type, extract in self._columns:
+            values = extract(raw_data)
+            if agg_type == 'sum':
+                sorted_values = np.insert(_object_array(values)[order], starts, 0)
+                columns.append(np.add.reduceat(sorted_values, sum_starts).tolist())
+            elif agg_type == 'concat':
+                sorted_values = [values[i] for i in order.tolist()]
+                columns.append([
+                    ','.join(sorted_values[start:end]) for start, end in zip(starts.tolist(), ends.tolist())
+                ])
+            else:
+                columns.append([values[i] for i in first_index.tolist()])
+            fields.append(field)
+        return [dict(zip(fields, values)) for values in zip(*columns)]
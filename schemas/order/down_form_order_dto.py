@@ -95,6 +95,8 @@ class DownFormOrderRequest(BaseModel):
 
 class DownFormOrderResponse(BaseModel):
     saved_count: int
+    inserted_count: int = 0
+    updated_count: int = 0
     message: str
 
 class DownFormOrderFilter(BaseModel):
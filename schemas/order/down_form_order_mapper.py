@@ -1,4 +1,5 @@
 from typing import Dict, Any, List
+from utils.formula_engine import compile_formula
 
 def map_raw_to_down_form(raw_row: Dict[str, Any], config: dict) -> Dict[str, Any]:
     """
@@ -49,11 +50,8 @@ def map_aggregated_to_down_form(group_rows: List[Dict[str, Any]], config: dict)
     return mapped
 
 def eval_formula(transform_config: dict, row: dict) -> Any:
-    # 실제 수식 파싱/계산 로직 필요 (예: "sku_alias + ' ' + sale_cnt + '개'")
-    # 예시: 단순 파이썬 eval 사용 (보안상 실제 서비스에서는 안전하게 구현 필요)
-    try:
-        source = transform_config.get('source')
-        if source:
-            return eval(source, {}, row)
-    except Exception:
-        return None 
\ No newline at end of file
+    # 제한된 수식 엔진으로 평가 (예: "sku_alias + ' ' + sale_cnt + '개'"), 파싱 결과는 소스 기준으로 캐시됨
+    source = transform_config.get('source') if transform_config else None
+    if not source:
+        return None
+    return compile_formula(source).evaluate(row) 
\ No newline at end of file
@@ -0,0 +1,163 @@
+import json
+import hashlib
+from datetime import datetime
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+from utils.formula_engine import compile_formula
+from schemas.order.down_form_order_aggregator import DownFormGroupAggregator
+
+
+def _make_column_extractor(col: dict) -> Callable[[List[dict]], List[Any]]:
+    """
+    컬럼 하나를 행 목록 전체에 대해 한 번에 뽑아내는 함수를 만듦. 수식은 여기서 한 번만 파싱함.
+    """
+    field = col['source_field']
+    field_type = col.get('field_type')
+    if field_type == 'formula':
+        transform_config = col.get('transform_config', {})
+        source = transform_config.get('source') if transform_config else None
+        if not source:
+            return lambda rows: [None] * len(rows)
+        return compile_formula(source).evaluate_column
+    if field_type == 'empty':
+        return lambda rows: [None] * len(rows)
+    # variable 및 그 외: 원본 그대로
+    return lambda rows: [row.get(field) for row in rows]
+
+
+def _get_source_fields(column_mappings: List[dict], group_by_fields: List[str]) -> List[str]:
+    """
+    변환에서 원본 행으로부터 읽는 필드 이름 (그룹 필드, 컬럼 source_field, 수식이 참조하는 필드)
+    """
+    fields = dict.fromkeys(group_by_fields)
+    for col in column_mappings:
+        fields[col['source_field']] = None
+        transform_config = col.get('transform_config') or {}
+        if col.get('field_type') == 'formula' and transform_config.get('source'):
+            fields.update(dict.fromkeys(sorted(compile_formula(transform_config['source']).fields)))
+    return list(fields)
+
+
+class DownFormMappingPlan:
+    """
+    템플릿 config 를 한 번 컴파일해 둔 down_form_orders 변환 계획.
+    map_raw_to_down_form / map_aggregated_to_down_form 과 같은 결과를 내지만,
+    행마다 column_mappings 를 다시 읽거나 field_type/aggregation_type 을 분기하지 않음.
+    단순 템플릿은 컬럼 단위로 한 번에 변환함 (수식도 컬럼 전체를 한 번에 평가).
+    집계 템플릿은 DownFormGroupAggregator 로 모든 컬럼을 한 번의 그룹 정렬로 집계함.
+    source_fields 는 변환에서 원본 행으로부터 읽는 필드 목록 (이 필드만 조회/전달해도 결과가 같음).
+    """
+
+    def __init__(self, config: dict):
+        self.template_code = config['template_code']
+        self.is_aggregated = bool(config.get('is_aggregated'))
+        self.group_by_fields = list(config.get('group_by_fields') or [])
+        column_mappings = config['column_mappings']
+        self._column_extractors: List[Tuple[str, Callable[[List[dict]], List[Any]]]] = [
+            (col['source_field'], _make_column_extractor(col)) for col in column_mappings
+        ]
+        self._aggregator = DownFormGroupAggregator(column_mappings, self.group_by_fields)
+        self.source_fields: List[str] = _get_source_fields(column_mappings, self.group_by_fields)
+
+    def map_rows(self, raw_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        컬럼 단위로 값을 뽑은 뒤 행으로 합침 (같은 source_field 가 여러 번 나오면 마지막 값 사용)
+        """
+        if not raw_rows:
+            return []
+        fields = [field for field, _ in self._column_extractors]
+        columns = [extractor(raw_rows) for _, extractor in self._column_extractors]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+    def map_row(self, raw_row: Dict[str, Any]) -> Dict[str, Any]:
+        return self.map_rows([raw_row])[0]
+
+    @property
+    def aggregations(self) -> List[Tuple[str, str]]:
+        return self._aggregator.aggregations
+
+    def aggregate(self, raw_data: List[Dict[str, Any]], missing: Any = None) -> List[Dict[str, Any]]:
+        """
+        group_by_fields 값으로 묶어서 그룹별로 집계함 (그룹 순서 = 처음 나온 순서)
+        """
+        return self._aggregator.aggregate(raw_data, missing)
+
+    def split_trailing_group(self, raw_data: List[Dict[str, Any]], missing: Any = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        group_by_fields 순으로 정렬된 묶음을 (완성된 그룹들의 행, 다음 묶음으로 이어질 수 있는 마지막 그룹의 행) 으로 나눔
+        """
+        if not raw_data:
+            return [], []
+        group_by_fields = self.group_by_fields
+        last_key = tuple(raw_data[-1].get(field, missing) for field in group_by_fields)
+        split_at = len(raw_data) - 1
+        while split_at > 0 and tuple(raw_data[split_at - 1].get(field, missing) for field in group_by_fields) == last_key:
+            split_at -= 1
+        return raw_data[:split_at], raw_data[split_at:]
+
+    def transform(
+            self,
+            raw_data: List[Dict[str, Any]],
+            group_missing: Any = None,
+            start_seq: int = 1,
+            process_dt: datetime = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        원본 행 목록을 down_form_orders 저장용 행 목록으로 변환 (집계 템플릿이면 묶은 뒤 집계)
+        묶음 단위로 나눠서 호출할 때는 start_seq / process_dt 를 넘겨서 순번과 처리 일시를 이어감
+        """
+        if self.is_aggregated:
+            mapped_rows = self.aggregate(raw_data, group_missing)
+        else:
+            mapped_rows = self.map_rows(raw_data)
+        return self.number_rows(mapped_rows, start_seq, process_dt)
+
+    def number_rows(
+            self,
+            mapped_rows: List[Dict[str, Any]],
+            start_seq: int = 1,
+            process_dt: datetime = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        변환된 행에 process_dt / form_name / seq 를 붙임 (DB 에서 집계한 결과도 같은 형태로 맞춤)
+        """
+        if process_dt is None:
+            process_dt = datetime.now()
+        form_name = self.template_code
+        processed_data = []
+        for seq, mapped_row in enumerate(mapped_rows, start=start_seq):
+            processed_row = {
+                'process_dt': process_dt,
+                'form_name': form_name,
+                'seq': seq,
+            }
+            processed_row.update(mapped_row)
+            processed_data.append(processed_row)
+        return processed_data
+
+
+_PLAN_CACHE_SIZE = 128
+_plan_cache: "OrderedDict[Tuple[str, str], DownFormMappingPlan]" = OrderedDict()
+
+
+def get_config_fingerprint(config: dict) -> str:
+    return hashlib.sha1(
+        json.dumps(config, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def get_mapping_plan(config: dict) -> DownFormMappingPlan:
+    """
+    (template_code, config 지문) 으로 캐시된 변환 계획을 반환함. 템플릿 설정이 바뀌면 지문이 달라져 새로 컴파일됨.
+    """
+    cache_key = (config['template_code'], get_config_fingerprint(config))
+    plan = _plan_cache.get(cache_key)
+    if plan is None:
+        plan = DownFormMappingPlan(config)
+        _plan_cache[cache_key] = plan
+        if len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    else:
+        _plan_cache.move_to_end(cache_key)
+    return plan
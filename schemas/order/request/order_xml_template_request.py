@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 from utils.validators.order_validators import is_start_valid_yyyymmdd, is_end_valid_yyyymmdd, is_valid_order_status
 
@@ -111,4 +112,96 @@ class OrderXmlTemplateRequest(BaseModel):
                 "order_status": "004"  # 출고완료
             }
         }
-    )
\ No newline at end of file
+    )
+
+
+class OrderShardedCollectRequest(BaseModel):
+    start_date: str = Field(
+        description="시작 날짜 (YYYYMMDD 형식)",
+        example="20250602",
+        default="20250602"
+    )
+    end_date: str = Field(
+        description="종료 날짜 (YYYYMMDD 형식)",
+        example="20250606",
+        default="20250606"
+    )
+    order_statuses: List[OrderStatus] = Field(
+        default=[OrderStatus.SHIPMENT_COMPLETED],
+        description="수집할 주문 상태 목록 (상태코드별로 나눠서 요청)"
+    )
+    window_days: int = Field(
+        default=1,
+        ge=1,
+        description="한 번에 요청할 기간(일) 단위"
+    )
+    concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=16,
+        description="동시에 요청할 구간 수"
+    )
+
+    @field_validator("start_date")
+    @classmethod
+    def validate_start_date(cls, start_date: str) -> str:
+        is_start_valid_yyyymmdd(start_date)
+        return start_date
+
+    @field_validator("order_statuses")
+    @classmethod
+    def validate_order_statuses(cls, order_statuses: List[OrderStatus]) -> List[OrderStatus]:
+        for order_status in order_statuses:
+            is_valid_order_status(order_status.value)
+        return order_statuses
+
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        is_end_valid_yyyymmdd(self.start_date, self.end_date)
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "start_date": "20250602",
+                "end_date": "20250606",
+                "order_statuses": ["004", "007"],
+                "window_days": 1,
+                "concurrency": 4
+            }
+        }
+    )
+
+
+
+class OrderSyncRequest(BaseModel):
+    order_status: OrderStatus = Field(
+        default=OrderStatus.SHIPMENT_COMPLETED,
+        description="수집할 주문 상태"
+    )
+    mall_id: Optional[str] = Field(
+        default=None,
+        description="쇼핑몰 ID (비우면 전체 쇼핑몰)"
+    )
+    overlap_days: int = Field(
+        default=1,
+        ge=0,
+        le=30,
+        description="기준점 이전으로 겹쳐서 다시 요청할 일수"
+    )
+    initial_days: int = Field(
+        default=7,
+        ge=0,
+        le=90,
+        description="기준점이 없을 때 수집할 일수"
+    )
+    update_changed: bool = Field(
+        default=False,
+        description="이미 저장된 주문도 값이 바뀌었으면 덮어쓰고 updated_at 을 갱신 (다운폼 증분 가공에서 변경 주문을 다시 가공하려면 사용)"
+    )
+
+    @field_validator("order_status")
+    @classmethod
+    def validate_order_status(cls, order_status: OrderStatus) -> OrderStatus:
+        is_valid_order_status(order_status.value)
+        return order_status
@@ -29,6 +29,7 @@ class DownFormOrderCreateResponse(BaseModel):
 
 
 class DownFormOrderItem(BaseModel):
+    id: Optional[int] = None  # 일괄 수정/삭제 시 대상 id
     data: List[DownFormOrderDto]
     status: Optional[str] = None  # row별 상태(success, error 등)
     message: Optional[str] = None # row별 에러 메시지 등
@@ -0,0 +1,44 @@
+from enum import Enum
+from typing import Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class OrderIngestJobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class OrderIngestJobStage(str, Enum):
+    QUEUED = "queued"
+    CREATE_XML = "create_xml"
+    UPLOAD = "upload"
+    FETCH = "fetch"
+    PARSE = "parse"
+    INSERT = "insert"
+    # 스트리밍 수집은 수집/파싱/저장이 겹쳐서 진행되므로 한 단계로 기록
+    STREAM = "stream"
+    DONE = "done"
+
+
+class OrderIngestJobResponse(BaseModel):
+    """
+    주문 수집 백그라운드 작업 상태 응답 객체
+    """
+    job_id: str = Field(..., description="작업 ID")
+    state: OrderIngestJobState = Field(..., description="작업 상태")
+    stage: OrderIngestJobStage = Field(..., description="현재 단계")
+    start_date: str = Field(..., description="수집 시작 날짜 (YYYYMMDD)")
+    end_date: str = Field(..., description="수집 종료 날짜 (YYYYMMDD)")
+    order_status: str = Field(..., description="주문 상태")
+    streaming: bool = Field(..., description="스트리밍 수집 여부")
+    parsed_count: int = Field(0, description="파싱된 주문 수")
+    inserted_count: int = Field(0, description="신규 저장 주문 수")
+    duplicated_count: int = Field(0, description="중복값 무시 건수")
+    stage_elapsed: Dict[str, float] = Field(default_factory=dict, description="단계별 소요 시간(초)")
+    error: Optional[str] = Field(None, description="실패 사유")
+    created_at: datetime = Field(..., description="작업 등록 시각")
+    started_at: Optional[datetime] = Field(None, description="작업 시작 시각")
+    finished_at: Optional[datetime] = Field(None, description="작업 종료 시각")
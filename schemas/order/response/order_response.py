@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+from datetime import date
 from schemas.order.order_dto import OrderDto, OrderBulkDto
 
 
@@ -33,7 +34,26 @@ class OrderResponseList(BaseModel):
             errors=dto.errors,
             success_data=[OrderResponse.from_dto(order_dto) for order_dto in dto.success_data],
         )
-    
+
+
+class OrderCursorResponseList(OrderResponseList):
+    """
+    주문 수집 데이터 커서 기반 조회 객체
+    """
+    next_cursor: Optional[int] = Field(None, description="다음 페이지 조회용 커서 (마지막 페이지면 null)")
+
+    @classmethod
+    def from_dto_with_cursor(cls, dto: OrderBulkDto, next_cursor: Optional[int]) -> "OrderCursorResponseList":
+        # 응답 모델을 한 번만 만들어서 (dump 후 다시 검증하지 않음) 행마다 두 번 변환하지 않음
+        return cls(
+            success_count=dto.success_count,
+            error_count=dto.error_count,
+            success_idx=dto.success_idx,
+            errors=dto.errors,
+            success_data=[OrderResponse.from_dto(order_dto) for order_dto in dto.success_data],
+            next_cursor=next_cursor,
+        )
+
 
 class OrderBulkCreateResponse(BaseModel):
     """
@@ -41,4 +61,20 @@ class OrderBulkCreateResponse(BaseModel):
     """
     total_count: int = Field(..., description="총 건수")
     success_count: int = Field(..., description="성공 건수")
+    updated_count: int = Field(0, description="변경 갱신 건수 (이미 있는 주문을 덮어쓰는 적재에서만)")
+    duplicated_count: int = Field(..., description="중복값 무시 건수")
+
+
+class OrderSyncResponse(BaseModel):
+    """
+    주문 증분 수집 응답 객체
+    """
+    order_status: str = Field(..., description="주문 상태")
+    mall_id: Optional[str] = Field(None, description="쇼핑몰 ID (없으면 전체)")
+    start_date: str = Field(..., description="요청 시작 날짜 (YYYYMMDD)")
+    end_date: str = Field(..., description="요청 종료 날짜 (YYYYMMDD)")
+    total_count: int = Field(..., description="수집 건수")
+    success_count: int = Field(..., description="신규 저장 건수")
+    updated_count: int = Field(0, description="변경 갱신 건수 (update_changed 일 때만)")
     duplicated_count: int = Field(..., description="중복값 무시 건수")
+    watermark_date: date = Field(..., description="전진된 기준점 날짜")
@@ -0,0 +1,166 @@
+import json
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.settings import SETTINGS
+from utils.sabangnet_logger import get_logger
+from utils.sabangnet_path_utils import SabangNetPathUtils
+from services.mall_list.mall_list_fetch import MallListFetchService
+from file_server_handler import upload_xml_content_to_file_server, get_file_server_url
+
+
+logger = get_logger(__name__)
+
+
+class MallRegistryService:
+    """
+    쇼핑몰 목록 캐시.
+    - 메모리 캐시 -> files/json/mall_list.json 스냅샷 -> 사방넷 조회 순으로 사용
+    - TTL 이 지나면 캐시된 목록을 그대로 반환하고 백그라운드에서 갱신
+    - invalidate 이후 첫 조회는 사방넷에서 바로 다시 받아옴
+    """
+
+    _SNAPSHOT_FILE_NAME = "mall_list.json"
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = ttl_seconds or SETTINGS.MALL_LIST_CACHE_TTL_SECONDS
+        self._mall_list: Optional[List[Dict[str, str]]] = None
+        self._mall_name_by_id: Dict[str, str] = {}
+        # 캐시 기준 시각 (time.time 기준, 스냅샷에서 읽으면 파일 수정 시각)
+        self._loaded_at: Optional[float] = None
+        self._invalidated = False
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot_path(self):
+        return SabangNetPathUtils.get_json_file_path() / self._SNAPSHOT_FILE_NAME
+
+    def _set_mall_list(self, mall_list: List[Dict[str, str]], loaded_at: float):
+        self._mall_list = mall_list
+        self._mall_name_by_id = {mall['mall_id']: mall['mall_name'] for mall in mall_list}
+        self._loaded_at = loaded_at
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.time() - self._loaded_at >= self.ttl_seconds
+
+    def _load_snapshot(self) -> bool:
+        """
+        디스크 스냅샷을 메모리에 올리는 함수. 스냅샷이 없거나 읽을 수 없으면 False.
+        """
+
+        snapshot_path = self.snapshot_path
+        if not snapshot_path.exists():
+            return False
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                mall_list = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"쇼핑몰 목록 스냅샷 읽기 실패: {e}")
+            return False
+        self._set_mall_list(mall_list, snapshot_path.stat().st_mtime)
+        logger.info(f"쇼핑몰 목록 스냅샷 로드: {len(mall_list)}개 ({snapshot_path})")
+        return True
+
+    def _ensure_loaded(self):
+        if self._mall_list is None and not self._invalidated:
+            self._load_snapshot()
+
+    def preload(self) -> bool:
+        """
+        디스크 스냅샷을 메모리에 미리 올림 (사방넷 요청은 하지 않음). 이미 올라가 있거나 스냅샷을 읽으면 True.
+        """
+
+        self._ensure_loaded()
+        return self._mall_list is not None
+
+    async def _fetch_from_sabangnet(self) -> List[Dict[str, str]]:
+        """
+        요청 XML 생성 -> 파일 서버 업로드 -> 사방넷 조회. 응답 파싱 시 스냅샷 파일도 같이 갱신됨.
+        """
+
+        fetch_service = MallListFetchService()
+        xml_content = fetch_service.create_request_xml()
+        file_name = f"mall_request_{datetime.now().strftime('%m%d%H%M%S')}.xml"
+        # 파일 서버 업로드는 블로킹이므로 스레드에서 실행
+        object_name = await asyncio.to_thread(upload_xml_content_to_file_server, xml_content, file_name)
+        xml_url = get_file_server_url(object_name)
+        return await fetch_service.get_mall_list_via_url(xml_url)
+
+    async def refresh(self) -> List[Dict[str, str]]:
+        """
+        사방넷에서 쇼핑몰 목록을 다시 받아서 캐시와 스냅샷을 갱신하는 함수.
+        동시에 여러 번 호출되어도 실제 요청은 한 번만 수행함.
+        """
+
+        # CLI 처럼 asyncio.run 이 여러 번 호출되는 경우 루프가 바뀌면 락을 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._refresh_lock is None or self._loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._loop = loop
+        started_at = time.time()
+        async with self._refresh_lock:
+            # 대기하는 동안 다른 호출이 이미 갱신했으면 그대로 사용
+            if self._mall_list is not None and self._loaded_at is not None and self._loaded_at >= started_at:
+                return self._mall_list
+            mall_list = await self._fetch_from_sabangnet()
+            self._set_mall_list(mall_list, time.time())
+            self._invalidated = False
+            logger.info(f"쇼핑몰 목록 갱신 완료: {len(mall_list)}개")
+            return mall_list
+
+    def _schedule_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            # 갱신에 실패해도 기존 캐시는 계속 사용
+            logger.error(f"쇼핑몰 목록 백그라운드 갱신 실패: {e}")
+
+    async def get_mall_list(self, force_refresh: bool = False) -> List[Dict[str, str]]:
+        """
+        쇼핑몰 목록 조회. 캐시가 없으면 사방넷에서 받아오고, TTL 이 지났으면 기존 목록을 반환하면서 백그라운드 갱신.
+        """
+
+        self._ensure_loaded()
+        if force_refresh or self._mall_list is None:
+            return await self.refresh()
+        if self._is_expired():
+            self._schedule_refresh()
+        return self._mall_list
+
+    def get_mall_name(self, mall_id: str) -> Optional[str]:
+        """
+        mall_id 로 쇼핑몰 이름 조회 (캐시/스냅샷만 사용, 없으면 None)
+        """
+
+        self._ensure_loaded()
+        return self._mall_name_by_id.get(mall_id)
+
+    def invalidate(self):
+        """
+        메모리 캐시를 비움. 다음 조회는 스냅샷을 건너뛰고 사방넷에서 다시 받아옴.
+        """
+
+        self._mall_list = None
+        self._mall_name_by_id = {}
+        self._loaded_at = None
+        self._invalidated = True
+        logger.info("쇼핑몰 목록 캐시 무효화")
+
+
+_mall_registry: Optional[MallRegistryService] = None
+
+
+def get_mall_registry() -> MallRegistryService:
+    global _mall_registry
+    if _mall_registry is None:
+        _mall_registry = MallRegistryService()
+    return _mall_registry
@@ -1,12 +1,44 @@
+import time
+import asyncio
 from utils.sabangnet_logger import get_logger
 logger = get_logger(__name__)
+from datetime import datetime, timedelta
+from core.db import AsyncSessionLocal
+from core.settings import SETTINGS
 from sqlalchemy.ext.asyncio import AsyncSession
-from models.order.down_form_order import BaseDownFormOrder
-from typing import Dict, List, Any
-from datetime import datetime
-from schemas.order.down_form_order_mapper import map_raw_to_down_form, map_aggregated_to_down_form
-from repository.template_config_repository import TemplateConfigRepository
+from typing import Dict, List, Any, Tuple
+from schemas.order.data_processing import TemplateProcessResult
+from repository.down_form_order_repository import DownFormOrderRepository
+from repository.receive_order_repository import ReceiveOrderRepository
+from repository.down_form_process_watermark_repository import DownFormProcessWatermarkRepository
+from utils import formula_engine
+from schemas.order.down_form_order_mapping_plan import get_mapping_plan
+from services.order.template_config_cache import get_template_config_cache
+from services.order.template_transform_pool import get_template_transform_pool
+def transform_for_template(config: dict, raw_data: List[Dict[str, Any]], group_missing: Any, process_dt: datetime) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    템플릿 하나의 변환 (프로세스 풀에서 실행할 수 있도록 모듈 함수로 둠). (변환 결과, 소요 시간) 반환
+    """
+    started = time.perf_counter()
+    processed_data = get_mapping_plan(config).transform(raw_data, group_missing, process_dt=process_dt)
+    return processed_data, time.perf_counter() - started
+
+
+def transform_columns_for_template(config: dict, fields: List[str], columns: List[List[Any]], group_missing: Any, process_dt: datetime) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    프로세스 풀용 transform_for_template. 템플릿이 읽는 필드의 컬럼 배열만 받아서 (행마다 키를 반복하는 dict 목록보다 작게 전달)
+    워커에서 행으로 다시 만든 뒤 변환함. (변환 결과, 소요 시간) 반환
+    """
+    started = time.perf_counter()
+    raw_data = [dict(zip(fields, values)) for values in zip(*columns)]
+    processed_data = get_mapping_plan(config).transform(raw_data, group_missing, process_dt=process_dt)
+    return processed_data, time.perf_counter() - started
+
+
 class DataProcessingPipeline:
+    # 원본 행 수가 이 값 이상이면 템플릿별 변환을 공용 프로세스 풀(템플릿이 여러 개일 때) 또는 스레드에서 실행
+    _PROCESS_POOL_THRESHOLD = 20_000
+
     def __init__(self, session: AsyncSession):
         self.session = session
         # 변환 함수들
@@ -16,11 +48,11 @@ class DataProcessingPipeline:
             "barcode_quantity": self._barcode_quantity,
             "calculate_service_fee": self._calculate_service_fee,
         }
-        self.template_config_repo = TemplateConfigRepository(session)
+        self.template_config_cache = get_template_config_cache()
     
     async def process_raw_data_to_down_form_orders(self, 
                                                   raw_data: List[Dict[str, Any]], 
-                                                  template_code: str) -> int:
+                                                  template_code: str) -> Tuple[int, int]:
         logger.info(f"[START] process_raw_data_to_down_form_orders | template_code={template_code} | raw_data_count={len(raw_data)}")
         """
         메인 프로세스: 원본 데이터 -> 템플릿별 변환 -> down_form_orders 저장
@@ -30,10 +62,10 @@ class DataProcessingPipeline:
             template_code: 적용할 템플릿 코드 (예: 'gmarket_erp')
         
         Returns:
-            저장된 레코드 수
+            (신규 저장 건수, 갱신 건수) - 같은 idx 가 이미 있으면 갱신함
         """
         # 1. 템플릿 설정 조회
-        config = await self.template_config_repo.get_template_config(template_code)
+        config = await self.template_config_cache.get_template_config(self.session, template_code)
         if not config:
             logger.error(f"Template not found: {template_code}")
             raise ValueError("Template not found")
@@ -49,89 +81,247 @@ class DataProcessingPipeline:
         logger.info(f"Data processed. processed_data_count={len(processed_data)}. Sample: {processed_data[:3]}")
         
         # 3. down_form_orders에 저장
-        saved_count = await self._save_to_down_form_orders(processed_data, template_code)
-        logger.info(f"[END] process_raw_data_to_down_form_orders | saved_count={saved_count}")
-        return saved_count
+        inserted_count, updated_count = await self._save_to_down_form_orders(processed_data, template_code)
+        logger.info(f"[END] process_raw_data_to_down_form_orders | inserted_count={inserted_count} | updated_count={updated_count}")
+        return inserted_count, updated_count
     
+    async def process_receive_orders_to_down_form_orders(self,
+                                                        filters: Dict[str, Any],
+                                                        template_code: str,
+                                                        chunk_size: int = 5000,
+                                                        delta: bool = False) -> Tuple[int, int, int]:
+        """
+        receive_orders 를 서버 사이드 커서로 chunk_size 단위로 읽어서 묶음마다 변환 -> 저장 (메모리에는 한 묶음만 유지)
+        집계 템플릿은 컬럼 타입상 가능하면 DB 에서 GROUP BY 로 집계해서 집계된 행만 받아오고,
+        그렇지 않으면 group_by_fields 순으로 정렬해서 읽고, 묶음 끝에 걸친 그룹은 다음 묶음과 합쳐서 파이썬에서 집계함.
+        순번(seq)과 처리 일시는 묶음이 바뀌어도 이어짐.
+        delta 실행에서는 템플릿의 기존 최대 순번 다음부터 이어서 매기고, 이미 있는 행의 순번은 바꾸지 않음 (순번이 겹치지 않도록).
+        delta=True 면 (템플릿, 필터)별 기준점 이후 새로 들어오거나 바뀐 주문만 가공하고 (집계 템플릿은 그 주문이 속한 그룹 전체),
+        (바뀐 주문은 update_changed 로 수집해서 updated_at 이 갱신된 경우만 해당, 기본 적재는 이미 있는 주문을 무시함)
+        끝나면 기준점을 이번 실행 시작 시각으로 전진함. 기준점이 없으면 전체를 가공함.
+
+        Returns:
+            (처리한 원본 건수, 신규 저장 건수, 갱신 건수)
+        """
+        logger.info(f"[START] process_receive_orders_to_down_form_orders | template_code={template_code} | chunk_size={chunk_size}")
+        config = await self.template_config_cache.get_template_config(self.session, template_code)
+        if not config:
+            logger.error(f"Template not found: {template_code}")
+            raise ValueError("Template not found")
+        plan = get_mapping_plan(config)
+        watermark_repository = DownFormProcessWatermarkRepository(self.session)
+        filter_key = watermark_repository.make_filter_key(filters)
+        run_started_at = None
+        if delta:
+            run_started_at = await watermark_repository.get_db_now()
+            watermark = await watermark_repository.get_watermark(template_code, filter_key)
+            if watermark is None:
+                logger.info(f"No watermark for template_code={template_code}. Processing all matching orders.")
+            else:
+                # 기준 시각 직전에 시작해서 늦게 커밋된 변경분을 놓치지 않도록 겹쳐서 조회 (upsert 라 다시 가공해도 안전)
+                updated_after = watermark.last_processed_at - timedelta(seconds=SETTINGS.DOWN_FORM_DELTA_OVERLAP_SECONDS)
+                filters = {
+                    **(filters or {}),
+                    'updated_after': updated_after,
+                    'updated_group_fields': plan.group_by_fields if plan.is_aggregated else None,
+                }
+                logger.info(f"Delta mode: processing orders updated after {updated_after}")
+        # 단순 템플릿은 id 순, 집계 템플릿은 묶음 기준 필드 순으로 읽음
+        order_by_fields = plan.group_by_fields if plan.is_aggregated else None
+        group_missing = '' if plan.is_aggregated else None
+        process_dt = datetime.now()
+        next_seq = 1
+        keep_columns = ()
+        if delta:
+            next_seq = await DownFormOrderRepository(self.session).get_max_seq(template_code) + 1
+            keep_columns = ('seq',)
+        first_seq = next_seq
+        processed_count = inserted_count = updated_count = 0
+        carry_rows: List[Dict[str, Any]] = []
+
+        async def _save_processed(processed_data: List[Dict[str, Any]]):
+            nonlocal next_seq, inserted_count, updated_count
+            next_seq += len(processed_data)
+            chunk_inserted, chunk_updated = await self._save_to_down_form_orders(processed_data, template_code, keep_columns)
+            inserted_count += chunk_inserted
+            updated_count += chunk_updated
+
+        async def _save_chunk(chunk_rows: List[Dict[str, Any]]):
+            await _save_processed(plan.transform(chunk_rows, group_missing, start_seq=next_seq, process_dt=process_dt))
+
+        # 집계 템플릿은 가능하면 DB 에서 집계해서 집계된 행만 받아옴
+        if plan.is_aggregated and ReceiveOrderRepository.can_aggregate_in_db(plan.aggregations):
+            logger.info("Aggregating in database (GROUP BY push-down).")
+            fields = [field for field, _ in plan.aggregations]
+            async with AsyncSessionLocal() as read_session:
+                async for aggregated_rows in ReceiveOrderRepository(read_session).stream_aggregated_raw_data_from_receive_orders(
+                    filters, plan.group_by_fields, plan.aggregations, chunk_size
+                ):
+                    # 각 행의 마지막 값은 그룹의 원본 행 수
+                    processed_count += sum(values[-1] for values in aggregated_rows)
+                    await _save_processed(plan.number_rows(
+                        [dict(zip(fields, values[:-1])) for values in aggregated_rows], next_seq, process_dt
+                    ))
+            if delta:
+                await self._advance_watermark(template_code, filter_key, run_started_at, processed_count)
+            logger.info(
+                f"[END] process_receive_orders_to_down_form_orders | processed_count={processed_count} | aggregated_count={next_seq - first_seq} | "
+                f"inserted_count={inserted_count} | updated_count={updated_count}"
+            )
+            return processed_count, inserted_count, updated_count
+
+        # 커서를 유지하는 읽기 세션과 묶음마다 커밋하는 쓰기 세션(self.session)을 분리
+        async with AsyncSessionLocal() as read_session:
+            async for rows in ReceiveOrderRepository(read_session).stream_raw_data_from_receive_orders(
+                filters, chunk_size, order_by_fields
+            ):
+                processed_count += len(rows)
+                if plan.is_aggregated:
+                    # 마지막 그룹은 다음 묶음에 이어질 수 있으므로 남겨둠
+                    rows, carry_rows = plan.split_trailing_group(carry_rows + rows, group_missing)
+                if rows:
+                    await _save_chunk(rows)
+        if carry_rows:
+            await _save_chunk(carry_rows)
+        if delta:
+            await self._advance_watermark(template_code, filter_key, run_started_at, processed_count)
+
+        logger.info(
+            f"[END] process_receive_orders_to_down_form_orders | processed_count={processed_count} | "
+            f"inserted_count={inserted_count} | updated_count={updated_count}"
+        )
+        return processed_count, inserted_count, updated_count
+
+    async def process_receive_orders_to_multiple_templates(self,
+                                                         filters: Dict[str, Any],
+                                                         template_codes: List[str]) -> Tuple[int, List[TemplateProcessResult]]:
+        """
+        receive_orders 를 한 번만 조회해서 여러 템플릿으로 변환하고, 모든 결과를 한 트랜잭션으로 저장
+        (하나라도 실패하면 전체 롤백). 템플릿들이 읽는 컬럼만 조회함.
+        원본이 크면 템플릿별 변환을 서버 공용 프로세스 풀(TemplateTransformPool)에서 동시에 실행하고,
+        워커에는 그 템플릿이 읽는 컬럼 배열만 전달함. 풀이 없으면 (CLI 등) 스레드에서 차례로 변환함.
+
+        Returns:
+            (조회한 원본 건수, 템플릿별 결과 리스트 - 요청 순서)
+        """
+        template_codes = list(dict.fromkeys(template_codes))
+        logger.info(f"[START] process_receive_orders_to_multiple_templates | template_codes={template_codes}")
+        configs = []
+        for template_code in template_codes:
+            config = await self.template_config_cache.get_template_config(self.session, template_code)
+            if not config:
+                logger.error(f"Template not found: {template_code}")
+                raise ValueError(f"Template not found: {template_code}")
+            configs.append(config)
+
+        plans = [get_mapping_plan(config) for config in configs]
+        fields = list(dict.fromkeys(field for plan in plans for field in plan.source_fields))
+        raw_data = await ReceiveOrderRepository(self.session).fetch_raw_data_from_receive_orders(filters, fields)
+        if not raw_data:
+            return 0, []
+
+        process_dt = datetime.now()
+        transform_pool = get_template_transform_pool()
+        is_large = len(raw_data) >= self._PROCESS_POOL_THRESHOLD
+        if len(configs) > 1 and is_large and transform_pool.is_running:
+            logger.info(f"Transforming {len(configs)} templates in the shared process pool. raw_data_count={len(raw_data)}")
+            # 조회한 컬럼마다 배열을 한 번만 만들고, 템플릿별로 읽는 컬럼만 골라서 전달 (idx 는 행 수 보존용으로 항상 포함)
+            raw_columns = {field: [row[field] for row in raw_data] for field in raw_data[0]}
+            transform_args = []
+            for config, plan in zip(configs, plans):
+                plan_fields = [field for field in dict.fromkeys(['idx', *plan.source_fields]) if field in raw_columns]
+                transform_args.append((
+                    config,
+                    plan_fields,
+                    [raw_columns[field] for field in plan_fields],
+                    '' if config['is_aggregated'] else None,
+                    process_dt,
+                ))
+            transformed = await asyncio.gather(*(
+                transform_pool.run(transform_columns_for_template, *args) for args in transform_args
+            ))
+        else:
+            def _transform_all() -> List[Tuple[List[Dict[str, Any]], float]]:
+                return [
+                    transform_for_template(config, raw_data, '' if config['is_aggregated'] else None, process_dt)
+                    for config in configs
+                ]
+            # 원본이 크면 이벤트 루프를 막지 않도록 스레드에서 변환
+            transformed = await asyncio.to_thread(_transform_all) if is_large else _transform_all()
+
+        # 모든 템플릿 결과를 한 트랜잭션으로 저장
+        repository = DownFormOrderRepository(self.session)
+        results = []
+        try:
+            for template_code, (processed_data, transform_seconds) in zip(template_codes, transformed):
+                started = time.perf_counter()
+                inserted_count, updated_count = await repository.bulk_upsert(processed_data, commit=False)
+                results.append(TemplateProcessResult(
+                    template_code=template_code,
+                    output_count=len(processed_data),
+                    inserted_count=inserted_count,
+                    updated_count=updated_count,
+                    transform_seconds=round(transform_seconds, 3),
+                    save_seconds=round(time.perf_counter() - started, 3),
+                ))
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Exception during process_receive_orders_to_multiple_templates: {e}")
+            raise
+        logger.info(f"[END] process_receive_orders_to_multiple_templates | raw_data_count={len(raw_data)} | results={results}")
+        return len(raw_data), results
+
+    async def _advance_watermark(self, template_code: str, filter_key: str, processed_at: datetime, processed_count: int):
+        """
+        가공이 끝까지 성공했을 때만 기준점을 전진 (중간에 실패하면 다음 실행에서 같은 구간을 다시 가공)
+        """
+        try:
+            await DownFormProcessWatermarkRepository(self.session).advance_watermark(
+                template_code, filter_key, processed_at, processed_count
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Exception during _advance_watermark: {e}")
+            raise
+        logger.info(f"Watermark advanced | template_code={template_code} | processed_at={processed_at}")
+
     async def _process_simple_data(self, 
                                  raw_data: List[Dict[str, Any]], 
                                  config: dict) -> List[Dict[str, Any]]:
         """단순 변환 (1:1 매핑)"""
-        processed_data = []
-        for seq, raw_row in enumerate(raw_data, start=1):
-            processed_row = {
-                'process_dt': datetime.now(),
-                'form_name': config['template_code'],
-                'seq': seq,
-            }
-            processed_row.update(map_raw_to_down_form(raw_row, config))
-            processed_data.append(processed_row)
-        return processed_data
+        return get_mapping_plan(config).transform(raw_data)
     
     async def _process_aggregated_data(self, 
                                      raw_data: List[Dict[str, Any]], 
                                      config: dict) -> List[Dict[str, Any]]:
         """집계 변환 (합포장용)"""
-        grouped_data = {}
-        group_field_mapping = {
-            'order_id': 'order_id',
-            'receive_name': 'receive_name', 
-            'receive_addr': 'receive_addr'
-        }
-        for raw_row in raw_data:
-            group_key = tuple(
-                raw_row.get(group_field_mapping.get(field, field), '') 
-                for field in config['group_by_fields']
-            )
-            if group_key not in grouped_data:
-                grouped_data[group_key] = []
-            grouped_data[group_key].append(raw_row)
-        processed_data = []
-        for seq, (group_key, group_rows) in enumerate(grouped_data.items(), start=1):
-            processed_row = {
-                'process_dt': datetime.now(),
-                'form_name': config['template_code'],
-                'seq': seq,
-            }
-            processed_row.update(map_aggregated_to_down_form(group_rows, config))
-            processed_data.append(processed_row)
-        return processed_data
+        # 묶음 기준 필드가 없는 행은 빈 문자열로 묶음
+        return get_mapping_plan(config).transform(raw_data, group_missing='')
     
-    async def _save_to_down_form_orders(self, processed_data: List[Dict[str, Any]], template_code: str) -> int:
+    async def _save_to_down_form_orders(self, processed_data: List[Dict[str, Any]], template_code: str, keep_columns: Tuple[str, ...] = ()) -> Tuple[int, int]:
         logger.info(f"[START] _save_to_down_form_orders | processed_data_count={len(processed_data)} | template_code={template_code}")
         if not processed_data:
             logger.warning("No processed data to save.")
-            return 0
+            return 0, 0
         try:
-            objects = [BaseDownFormOrder(**row) for row in processed_data]
-            self.session.add_all(objects)
-            await self.session.commit()
-            logger.info(f"[END] _save_to_down_form_orders | saved_count={len(objects)}")
-            return len(objects)
+            inserted_count, updated_count = await DownFormOrderRepository(self.session).bulk_upsert(processed_data, keep_columns=keep_columns)
+            logger.info(f"[END] _save_to_down_form_orders | inserted_count={inserted_count} | updated_count={updated_count}")
+            return inserted_count, updated_count
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Exception during _save_to_down_form_orders: {e}")
             raise
     
-    # 변환 함수들
+    # 변환 함수들 (수식 엔진에서도 같은 함수를 사용)
     def _convert_delivery_method(self, value: Any, context: Dict[str, Any]) -> str:
-        if not value:
-            return ""
-        mapping = {"credit": "선불", "cod": "착불", "prepaid": "선불"}
-        return mapping.get(str(value).lower(), str(value))
+        return formula_engine.convert_delivery_method(value, context)
     
     def _sku_quantity(self, value: Any, context: Dict[str, Any]) -> str:
-        sku_alias = context.get('sku_alias', '') or value or ''
-        sale_cnt = context.get('sale_cnt', 0) or 0
-        return f"{sku_alias} {sale_cnt}개" if sku_alias else ""
+        return formula_engine.sku_quantity(value, context)
     
     def _barcode_quantity(self, value: Any, context: Dict[str, Any]) -> str:
-        barcode = context.get('barcode', '') or value or ''
-        sale_cnt = context.get('sale_cnt', 0) or 0
-        return f"{barcode} {sale_cnt}개" if barcode else ""
+        return formula_engine.barcode_quantity(value, context)
     
     def _calculate_service_fee(self, value: Any, context: Dict[str, Any]) -> int:
-        pay_cost = context.get('pay_cost', 0) or 0
-        mall_won_cost = context.get('mall_won_cost', 0) or 0
-        sale_cnt = context.get('sale_cnt', 0) or 0
-        return int(pay_cost - (mall_won_cost * sale_cnt))
\ No newline at end of file
+        return formula_engine.calculate_service_fee(value, context)
\ No newline at end of file
@@ -16,9 +16,24 @@ class DownFormOrderCreateService:
         orm_objs = [item.to_orm(BaseDownFormOrder) for item in items]
         return await self.down_form_order_repository.bulk_insert(orm_objs)
 
-    async def bulk_update_down_form_orders(self, items: list[DownFormOrderDto]):
-        orm_objs = [item.to_orm(BaseDownFormOrder) for item in items]
-        return await self.down_form_order_repository.bulk_update(orm_objs)
+    async def bulk_update_down_form_orders(self, items: list[DownFormOrderDto]) -> set[int]:
+        """
+        요청에 들어있는 필드만 id 기준으로 일괄 수정 (id 가 없는 항목은 제외, 같은 id 는 마지막 항목 사용)
+        id 외에 수정할 필드가 없는 항목은 수정하지 않음
+        Returns:
+            수정된 id 집합
+        """
+        rows_by_id = {item.id: item.model_dump(exclude_unset=True) for item in items if item.id is not None}
+        rows = [row for row in rows_by_id.values() if self.has_update_fields(row)]
+        return await self.down_form_order_repository.bulk_update(rows)
+
+    @staticmethod
+    def has_update_fields(row: dict) -> bool:
+        return any(key != 'id' for key in row)
 
-    async def bulk_delete_down_form_orders(self, ids: list[int]):
+    async def bulk_delete_down_form_orders(self, ids: list[int]) -> set[int]:
+        """
+        Returns:
+            삭제된 id 집합
+        """
         return await self.down_form_order_repository.bulk_delete(ids)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import asyncio
+import tempfile
+from datetime import datetime
+from typing import Any, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+from sqlalchemy import Integer, Numeric, DateTime
+
+from core.db import AsyncSessionLocal
+from utils.sabangnet_logger import get_logger
+from models.order.down_form_order import BaseDownFormOrder
+from repository.down_form_order_repository import DownFormOrderRepository
+from services.order.template_config_cache import get_template_config_cache
+
+
+logger = get_logger(__name__)
+
+
+class DownFormOrderExcelExportService:
+    """
+    down_form_orders 를 템플릿(ERP / 합포) 엑셀 파일로 내보내기.
+    - 헤더는 템플릿 컬럼 매핑의 target_column, 값은 source_field 컬럼
+    - openpyxl write-only 워크북에 서버 사이드 커서로 읽은 묶음을 바로 기록하므로 건수와 상관없이 메모리 사용량이 일정함
+    - 서식은 컬럼 타입별로 한 번만 만들어 두고 모든 셀이 같은 서식을 공유함
+    """
+
+    MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    _CHUNK_SIZE = 1000
+    _FONT = Font(name='맑은 고딕', size=9)
+    _HEADER_RGB = "006100"
+    _MIN_WIDTH = 8
+    _MAX_WIDTH = 50
+
+    def __init__(self, template_code: str, chunk_size: int = None):
+        self.template_code = template_code
+        self.chunk_size = chunk_size or self._CHUNK_SIZE
+        self.template_config_cache = get_template_config_cache()
+
+    def get_file_name(self) -> str:
+        return f"{self.template_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
+
+    def _get_number_format(self, field: str) -> str:
+        column = BaseDownFormOrder.__table__.columns.get(field)
+        if column is None:
+            return 'General'
+        if isinstance(column.type, Integer):
+            return '0'
+        if isinstance(column.type, Numeric):
+            return '#,##0.00'
+        if isinstance(column.type, DateTime):
+            return 'yyyy-mm-dd hh:mm:ss'
+        # 문자열은 0 으로 시작하는 번호(우편번호, 전화번호 등)가 숫자로 바뀌지 않도록 텍스트 서식
+        return '@'
+
+    def _get_width(self, target_column: str) -> float:
+        # 한글 등 전각 문자는 두 칸으로 계산
+        width = sum(2 if ord(char) > 127 else 1 for char in target_column) + 4
+        return min(max(width, self._MIN_WIDTH), self._MAX_WIDTH)
+
+    def _make_style_cell(self, ws, number_format: str = 'General', fill: PatternFill = None, alignment: Alignment = None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws)
+        cell.font = self._FONT
+        cell.number_format = number_format
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        return cell
+
+    def _write_header(self, ws, column_mappings: list[dict]) -> list[WriteOnlyCell]:
+        """
+        컬럼 너비/서식과 헤더 행을 기록하고, 데이터 셀에 공유할 컬럼별 서식 셀 목록을 반환
+        (write-only 시트는 컬럼 설정을 첫 행 기록 전에 해야 함)
+        """
+        header_fill = PatternFill(start_color=self._HEADER_RGB, end_color=self._HEADER_RGB, fill_type="solid")
+        header_alignment = Alignment(horizontal='center')
+        style_cells = []
+        header_cells = []
+        for index, col in enumerate(column_mappings, start=1):
+            number_format = self._get_number_format(col['source_field'])
+            column_dimension = ws.column_dimensions[get_column_letter(index)]
+            column_dimension.width = self._get_width(col['target_column'])
+            column_dimension.font = self._FONT
+            column_dimension.number_format = number_format
+            style_cells.append(self._make_style_cell(ws, number_format))
+
+            header_cell = self._make_style_cell(ws, fill=header_fill, alignment=header_alignment)
+            header_cell.value = col['target_column']
+            header_cells.append(header_cell)
+        ws.freeze_panes = 'A2'
+        ws.append(header_cells)
+        return style_cells
+
+    @staticmethod
+    def _to_cell_value(value: Any) -> Any:
+        # 엑셀은 시간대를 지원하지 않으므로 timestamptz 값은 시간대 정보를 뗌
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.replace(tzinfo=None)
+        return value
+
+    def _append_rows(self, ws, rows: list[tuple[Any, ...]], style_cells: list[WriteOnlyCell]):
+        to_cell_value = self._to_cell_value
+        for row in rows:
+            cells = []
+            for value, style_cell in zip(row, style_cells):
+                if value is None:
+                    # 빈 셀은 기록하지 않음 (컬럼 서식이 적용됨)
+                    cells.append(None)
+                    continue
+                cell = WriteOnlyCell(ws, to_cell_value(value))
+                # 서식을 셀마다 다시 찾지 않고 컬럼 서식 셀의 스타일을 그대로 공유 (write-only 셀은 기록 후 버려짐)
+                cell._style = style_cell._style
+                cells.append(cell)
+            ws.append(cells)
+
+    async def export_to_file(self, file_path: Optional[str] = None) -> tuple[str, int]:
+        """
+        템플릿 엑셀 파일을 만들어서 (파일 경로, 행 수) 를 반환. file_path 가 없으면 임시 파일에 기록함.
+        엑셀 기록은 스레드에서 실행해서 이벤트 루프를 막지 않음.
+        Raises:
+            ValueError: 템플릿이 없는 경우
+        """
+
+        async with AsyncSessionLocal() as session:
+            config = await self.template_config_cache.get_template_config(session, self.template_code)
+            if config is None:
+                raise ValueError(f"Template not found: {self.template_code}")
+            column_mappings = config['column_mappings']
+            fields = [col['source_field'] for col in column_mappings]
+
+            wb = Workbook(write_only=True)
+            # 시트 이름은 31자 제한
+            ws = wb.create_sheet(title=self.template_code[:31])
+            style_cells = self._write_header(ws, column_mappings)
+
+            if file_path is None:
+                fd, file_path = tempfile.mkstemp(suffix='.xlsx')
+                os.close(fd)
+            row_count = 0
+            try:
+                repository = DownFormOrderRepository(session)
+                async for rows in repository.stream_down_form_order_values(fields, self.template_code, self.chunk_size):
+                    row_count += len(rows)
+                    await asyncio.to_thread(self._append_rows, ws, rows, style_cells)
+                await asyncio.to_thread(wb.save, file_path)
+            except Exception:
+                os.remove(file_path)
+                raise
+        logger.info(f"다운폼 엑셀 내보내기 완료: {self.template_code} {row_count}건 ({'합포' if config.get('is_aggregated') else 'ERP'})")
+        return file_path, row_count
@@ -1,8 +1,15 @@
+import time
+from typing import Optional
+from core.settings import SETTINGS
 from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.order.down_form_order_dto import DownFormOrderDto
 from repository.down_form_order_repository import DownFormOrderRepository
 
 
+# template_code -> (정확한 건수, 조회 시각) : count='cached' 조회용
+_count_cache: dict[Optional[str], tuple[int, float]] = {}
+
+
 class DownFormOrderReadService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -14,4 +21,43 @@ class DownFormOrderReadService:
     async def get_down_form_orders_paginated(self, page: int = 1, page_size: int = 100, template_code: str = None):
         items = await self.down_form_order_repository.get_down_form_orders_pagination(page, page_size, template_code)
         total = await self.down_form_order_repository.count_all(template_code)
-        return items, total
\ No newline at end of file
+        return items, total
+
+    async def get_down_form_order_rows_after(
+            self,
+            after_id: int = 0,
+            limit: int = 100,
+            template_code: str = None,
+            count: str = 'none',
+    ) -> tuple[list[dict], Optional[int], Optional[int]]:
+        """
+        id 키셋 페이지 조회. 한 건 더 읽어서 다음 페이지 여부를 판단함.
+        Args:
+            count: 전체 건수 계산 방식
+                - none: 계산하지 않음
+                - approximate: 실행 계획 예상 행 수 (빠르지만 오차 있음)
+                - cached: 정확한 건수를 DOWN_FORM_COUNT_CACHE_TTL_SECONDS 동안 재사용
+                - exact: 매번 count(*)
+        Returns:
+            (행 dict 리스트, 다음 커서(마지막 페이지면 None), 전체 건수(none 이면 None))
+        """
+        rows = await self.down_form_order_repository.get_down_form_order_rows_after(after_id, limit + 1, template_code)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]['id']
+        return rows, next_cursor, await self._count(template_code, count)
+
+    async def _count(self, template_code: str, count: str) -> Optional[int]:
+        if count == 'approximate':
+            return await self.down_form_order_repository.estimate_count(template_code)
+        if count == 'cached':
+            cached = _count_cache.get(template_code)
+            if cached is not None and time.time() - cached[1] < SETTINGS.DOWN_FORM_COUNT_CACHE_TTL_SECONDS:
+                return cached[0]
+            total = await self.down_form_order_repository.count_all(template_code)
+            _count_cache[template_code] = (total, time.time())
+            return total
+        if count == 'exact':
+            return await self.down_form_order_repository.count_all(template_code)
+        return None
\ No newline at end of file
@@ -0,0 +1,148 @@
+import re
+import hashlib
+
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+_NON_DIGIT_PATTERN = re.compile(r'[^0-9]')
+
+
+def _mask_name(value: str) -> str:
+    if len(value) <= 1:
+        return '*'
+    return value[0] + '*' * (len(value) - 1)
+
+
+def _mask_phone(value: str) -> str:
+    phone_digits = _NON_DIGIT_PATTERN.sub('', value)
+    if len(phone_digits) == 11:
+        return phone_digits[:3] + '****' + phone_digits[7:]
+    if len(phone_digits) == 10:
+        return phone_digits[:3] + '****' + phone_digits[6:]
+    return '****'
+
+
+def _mask_address(value: str) -> str:
+    parts = value.split()
+    if len(parts) > 2:
+        return ' '.join(parts[:2]) + ' ****'
+    return '****'
+
+
+def _mask_zipcode(value: str) -> str:
+    if len(value) >= 3:
+        return value[:3] + '*' * (len(value) - 3)
+    return '*' * len(value)
+
+
+def _mask_id(value: str) -> str:
+    return hashlib.md5(value.encode()).hexdigest()[:8]
+
+
+def _mask_user_id(value: str) -> str:
+    if len(value) > 2:
+        return value[:2] + '*' * (len(value) - 2)
+    return '*' * len(value)
+
+
+_MASK_FUNCTIONS = {
+    'name': _mask_name,
+    'phone': _mask_phone,
+    'address': _mask_address,
+    'zipcode': _mask_zipcode,
+    'id': _mask_id,
+    'user_id': _mask_user_id,
+}
+
+
+def mask_values(mask_type: str, values: list[str]) -> list[str]:
+    """
+    같은 민감타입의 값 목록을 한 번에 마스킹하는 함수.
+    OrderCreateService._mask_personal_info 와 같은 결과를 반환함.
+    (프로세스 풀에서 실행할 수 있도록 모듈 수준 함수로 둠)
+    """
+
+    mask_function = _MASK_FUNCTIONS.get(mask_type)
+    if mask_function is None:
+        return list(values)
+    return [value if not value or value.isspace() else mask_function(value) for value in values]
+
+
+class OrderBatchMasker:
+    """
+    주문 목록 개인정보 일괄 마스킹.
+    - 마스킹 규칙의 필드(컬럼) 단위로 값을 모아서 처리
+    - 한 번 실행하는 동안 같은 값은 한 번만 마스킹 (주문번호 해시 등 반복 계산 제거)
+    - 고유값이 많으면 프로세스 풀로 나눠서 처리
+    """
+
+    # 프로세스 풀을 사용하기 시작하는 고유값 수, 프로세스 하나에 넘기는 값 수
+    _PROCESS_POOL_THRESHOLD = 200_000
+    _PROCESS_CHUNK_SIZE = 50_000
+
+    def __init__(self, masking_rules: dict[str, str], process_pool_threshold: int = None, max_workers: int = None):
+        """
+        Args:
+            masking_rules: {주문 dict 키: 민감타입}
+            process_pool_threshold: 고유값 수가 이 값 이상이면 프로세스 풀 사용 (0이면 사용 안함)
+            max_workers: 프로세스 풀 크기 (기본값: CPU 수)
+        """
+        self.masking_rules = masking_rules
+        self.process_pool_threshold = self._PROCESS_POOL_THRESHOLD if process_pool_threshold is None else process_pool_threshold
+        self.max_workers = max_workers
+
+    def mask_orders(self, order_dict_list: list[dict]) -> list[dict]:
+        """
+        주문 dict 리스트를 제자리에서 마스킹하고 그대로 반환하는 함수.
+        """
+
+        if not order_dict_list:
+            return order_dict_list
+
+        # 민감타입별로 고유값을 모아서 한 번에 마스킹
+        unique_values: dict[str, dict[str, None]] = {mask_type: {} for mask_type in set(self.masking_rules.values())}
+        for field_name, mask_type in self.masking_rules.items():
+            values = unique_values[mask_type]
+            for order_detail in order_dict_list:
+                value = order_detail.get(field_name)
+                if value:
+                    values[value] = None
+
+        masked_lookup = {
+            mask_type: dict(zip(values, masked))
+            for mask_type, values, masked in self._mask_unique_values(unique_values)
+        }
+
+        for field_name, mask_type in self.masking_rules.items():
+            lookup = masked_lookup[mask_type]
+            for order_detail in order_dict_list:
+                value = order_detail.get(field_name)
+                if value:
+                    order_detail[field_name] = lookup[value]
+        return order_dict_list
+
+    def _mask_unique_values(self, unique_values: dict[str, dict[str, None]]) -> list[tuple[str, list[str], list[str]]]:
+        total_unique = sum(len(values) for values in unique_values.values())
+        if not self.process_pool_threshold or total_unique < self.process_pool_threshold:
+            return [
+                (mask_type, list(values), mask_values(mask_type, list(values)))
+                for mask_type, values in unique_values.items()
+            ]
+
+        logger.info(f"개인정보 마스킹 프로세스 풀 사용: 고유값 {total_unique}개")
+        chunks = []
+        for mask_type, values in unique_values.items():
+            values = list(values)
+            for start in range(0, len(values), self._PROCESS_CHUNK_SIZE):
+                chunks.append((mask_type, values[start:start + self._PROCESS_CHUNK_SIZE]))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            masked_chunks = executor.map(mask_values, [mask_type for mask_type, _ in chunks], [values for _, values in chunks])
+            return [
+                (mask_type, values, masked)
+                for (mask_type, values), masked in zip(chunks, masked_chunks)
+            ]
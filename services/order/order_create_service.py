@@ -1,22 +1,26 @@
 import re
 import json
+import httpx
+import codecs
+import asyncio
 import hashlib
-import requests
 import xml.etree.ElementTree as ET
 
 from pathlib import Path
-from decimal import Decimal
-from urllib.parse import urljoin
-from datetime import datetime, date
+from typing import AsyncIterator, Callable
+from datetime import datetime, timedelta
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.settings import SETTINGS
+from core.sabangnet_client import get_sabangnet_client
 from utils.sabangnet_logger import get_logger
 from utils.sabangnet_path_utils import SabangNetPathUtils
+from utils.json_array_reader import iter_json_array
+from utils.receive_order_conversion_plan import RECEIVE_ORDER_CONVERSION_PLAN
 from utils.make_xml.order_create_xml import OrderCreateXml
 from minio_handler import upload_file_to_minio, get_minio_file_url
 from repository.receive_order_repository import ReceiveOrderRepository
+from services.order.order_batch_masker import OrderBatchMasker
 
 from schemas.order.order_dto import OrderDto
 from schemas.order.response.order_response import OrderBulkCreateResponse
@@ -31,6 +35,7 @@ class OrderCreateService:
     """
     
     _JSON_PATH = SabangNetPathUtils.get_json_file_path()
+    _ORDER_INFO_PATH = '/RTL_API/xml_order_info.html'
     _MASKING_RULES = {
         'USER_NAME': 'name',
         'RECEIVE_NAME': 'name',
@@ -44,27 +49,17 @@ class OrderCreateService:
         'MALL_ORDER_ID': 'id',
         'MALL_USER_ID': 'user_id'
     }
-    _DECIMAL_FIELDS = [
-        'total_cost',
-        'pay_cost',
-        'sale_cost',
-        'mall_won_cost',
-        'won_cost',
-        'delv_cost'
-    ]
-    _INT_FIELDS = [
-        'sale_cnt',
-        'box_ea',
-        'p_ea',
-        'acnt_regs_srno'
-    ]
-    _DATE_FIELDS = [
-        'order_date'
-    ]
+    # 스트리밍 수집 시 한 번에 DB로 넘기는 주문 수, 응답 본문을 읽는 단위(byte)
+    _STREAM_BATCH_SIZE = 500
+    _STREAM_CHUNK_SIZE = 64 * 1024
 
     def __init__(self, session: AsyncSession):
         self.session = session
         self.receive_order_repository = ReceiveOrderRepository(session)
+        # 파싱된 주문 dict 는 키가 소문자이므로 규칙 키도 소문자로 맞춤
+        self.order_batch_masker = OrderBatchMasker(
+            {field_name.lower(): mask_type for field_name, mask_type in self._MASKING_RULES.items()}
+        )
 
     def create_request_xml(self, ord_st_date: str, ord_ed_date: str, order_status: str, dst_path_name: str = None) -> Path:
         order_create_xml = OrderCreateXml(
@@ -84,47 +79,125 @@ class OrderCreateService:
         logger.info(f"MinIO에 업로드된 XML URL: {xml_url}")
         return xml_url
     
-    def get_orders_from_sabangnet(self, xml_url: str) -> str:
+    async def get_orders_from_sabangnet(self, xml_url: str) -> str:
         try:
-            api_url = urljoin(SETTINGS.SABANG_ADMIN_URL, '/RTL_API/xml_order_info.html')
-            full_url = f"{api_url}?xml_url={xml_url}"
-            logger.info(f"최종 요청 URL: {full_url}")
-            response = requests.get(full_url, timeout=30)
-            response_text = str(response.text)
-            if len(response_text) > 100:
-                response_text = response_text[:100] + "..."
-            logger.info(f"API 요청 결과: {response_text}")
-            response.raise_for_status()
-            return response.text
+            logger.info(f"주문 수집 요청 XML URL: {xml_url}")
+            response_text = await get_sabangnet_client().get_text(self._ORDER_INFO_PATH, params={'xml_url': xml_url})
+            log_text = response_text
+            if len(log_text) > 100:
+                log_text = log_text[:100] + "..."
+            logger.info(f"API 요청 결과: {log_text}")
+            return response_text
                 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API 요청 실패: {e}")
             raise
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}")
             raise
 
-    def _parse_date_field(self, val: str) -> date | None:
+    def _split_date_windows(self, ord_st_date: str, ord_ed_date: str, window_days: int = 1) -> list[tuple[str, str]]:
+        """
+        YYYYMMDD 기간을 window_days 일 단위의 (시작일, 종료일) 구간 리스트로 나누는 함수.
+        """
+
+        start = datetime.strptime(ord_st_date, '%Y%m%d').date()
+        end = datetime.strptime(ord_ed_date, '%Y%m%d').date()
+        windows = []
+        while start <= end:
+            window_end = min(start + timedelta(days=window_days - 1), end)
+            windows.append((start.strftime('%Y%m%d'), window_end.strftime('%Y%m%d')))
+            start = window_end + timedelta(days=1)
+        return windows
+
+    async def _collect_shard(self, ord_st_date: str, ord_ed_date: str, order_status: str, safe_mode: bool = True) -> list[dict]:
         """
-        날짜 형식을 변환하는 함수.
+        구간 하나(기간 + 상태코드)에 대해 요청 XML 생성 -> 업로드 -> 수집 -> 파싱까지 수행하는 함수.
         """
 
-        if not val:
-            return None
+        now_str = datetime.now().strftime("%m%d%H%M%S")
+        dst_path_name = f"order_create_request_{ord_st_date}_{ord_ed_date}_{order_status}_{now_str}.xml"
+        # XML 생성과 MinIO 업로드는 블로킹이므로 스레드에서 실행
+        xml_file_path = await asyncio.to_thread(self.create_request_xml, ord_st_date, ord_ed_date, order_status, dst_path_name)
+        xml_url = await asyncio.to_thread(self.get_xml_url_from_minio, xml_file_path)
+        xml_content = await self.get_orders_from_sabangnet(xml_url)
+        order_dict_list = await asyncio.to_thread(self._parse_xml_to_order_list, xml_content, safe_mode)
+        logger.info(f"구간 수집 완료: {ord_st_date}~{ord_ed_date} / 상태 {order_status} / {len(order_dict_list)}건")
+        return order_dict_list
+
+    async def collect_orders_sharded(
+            self,
+            ord_st_date: str,
+            ord_ed_date: str,
+            order_statuses: list[str],
+            window_days: int = 1,
+            concurrency: int = 4,
+            safe_mode: bool = True
+        ) -> list[dict]:
+        """
+        기간을 window_days 단위로, 상태코드별로 나눠서 동시에 수집한 뒤 idx 기준으로 중복 제거하여 합치는 함수.
+        """
+
+        shards = [
+            (shard_st_date, shard_ed_date, order_status)
+            for shard_st_date, shard_ed_date in self._split_date_windows(ord_st_date, ord_ed_date, window_days)
+            for order_status in order_statuses
+        ]
+        logger.info(f"분할 수집 시작: {len(shards)}개 구간 (동시 {concurrency}개)")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(shard: tuple[str, str, str]) -> list[dict]:
+            async with semaphore:
+                return await self._collect_shard(*shard, safe_mode=safe_mode)
+
+        shard_results = await asyncio.gather(*(_run(shard) for shard in shards))
+
+        merged_orders: dict[str, dict] = {}
+        no_idx_orders: list[dict] = []
+        for order_dict_list in shard_results:
+            for order_detail in order_dict_list:
+                idx = order_detail.get('idx')
+                if not idx:
+                    no_idx_orders.append(order_detail)
+                    continue
+                merged_orders.setdefault(idx, order_detail)
+        order_dict_list = list(merged_orders.values()) + no_idx_orders
+        total_fetched = sum(len(result) for result in shard_results)
+        logger.info(f"분할 수집 완료: {total_fetched}건 수집, 중복 제거 후 {len(order_dict_list)}건")
+        return order_dict_list
+
+    async def save_orders_to_db_sharded(
+            self,
+            ord_st_date: str,
+            ord_ed_date: str,
+            order_statuses: list[str],
+            window_days: int = 1,
+            concurrency: int = 4,
+            safe_mode: bool = True
+        ) -> OrderBulkCreateResponse:
+        """
+        분할 병렬 수집 결과를 DB에 저장하는 함수.
+        """
+
+        order_dict_list = await self.collect_orders_sharded(
+            ord_st_date, ord_ed_date, order_statuses, window_days, concurrency, safe_mode
+        )
         try:
-            if len(val) == 8:
-                return datetime.strptime(val, '%Y%m%d').date()
-            elif len(val) == 14:
-                return datetime.strptime(val, '%Y%m%d%H%M%S').date()
-            else:
-                return None
+            success_idx_list = await self.receive_order_repository.bulk_copy_orders(order_dict_list)
         except Exception as e:
-            logger.error(f"order_date 변환 실패: {val} ({e})")
-            return None
+            logger.error(f"DB 저장 중 오류: {e}")
+            raise
+        return OrderBulkCreateResponse(
+            total_count=len(order_dict_list),
+            success_count=len(success_idx_list),
+            duplicated_count=len(order_dict_list) - len(success_idx_list),
+        )
 
-    def _convert_json_to_order_list(self, json_orders: list[dict], safe_mode: bool = True) -> list[dict]:
+    def _convert_json_to_order_list(self, json_orders: list[dict], safe_mode: bool = False) -> list[dict]:
         """
         JSON 데이터를 파싱하여 주문 리스트를 반환하는 함수.
+        files/json 의 파일은 save_orders_to_json_from_xml 에서 이미 마스킹되어 저장되므로 기본값은 마스킹하지 않음.
+        (마스킹되지 않은 원본 JSON 일 때만 safe_mode=True, 다시 마스킹하면 전화번호/주문번호 값이 망가짐)
         """
         
         order_dict_list = []
@@ -132,92 +205,97 @@ class OrderCreateService:
             # 대소문자 변환
             order_detail = {k.lower(): v for k, v in order.items()}
             
-            # 마스킹 처리
-            if safe_mode:
-                for field_name, mask_type in self._MASKING_RULES.items():
-                    if field_name in order_detail and order_detail[field_name]:
-                        order_detail[field_name] = self._mask_personal_info(order_detail[field_name], mask_type)
-            
-            # 기본 필드 추가
-            order_detail["receive_dt"] = datetime.now()
-            
             # 필드 타입 변환
-            for field in self._DECIMAL_FIELDS:
-                if field in order_detail:
-                    try:
-                        order_detail[field] = Decimal(order_detail[field]) if order_detail[field] != '' else None
-                    except Exception as e:
-                        logger.error(f"{field} Decimal 변환 실패: {order_detail[field]} ({e})")
-                        order_detail[field] = None
-            
-            for field in self._INT_FIELDS:
-                if field in order_detail:
-                    try:
-                        order_detail[field] = int(order_detail[field]) if order_detail[field] != '' else None
-                    except Exception as e:
-                        logger.error(f"{field} int 변환 실패: {order_detail[field]} ({e})")
-                        order_detail[field] = None
-            
-            for field in self._DATE_FIELDS:
-                if field in order_detail:
-                    order_detail[field] = self._parse_date_field(order_detail[field])
+            self._convert_order_types(order_detail)
             
             # dict 형태로 직접 추가
             order_dict_list.append(order_detail)
         
+        # 원본 JSON 인 경우에만 마스킹 (키가 소문자이므로 XML 경로와 같은 소문자 규칙의 배치 마스커 사용)
+        self._mask_batch(order_dict_list, safe_mode)
         logger.info(f"총 {len(order_dict_list)}개의 주문을 변환했습니다.")
         return order_dict_list
 
+    def _convert_order_types(self, order_detail: dict) -> dict:
+        """
+        주문 dict의 금액/수량/날짜 필드 타입을 변환하는 함수.
+        (receive_orders 테이블 메타데이터로 만든 변환 계획 사용)
+        """
+
+        return RECEIVE_ORDER_CONVERSION_PLAN.convert(order_detail)
+
+    def _parse_data_node(self, data_node: ET.Element, safe_mode: bool = True) -> dict:
+        """
+        XML DATA 노드 하나를 주문 dict로 변환하는 함수.
+        """
+
+        # 먼저 dict로 데이터 수집
+        order_detail = {}
+        for elem in data_node.findall('*'):
+            elem_tag = elem.tag.strip() if elem.tag else ''
+            elem_text = elem.text.strip() if elem.text else ''
+            if elem.tag and elem.text:
+                if safe_mode and (elem_tag in self._MASKING_RULES):
+                    mask_type = self._MASKING_RULES[elem_tag]
+                    elem_text = self._mask_personal_info(elem_text, mask_type)
+                # XML 태그명을 소문자로 변환해서 저장
+                order_detail[elem_tag.lower()] = elem_text
+        return self._convert_order_types(order_detail)
+
     def _parse_xml_to_order_list(self, xml_content: str, safe_mode: bool = True) -> list[dict]:
         """
         XML을 파싱하여 주문 리스트를 반환하는 함수.
         """
         
         root = ET.fromstring(xml_content)
-        order_dict_list = []
-        for data_node in root.findall('DATA'):
-            # 먼저 dict로 데이터 수집
-            order_detail = {}
-            for elem in data_node.findall('*'):
-                elem_tag = elem.tag.strip() if elem.tag else ''
-                elem_text = elem.text.strip() if elem.text else ''
-                if elem.tag and elem.text:
-                    if safe_mode and (elem_tag in self._MASKING_RULES):
-                        mask_type = self._MASKING_RULES[elem_tag]
-                        elem_text = self._mask_personal_info(elem_text, mask_type)
-                    # XML 태그명을 소문자로 변환해서 저장
-                    order_detail[elem_tag.lower()] = elem_text
-            
-            # 기본 필드 추가
-            order_detail["receive_dt"] = datetime.now()
-            
-            # 필드 타입 변환
-            for field in self._DECIMAL_FIELDS:
-                if field in order_detail:
-                    try:
-                        order_detail[field] = Decimal(order_detail[field]) if order_detail[field] != '' else None
-                    except Exception as e:
-                        logger.error(f"{field} Decimal 변환 실패: {order_detail[field]} ({e})")
-                        order_detail[field] = None
-            
-            for field in self._INT_FIELDS:
-                if field in order_detail:
-                    try:
-                        order_detail[field] = int(order_detail[field]) if order_detail[field] != '' else None
-                    except Exception as e:
-                        logger.error(f"{field} int 변환 실패: {order_detail[field]} ({e})")
-                        order_detail[field] = None
-            
-            for field in self._DATE_FIELDS:
-                if field in order_detail:
-                    order_detail[field] = self._parse_date_field(order_detail[field])
-            
-            # dict 형태로 직접 추가
-            order_dict_list.append(order_detail)
-        
+        order_dict_list = [self._parse_data_node(data_node, safe_mode=False) for data_node in root.findall('DATA')]
+        if safe_mode:
+            self.order_batch_masker.mask_orders(order_dict_list)
         logger.info(f"총 {len(order_dict_list)}개의 주문을 파싱했습니다.")
         return order_dict_list
 
+    async def _iter_order_batches_from_response(
+            self,
+            response: httpx.Response,
+            batch_size: int,
+            safe_mode: bool = True
+        ) -> AsyncIterator[list[dict]]:
+        """
+        응답 본문을 조금씩 읽으면서 DATA 노드 단위로 파싱하고, batch_size 만큼 모이면 반환하는 제너레이터.
+        파싱이 끝난 노드는 바로 비워서 전체 응답을 메모리에 올리지 않음.
+        """
+
+        # 응답 XML은 EUC-KR 선언을 가지고 있어서 expat이 직접 못 읽으므로, 문자열로 디코딩해서 넘김
+        decoder = codecs.getincrementaldecoder(response.encoding or 'euc-kr')(errors='replace')
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        root = None
+        batch: list[dict] = []
+        async for chunk in response.aiter_bytes(chunk_size=self._STREAM_CHUNK_SIZE):
+            parser.feed(decoder.decode(chunk))
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag != 'DATA':
+                    continue
+                batch.append(self._parse_data_node(elem, safe_mode=False))
+                # 처리한 노드와 루트에 붙은 참조를 정리해서 메모리를 일정하게 유지
+                elem.clear()
+                root.clear()
+                if len(batch) >= batch_size:
+                    yield self._mask_batch(batch, safe_mode)
+                    batch = []
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        if batch:
+            yield self._mask_batch(batch, safe_mode)
+
+    def _mask_batch(self, order_dict_list: list[dict], safe_mode: bool = True) -> list[dict]:
+        if safe_mode:
+            self.order_batch_masker.mask_orders(order_dict_list)
+        return order_dict_list
+
     def _mask_personal_info(self, value: str, mask_type: str) -> str:
         """
         민감타입에 해당하는 개인정보를 마스킹 처리하는 함수.
@@ -277,12 +355,12 @@ class OrderCreateService:
         logger.info(f"총 {len(order_dict_list)}개의 주문을 DB에 저장합니다.")
         
         try:
-            success_models = await self.receive_order_repository.bulk_insert_orders(order_dict_list)
+            success_idx_list = await self.receive_order_repository.bulk_copy_orders(order_dict_list)
             
             return OrderBulkCreateResponse(
                 total_count=len(order_dict_list),
-                success_count=len(success_models),
-                duplicated_count=len(order_dict_list) - len(success_models),
+                success_count=len(success_idx_list),
+                duplicated_count=len(order_dict_list) - len(success_idx_list),
             )
         except ET.ParseError as e:
             logger.error(f"XML 파싱 오류: {e}")
@@ -291,6 +369,48 @@ class OrderCreateService:
             logger.error(f"DB 저장 중 오류: {e}")
             raise
 
+    async def save_orders_to_db_from_sabangnet_stream(
+            self,
+            xml_url: str,
+            batch_size: int = None,
+            safe_mode: bool = True,
+            on_progress: Callable[[int, int], None] = None
+        ) -> OrderBulkCreateResponse:
+        """
+        사방넷 주문 응답을 스트리밍으로 읽으면서 batch_size 단위로 DB에 저장하는 함수.
+        주문 건수와 상관없이 메모리 사용량이 배치 크기 수준으로 유지됨.
+        on_progress 를 넘기면 배치를 저장할 때마다 (파싱 건수, 저장 건수) 로 호출함.
+        """
+
+        batch_size = batch_size or self._STREAM_BATCH_SIZE
+        total_count = 0
+        success_count = 0
+        logger.info(f"주문 수집 요청 XML URL(스트리밍): {xml_url}")
+        try:
+            async with get_sabangnet_client().stream('GET', self._ORDER_INFO_PATH, params={'xml_url': xml_url}) as response:
+                async for order_dict_list in self._iter_order_batches_from_response(response, batch_size, safe_mode):
+                    success_idx_list = await self.receive_order_repository.bulk_copy_orders(order_dict_list)
+                    total_count += len(order_dict_list)
+                    success_count += len(success_idx_list)
+                    logger.info(f"스트리밍 저장 진행: {total_count}개 파싱, {success_count}개 저장")
+                    if on_progress:
+                        on_progress(total_count, success_count)
+        except httpx.HTTPError as e:
+            logger.error(f"API 요청 실패: {e}")
+            raise
+        except ET.ParseError as e:
+            logger.error(f"XML 파싱 오류: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"스트리밍 저장 중 오류: {e}")
+            raise
+
+        return OrderBulkCreateResponse(
+            total_count=total_count,
+            success_count=success_count,
+            duplicated_count=total_count - success_count,
+        )
+
     def save_orders_to_json_from_xml(self, xml_content: str, safe_mode: bool = True) -> OrderBulkCreateResponse:
         """
         XML을 파싱하여 주문 리스트를 JSON 파일로 저장하고 반환하는 함수.
@@ -329,9 +449,11 @@ class OrderCreateService:
             logger.error(f"응답 파싱 중 오류: {e}")
             raise
 
-    async def save_orders_to_db_from_json(self, json_file_name: str) -> OrderBulkCreateResponse:
+    async def save_orders_to_db_from_json(self, json_file_name: str, batch_size: int = None, safe_mode: bool = False) -> OrderBulkCreateResponse:
         """
         JSON 파일에서 주문 데이터를 읽어 DB에 저장하는 함수.
+        파일 전체를 읽지 않고 배열 원소를 하나씩 읽으면서 batch_size 단위로 변환/저장함.
+        safe_mode: 마스킹되지 않은 원본 JSON 파일일 때만 True (save_orders_to_json_from_xml 로 만든 파일은 이미 마스킹됨)
         """
 
         json_file_path = self._JSON_PATH / json_file_name
@@ -341,19 +463,35 @@ class OrderCreateService:
         if not json_file_path.exists():
             raise FileNotFoundError(f"해당 파일을 찾을 수 없습니다. (파일명: {json_file_path})")
 
+        batch_size = batch_size or self._STREAM_BATCH_SIZE
+        total_count = 0
+        success_count = 0
+        raw_order_data_list: list[dict] = []
         with open(json_file_path, "r", encoding="utf-8") as f:
-            raw_order_data_list: list[dict] = json.load(f)
-        
-        order_data_list = self._convert_json_to_order_list(raw_order_data_list)
-        success_models = await self.receive_order_repository.bulk_insert_orders(order_data_list)
-        logger.info(f"저장된 주문 수: {len(success_models)}")
+            for raw_order_data in iter_json_array(f, self._STREAM_CHUNK_SIZE):
+                raw_order_data_list.append(raw_order_data)
+                if len(raw_order_data_list) < batch_size:
+                    continue
+                total_count, success_count = await self._save_json_batch(raw_order_data_list, total_count, success_count, safe_mode)
+                raw_order_data_list = []
+        if raw_order_data_list:
+            total_count, success_count = await self._save_json_batch(raw_order_data_list, total_count, success_count, safe_mode)
+        logger.info(f"저장된 주문 수: {success_count}")
 
         return OrderBulkCreateResponse(
-            total_count=len(order_data_list),
-            success_count=len(success_models),
-            duplicated_count=len(order_data_list) - len(success_models),
+            total_count=total_count,
+            success_count=success_count,
+            duplicated_count=total_count - success_count,
         )
 
+    async def _save_json_batch(self, raw_order_data_list: list[dict], total_count: int, success_count: int, safe_mode: bool = False) -> tuple[int, int]:
+        order_data_list = self._convert_json_to_order_list(raw_order_data_list, safe_mode)
+        success_idx_list = await self.receive_order_repository.bulk_copy_orders(order_data_list)
+        total_count += len(order_data_list)
+        success_count += len(success_idx_list)
+        logger.info(f"JSON 저장 진행: {total_count}개 읽음, {success_count}개 저장")
+        return total_count, success_count
+
     def get_order_xml_template(self, ord_st_date: str, ord_ed_date: str, order_status: str, file_name: str = None) -> StreamingResponse:
         """
         주문 수집 데이터 XML 템플릿만 생성하고 내려받음. 요청은 안함. (검토용)
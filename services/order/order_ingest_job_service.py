@@ -0,0 +1,209 @@
+import time
+import uuid
+import asyncio
+from datetime import datetime
+from typing import Optional
+from collections import OrderedDict
+
+from core.db import AsyncSessionLocal
+from core.settings import SETTINGS
+from utils.sabangnet_logger import get_logger
+from services.order.order_create_service import OrderCreateService
+from schemas.order.response.order_ingest_job_response import (
+    OrderIngestJobState,
+    OrderIngestJobStage,
+    OrderIngestJobResponse,
+)
+
+
+logger = get_logger(__name__)
+
+
+class OrderIngestJob:
+    """
+    주문 수집 작업 하나의 진행 상태
+    """
+
+    def __init__(self, start_date: str, end_date: str, order_status: str, streaming: bool = False):
+        self.job_id = uuid.uuid4().hex
+        self.start_date = start_date
+        self.end_date = end_date
+        self.order_status = order_status
+        self.streaming = streaming
+        self.state = OrderIngestJobState.QUEUED
+        self.stage = OrderIngestJobStage.QUEUED
+        self.parsed_count = 0
+        self.inserted_count = 0
+        self.stage_elapsed: dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._stage_started: Optional[float] = None
+
+    def enter_stage(self, stage: OrderIngestJobStage):
+        """
+        이전 단계 소요 시간을 기록하고 다음 단계로 넘어감
+        """
+        self._close_stage()
+        self.stage = stage
+        self._stage_started = time.perf_counter()
+
+    def _close_stage(self):
+        if self._stage_started is not None:
+            self.stage_elapsed[self.stage.value] = round(time.perf_counter() - self._stage_started, 3)
+            self._stage_started = None
+
+    def update_progress(self, parsed_count: int, inserted_count: int):
+        self.parsed_count = parsed_count
+        self.inserted_count = inserted_count
+
+    def finish(self, error: Exception = None):
+        self._close_stage()
+        self.finished_at = datetime.now()
+        if error is None:
+            self.state = OrderIngestJobState.SUCCEEDED
+            self.stage = OrderIngestJobStage.DONE
+        else:
+            self.state = OrderIngestJobState.FAILED
+            self.error = str(error)
+
+    def to_response(self) -> OrderIngestJobResponse:
+        return OrderIngestJobResponse(
+            job_id=self.job_id,
+            state=self.state,
+            stage=self.stage,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            order_status=self.order_status,
+            streaming=self.streaming,
+            parsed_count=self.parsed_count,
+            inserted_count=self.inserted_count,
+            duplicated_count=self.parsed_count - self.inserted_count,
+            stage_elapsed=dict(self.stage_elapsed),
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class OrderIngestJobService:
+    """
+    주문 수집 백그라운드 작업 관리.
+    - 요청은 큐에 넣고 바로 작업 ID를 반환
+    - asyncio 워커들이 큐에서 꺼내서 XML 생성 -> 업로드 -> 수집 -> 파싱 -> 저장 순으로 실행
+    - 작업 상태는 메모리에만 보관하며, 끝난 작업은 최근 _MAX_FINISHED_JOBS 개까지만 유지
+    """
+
+    _MAX_FINISHED_JOBS = 200
+
+    def __init__(self, worker_count: int = None):
+        self.worker_count = worker_count or SETTINGS.ORDER_INGEST_WORKERS
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, OrderIngestJob]" = OrderedDict()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(worker_no), name=f"order-ingest-worker-{worker_no}")
+            for worker_no in range(1, self.worker_count + 1)
+        ]
+        logger.info(f"주문 수집 워커 {self.worker_count}개 시작")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        logger.info("주문 수집 워커 종료")
+
+    def submit(self, start_date: str, end_date: str, order_status: str, streaming: bool = False) -> OrderIngestJob:
+        if not self.is_running:
+            raise RuntimeError("주문 수집 워커가 실행 중이 아닙니다.")
+        job = OrderIngestJob(start_date, end_date, order_status, streaming)
+        self._jobs[job.job_id] = job
+        self._trim_finished_jobs()
+        self._queue.put_nowait(job)
+        logger.info(f"주문 수집 작업 등록: {job.job_id} ({start_date}~{end_date} / 상태 {order_status})")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[OrderIngestJob]:
+        return self._jobs.get(job_id)
+
+    def _trim_finished_jobs(self):
+        finished_job_ids = [
+            job_id for job_id, job in self._jobs.items()
+            if job.state in (OrderIngestJobState.SUCCEEDED, OrderIngestJobState.FAILED)
+        ]
+        for job_id in finished_job_ids[:max(0, len(finished_job_ids) - self._MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    async def _worker(self, worker_no: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                job.finish(RuntimeError("서버 종료로 작업이 중단되었습니다."))
+                raise
+            except Exception as e:
+                logger.error(f"주문 수집 작업 실패: {job.job_id} ({e})")
+                job.finish(e)
+            else:
+                logger.info(f"주문 수집 작업 완료: {job.job_id} ({job.parsed_count}개 파싱, {job.inserted_count}개 저장)")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: OrderIngestJob):
+        job.state = OrderIngestJobState.RUNNING
+        job.started_at = datetime.now()
+        # 작업마다 세션을 따로 열어서 요청 세션을 붙잡고 있지 않음
+        async with AsyncSessionLocal() as session:
+            order_create_service = OrderCreateService(session)
+
+            job.enter_stage(OrderIngestJobStage.CREATE_XML)
+            dst_path_name = f"order_create_request_{job.start_date}_{job.end_date}_{job.order_status}_{job.job_id[:8]}.xml"
+            xml_file_path = await asyncio.to_thread(
+                order_create_service.create_request_xml, job.start_date, job.end_date, job.order_status, dst_path_name
+            )
+
+            job.enter_stage(OrderIngestJobStage.UPLOAD)
+            xml_url = await asyncio.to_thread(order_create_service.get_xml_url_from_minio, xml_file_path)
+
+            if job.streaming:
+                job.enter_stage(OrderIngestJobStage.STREAM)
+                await order_create_service.save_orders_to_db_from_sabangnet_stream(
+                    xml_url, on_progress=job.update_progress
+                )
+            else:
+                job.enter_stage(OrderIngestJobStage.FETCH)
+                xml_content = await order_create_service.get_orders_from_sabangnet(xml_url)
+
+                job.enter_stage(OrderIngestJobStage.PARSE)
+                order_dict_list = await asyncio.to_thread(order_create_service._parse_xml_to_order_list, xml_content)
+                del xml_content
+                job.update_progress(len(order_dict_list), 0)
+
+                job.enter_stage(OrderIngestJobStage.INSERT)
+                success_idx_list = await order_create_service.receive_order_repository.bulk_copy_orders(order_dict_list)
+                job.update_progress(len(order_dict_list), len(success_idx_list))
+        job.finish()
+
+
+_order_ingest_job_service: Optional[OrderIngestJobService] = None
+
+
+def get_order_ingest_job_service() -> OrderIngestJobService:
+    global _order_ingest_job_service
+    if _order_ingest_job_service is None:
+        _order_ingest_job_service = OrderIngestJobService()
+    return _order_ingest_job_service
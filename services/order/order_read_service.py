@@ -40,6 +40,39 @@ class OrderReadService:
             success_data=success_data,
         )
 
+    async def get_orders_after(self, after_id: int = None, limit: int = 20) -> tuple[OrderBulkDto, int | None]:
+        """
+        커서 기반 조회. (주문 목록, 다음 커서) 를 반환하며 마지막 페이지면 다음 커서는 None.
+        """
+        success_count: int = 0
+        error_count: int = 0
+        success_idx: list[str] = []
+        errors: list[str] = []
+        success_data: list[OrderDto] = []
+
+        # 다음 페이지 존재 여부 확인용으로 1건 더 조회
+        orders = await self.receive_order_repository.get_orders_after(after_id=after_id, limit=limit + 1)
+        has_next = len(orders) > limit
+        orders = orders[:limit]
+        for order in orders:
+            try:
+                order_dto = OrderDto.model_validate(order)
+                success_count += 1
+                success_idx.append(order_dto.idx)
+                success_data.append(order_dto)
+            except Exception as e:
+                error_count += 1
+                errors.append(str(e))
+                continue
+        next_cursor = orders[-1].id if has_next else None
+        return OrderBulkDto(
+            success_count=success_count,
+            error_count=error_count,
+            success_idx=success_idx,
+            errors=errors,
+            success_data=success_data,
+        ), next_cursor
+
     async def get_orders_pagination(self, page: int = 1, page_size: int = 20) -> OrderBulkDto:
         success_count: int = 0
         error_count: int = 0
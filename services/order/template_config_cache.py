@@ -0,0 +1,84 @@
+import copy
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.settings import SETTINGS
+from utils.sabangnet_logger import get_logger
+from repository.template_config_repository import TemplateConfigRepository
+
+
+logger = get_logger(__name__)
+
+
+class TemplateConfigCache:
+    """
+    template_code 별 병합된 템플릿 config 캐시.
+    - 기본 템플릿과 요청 템플릿을 한 번의 조인 쿼리로 읽어서 병합한 결과를 메모리에 보관
+    - TTL 이 지나거나 invalidate 되면 다음 조회 시 DB 에서 다시 읽음
+    - 호출한 쪽에서 config 를 수정해도 캐시가 바뀌지 않도록 복사본을 반환
+    """
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = ttl_seconds or SETTINGS.TEMPLATE_CONFIG_CACHE_TTL_SECONDS
+        # template_code -> (config, 적재 시각)
+        self._configs: Dict[str, Tuple[dict, float]] = {}
+
+    def _get_cached(self, template_code: str) -> Optional[dict]:
+        cached = self._configs.get(template_code)
+        if cached is None:
+            return None
+        config, loaded_at = cached
+        if time.time() - loaded_at >= self.ttl_seconds:
+            del self._configs[template_code]
+            return None
+        return config
+
+    async def get_template_config(self, session: AsyncSession, template_code: str) -> Optional[dict]:
+        """
+        템플릿 config 조회 (캐시 -> DB). 기본 템플릿이 없으면 None.
+        """
+
+        config = self._get_cached(template_code)
+        if config is None:
+            config = await TemplateConfigRepository(session).get_template_config(template_code)
+            if config is None:
+                return None
+            self._configs[template_code] = (config, time.time())
+            logger.info(f"템플릿 config 캐시 적재: {template_code}")
+        return copy.deepcopy(config)
+
+    async def preload(self, session: AsyncSession) -> int:
+        """
+        등록된 모든 템플릿 config 를 한 번의 쿼리로 읽어서 캐시에 올림. 올린 템플릿 수를 반환.
+        """
+
+        configs = await TemplateConfigRepository(session).get_all_template_configs()
+        loaded_at = time.time()
+        self._configs = {template_code: (config, loaded_at) for template_code, config in configs.items()}
+        logger.info(f"템플릿 config 캐시 미리 적재: {len(configs)}개")
+        return len(configs)
+
+    def invalidate(self, template_code: str = None):
+        """
+        캐시 무효화. template_code 가 없으면 전체를 비움.
+        기본 템플릿(default)은 모든 템플릿에 병합되므로 default 를 지정해도 전체를 비움.
+        """
+
+        if template_code is None or template_code == "default":
+            self._configs = {}
+            logger.info("템플릿 config 캐시 전체 무효화")
+        else:
+            self._configs.pop(template_code, None)
+            logger.info(f"템플릿 config 캐시 무효화: {template_code}")
+
+
+_template_config_cache: Optional[TemplateConfigCache] = None
+
+
+def get_template_config_cache() -> TemplateConfigCache:
+    global _template_config_cache
+    if _template_config_cache is None:
+        _template_config_cache = TemplateConfigCache()
+    return _template_config_cache
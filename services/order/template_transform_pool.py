@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from core.settings import SETTINGS
+from utils.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class TemplateTransformPool:
+    """
+    여러 템플릿 변환용 프로세스 풀 (서버 lifespan 동안 하나만 유지)
+    요청마다 프로세스를 새로 띄우지 않고, 동시 요청도 같은 워커 수 안에서 대기함.
+    """
+
+    def __init__(self, worker_count: int = None):
+        self.worker_count = worker_count if worker_count is not None else SETTINGS.DOWN_FORM_TRANSFORM_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        if self.is_running or not self.worker_count:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.worker_count)
+        logger.info(f"템플릿 변환 프로세스 풀 {self.worker_count}개 시작")
+
+    def stop(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(cancel_futures=True)
+        self._executor = None
+        logger.info("템플릿 변환 프로세스 풀 종료")
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        풀에서 function(*args) 를 실행 (풀이 시작되지 않았으면 RuntimeError)
+        """
+        if self._executor is None:
+            raise RuntimeError("템플릿 변환 프로세스 풀이 시작되지 않았습니다.")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+
+_template_transform_pool: Optional[TemplateTransformPool] = None
+
+
+def get_template_transform_pool() -> TemplateTransformPool:
+    global _template_transform_pool
+    if _template_transform_pool is None:
+        _template_transform_pool = TemplateTransformPool()
+    return _template_transform_pool
@@ -1,7 +1,5 @@
-import requests
-from urllib.parse import urljoin
-from core.settings import SETTINGS
 from pathlib import Path
+from core.sabangnet_client import get_sabangnet_client
 from utils.sabangnet_logger import get_logger
 from utils.make_xml.product_create_xml import ProductCreateXml
 
@@ -13,20 +11,13 @@ class ProductCreateService:
 
     # CLI 상품 등록 요청
     @staticmethod
-    def request_product_create_via_url(xml_url: str) -> str:
+    async def request_product_create_via_url(xml_url: str) -> str:
         try:
-            api_url = urljoin(SETTINGS.SABANG_ADMIN_URL, '/RTL_API/xml_goods_info.html')
             payload = {
                 'xml_url': xml_url
             }
-            response = requests.post(
-                api_url,
-                data=payload,
-                timeout=30
-            )
-            response.raise_for_status()
             # 요청 결과를 확인 후 변경 필요
-            return response.text
+            return await get_sabangnet_client().post_text('/RTL_API/xml_goods_info.html', data=payload)
         except Exception as e:
             logger.error(f"응답 파싱 중 오류: {e}")
             raise
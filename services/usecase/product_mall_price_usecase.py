@@ -42,7 +42,7 @@ class ProductMallPriceUsecase:
         xml_url = get_file_server_url(object_name)
         logger.info(f"파일 서버에 업로드된 XML URL: {xml_url}")
         # get xml url from fileserver and send to sabangnetAPI with request 
-        response_text = self.mall_price_request_service.request_sabangnet_product_update(xml_url)
+        response_text = await self.mall_price_request_service.request_sabangnet_product_update(xml_url)
         success_items, failed_items = parse_sabangnet_response(response_text)
         processed_count = len(success_items) + len(failed_items)
         return {
@@ -0,0 +1,582 @@
+from copy import copy
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.cell import coordinate_from_string
+
+from utils.excel_handler import ExcelHandler
+
+"""
+ExcelHandler 컬럼 단위 백엔드
+- 시트를 read-only / values_only 모드로 한 번만 읽어서 열 번호별 값 목록으로 보관
+- 매크로 연산은 셀 좌표 문자열 대신 열 값 목록 전체에 대해 수행
+- 서식은 영역(행 범위 x 열) 단위 / 셀 단위로 적용 순서와 함께 기록해 두었다가 저장할 때 write-only 모드로 한 번에 기록
+- 원본 파일의 서식/열 너비는 읽지 않음 (매크로가 적용한 서식만 저장됨)
+예시:
+    ex = ExcelHandler.from_file(file_path, columnar=True)
+"""
+
+_STYLE_ATTRS = ('font', 'fill', 'alignment', 'border', 'number_format')
+_TIME_TYPES = (datetime, date, time, timedelta)
+
+
+class _StyleLayer:
+    """
+    행 범위 x 열 영역에 한 번에 적용한 서식 (attrs 가 None 이면 서식 초기화)
+    """
+
+    __slots__ = ('seq', 'attrs', 'min_row', 'max_row', 'cols')
+
+    def __init__(self, seq: int, attrs: Optional[dict], min_row: int, max_row: Optional[int], cols: Optional[frozenset]):
+        self.seq = seq
+        self.attrs = attrs
+        self.min_row = min_row
+        self.max_row = max_row
+        self.cols = cols
+
+    def covers(self, row: int, col: int) -> bool:
+        return (
+            self.min_row <= row
+            and (self.max_row is None or row <= self.max_row)
+            and (self.cols is None or col in self.cols)
+        )
+
+
+def _style_property(attr: str) -> property:
+    def getter(self):
+        return self.sheet.get_style(self.row, self.column).get(attr)
+
+    def setter(self, value):
+        self.sheet.set_cell_style(self.row, self.column, **{attr: value})
+
+    return property(getter, setter)
+
+
+class ColumnarCell:
+    """
+    ColumnarSheet 셀 접근용 (ws['D2'].value / ws.cell(row=2, column=4) 처럼 쓰던 매크로 호환)
+    """
+
+    def __init__(self, sheet: "ColumnarSheet", row: int, column: int):
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+
+    @property
+    def value(self) -> Any:
+        return self.sheet.get_value(self.row, self.column)
+
+    @value.setter
+    def value(self, value: Any):
+        self.sheet.set_value(self.row, self.column, value)
+
+    @property
+    def column_letter(self) -> str:
+        return get_column_letter(self.column)
+
+    @property
+    def coordinate(self) -> str:
+        return f"{self.column_letter}{self.row}"
+
+    font = _style_property('font')
+    fill = _style_property('fill')
+    alignment = _style_property('alignment')
+    border = _style_property('border')
+    number_format = _style_property('number_format')
+
+
+class ColumnarSheet:
+    """
+    열 번호별 값 목록으로 보관하는 시트. 서식은 적용 순서(seq)와 함께 기록하고, 같은 셀에는 나중에 적용한 서식이 이김.
+    """
+
+    def __init__(self, title: str, rows: Iterable[tuple] = ()):
+        self.title = title
+        rows = list(rows)
+        width = max((len(row) for row in rows), default=0)
+        # 열 번호 - 1 -> 값 목록 (인덱스 0 = 1행)
+        self._columns: List[List[Any]] = [
+            list(values) for values in zip(*(tuple(row) + (None,) * (width - len(row)) for row in rows))
+        ]
+        self._row_count = len(rows)
+        self._layers: List[_StyleLayer] = []
+        # (행, 열) -> {서식 속성: (seq, 값)}
+        self._cell_styles: Dict[Tuple[int, int], Dict[str, Tuple[int, Any]]] = {}
+        self._seq = 0
+        self.column_widths: Dict[int, float] = {}
+        self.row_height: Optional[float] = None
+        self.show_grid_lines = True
+        self.auto_filter_ref: Optional[str] = None
+
+    @property
+    def max_row(self) -> int:
+        # openpyxl 과 같이 빈 시트도 1
+        return max(self._row_count, 1)
+
+    @property
+    def max_column(self) -> int:
+        return max(len(self._columns), 1)
+
+    def ensure_size(self, row: int, col: int):
+        """
+        row 행, col 열까지 None 으로 채워서 늘림
+        """
+        if col > len(self._columns):
+            self._columns.extend([None] * self._row_count for _ in range(col - len(self._columns)))
+        if row > self._row_count:
+            padding = row - self._row_count
+            for values in self._columns:
+                values.extend([None] * padding)
+            self._row_count = row
+
+    def column(self, col: int) -> List[Any]:
+        """
+        열 값 목록 (인덱스 0 = 1행). 목록을 직접 수정하면 시트에 반영됨 (길이는 바꾸지 않아야 함)
+        """
+        self.ensure_size(0, col)
+        return self._columns[col - 1]
+
+    def get_value(self, row: int, col: int) -> Any:
+        if col > len(self._columns) or row > self._row_count:
+            return None
+        return self._columns[col - 1][row - 1]
+
+    def set_value(self, row: int, col: int, value: Any):
+        self.ensure_size(row, col)
+        self._columns[col - 1][row - 1] = value
+
+    def write_rows(self, min_row: int, rows: List[tuple]):
+        """
+        min_row 행부터 행 목록을 덮어씀
+        """
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        self.ensure_size(min_row + len(rows) - 1, width)
+        for col_index, values in enumerate(zip(*(tuple(row) + (None,) * (width - len(row)) for row in rows))):
+            self._columns[col_index][min_row - 1:min_row - 1 + len(rows)] = values
+
+    def iter_rows(self, min_row: int = None, max_row: int = None, min_col: int = None, max_col: int = None, values_only: bool = False) -> Iterator[tuple]:
+        min_row = min_row or 1
+        max_row = max_row or self.max_row
+        min_col = min_col or 1
+        max_col = max_col or self.max_column
+        if values_only:
+            self.ensure_size(max_row, max_col)
+            yield from zip(*(values[min_row - 1:max_row] for values in self._columns[min_col - 1:max_col]))
+            return
+        for row in range(min_row, max_row + 1):
+            yield tuple(ColumnarCell(self, row, col) for col in range(min_col, max_col + 1))
+
+    def cell(self, row: int, column: int, value: Any = None) -> ColumnarCell:
+        if value is not None:
+            self.set_value(row, column, value)
+        return ColumnarCell(self, row, column)
+
+    def __getitem__(self, key):
+        """
+        ws['D2'] -> 셀, ws[1] -> 1행 셀 튜플
+        """
+        if isinstance(key, int):
+            return tuple(ColumnarCell(self, key, col) for col in range(1, self.max_column + 1))
+        col_letter, row = coordinate_from_string(key)
+        return ColumnarCell(self, row, column_index_from_string(col_letter))
+
+    # 서식
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def set_style(self, min_row: int = 1, max_row: int = None, cols: Iterable[int] = None, **attrs):
+        """
+        영역 서식 적용 (max_row 가 None 이면 마지막 행까지, cols 가 None 이면 모든 열)
+        예시:
+            ws.set_style(min_row=2, cols=[4], number_format='General')
+        """
+        self._layers.append(_StyleLayer(
+            self._next_seq(), attrs, min_row, max_row, frozenset(cols) if cols is not None else None
+        ))
+
+    def reset_style(self, min_row: int = 1, max_row: int = None):
+        """
+        영역의 서식을 모두 기본값으로 되돌림 (행 삭제 후 다시 쓴 것과 같음)
+        """
+        self._layers.append(_StyleLayer(self._next_seq(), None, min_row, max_row, None))
+
+    def set_cell_style(self, row: int, col: int, **attrs):
+        seq = self._next_seq()
+        cell_style = self._cell_styles.setdefault((row, col), {})
+        for attr, value in attrs.items():
+            cell_style[attr] = (seq, value)
+
+    def _resolve_region(self, row: int, col: int) -> Tuple[Dict[str, Tuple[int, Any]], int]:
+        """
+        영역 서식만 반영한 ({속성: (seq, 값)}, 마지막 초기화 seq)
+        """
+        resolved: Dict[str, Tuple[int, Any]] = {}
+        reset_seq = 0
+        for layer in self._layers:
+            if not layer.covers(row, col):
+                continue
+            if layer.attrs is None:
+                resolved = {}
+                reset_seq = layer.seq
+            else:
+                for attr, value in layer.attrs.items():
+                    resolved[attr] = (layer.seq, value)
+        return resolved, reset_seq
+
+    def _merge_cell_style(self, row: int, col: int, resolved: Dict[str, Tuple[int, Any]], reset_seq: int) -> Dict[str, Any]:
+        merged = {attr: value for attr, (_, value) in resolved.items()}
+        for attr, (seq, value) in self._cell_styles.get((row, col), {}).items():
+            if seq > max(resolved.get(attr, (0, None))[0], reset_seq):
+                merged[attr] = value
+        return merged
+
+    def get_style(self, row: int, col: int) -> Dict[str, Any]:
+        return self._merge_cell_style(row, col, *self._resolve_region(row, col))
+
+    # 저장
+
+    @staticmethod
+    def _get_style_array(ws, style_arrays: dict, style: Dict[str, Any]):
+        """
+        서식 조합별로 한 번만 스타일을 만들어서 재사용 (서식이 없으면 None)
+        """
+        key = tuple(style.get(attr) for attr in _STYLE_ATTRS)
+        if not any(value is not None for value in key):
+            return None
+        style_array = style_arrays.get(key)
+        if style_array is None:
+            cell = WriteOnlyCell(ws)
+            for attr, value in zip(_STYLE_ATTRS, key):
+                if value is not None:
+                    setattr(cell, attr, value)
+            style_array = style_arrays[key] = cell._style
+        return style_array
+
+    def write_to(self, ws, style_arrays: dict):
+        """
+        write-only 워크시트에 열 너비/시트 설정 -> 행 순서로 값과 서식을 기록
+        영역 서식은 행 범위 경계가 바뀔 때만 열별로 다시 계산하고, 셀 서식이 있는 셀만 따로 계산함
+        """
+        for col, width in self.column_widths.items():
+            ws.column_dimensions[get_column_letter(col)].width = width
+        if self.row_height is not None:
+            ws.sheet_format.defaultRowHeight = self.row_height
+            ws.sheet_format.customHeight = True
+        ws.sheet_view.showGridLines = self.show_grid_lines
+        if self.auto_filter_ref:
+            ws.auto_filter.ref = self.auto_filter_ref
+
+        boundaries = sorted(
+            {1}
+            | {layer.min_row for layer in self._layers}
+            | {layer.max_row + 1 for layer in self._layers if layer.max_row is not None}
+        )
+        cell_styles = self._cell_styles
+        column_count = len(self._columns)
+        band = None
+        column_styles = []
+        for row, values in enumerate(zip(*self._columns), start=1):
+            row_band = bisect_right(boundaries, row)
+            if row_band != band:
+                band = row_band
+                column_styles = []
+                for col in range(1, column_count + 1):
+                    resolved, reset_seq = self._resolve_region(row, col)
+                    column_styles.append((
+                        resolved,
+                        reset_seq,
+                        self._get_style_array(ws, style_arrays, {attr: value for attr, (_, value) in resolved.items()}),
+                    ))
+            cells = []
+            for col, value in enumerate(values, start=1):
+                resolved, reset_seq, style_array = column_styles[col - 1]
+                if (row, col) in cell_styles:
+                    style_array = self._get_style_array(
+                        ws, style_arrays, self._merge_cell_style(row, col, resolved, reset_seq)
+                    )
+                if style_array is None:
+                    cells.append(value)
+                    continue
+                cell = WriteOnlyCell(ws)
+                # 날짜 값은 값을 넣을 때 표시 형식이 바뀔 수 있으므로 공유 스타일을 복사해서 사용
+                cell._style = copy(style_array) if isinstance(value, _TIME_TYPES) else style_array
+                cell.value = value
+                cells.append(cell)
+            ws.append(cells)
+
+
+class ColumnarWorkbook:
+    """
+    ColumnarSheet 목록. openpyxl Workbook 에서 매크로가 쓰는 부분(worksheets, sheetnames, create_sheet, save ...)만 제공
+    """
+
+    def __init__(self, worksheets: List[ColumnarSheet] = None):
+        self.worksheets: List[ColumnarSheet] = list(worksheets or [])
+
+    @classmethod
+    def load(cls, file_path) -> "ColumnarWorkbook":
+        """
+        read-only 모드로 모든 시트의 값만 한 번 읽음 (수식은 문자열 그대로)
+        """
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            worksheets = [ColumnarSheet(ws.title, ws.iter_rows(values_only=True)) for ws in wb.worksheets]
+        finally:
+            wb.close()
+        return cls(worksheets)
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [ws.title for ws in self.worksheets]
+
+    @property
+    def active(self) -> Optional[ColumnarSheet]:
+        return self.worksheets[0] if self.worksheets else None
+
+    def __getitem__(self, title: str) -> ColumnarSheet:
+        for ws in self.worksheets:
+            if ws.title == title:
+                return ws
+        raise KeyError(f"Worksheet {title} does not exist.")
+
+    def __delitem__(self, title: str):
+        self.worksheets.remove(self[title])
+
+    def create_sheet(self, title: str = None) -> ColumnarSheet:
+        ws = ColumnarSheet(title or f"Sheet{len(self.worksheets) + 1}")
+        self.worksheets.append(ws)
+        return ws
+
+    def save(self, file_path):
+        wb = openpyxl.Workbook(write_only=True)
+        # 서식 조합 -> 스타일 (워크북 단위)
+        style_arrays = {}
+        for ws in self.worksheets:
+            ws.write_to(wb.create_sheet(title=ws.title), style_arrays)
+        wb.save(file_path)
+
+
+class ColumnarExcelHandler(ExcelHandler):
+    """
+    ExcelHandler 와 같은 메소드를 열 값 목록 단위로 처리하는 백엔드 (ws / wb 는 ColumnarSheet / ColumnarWorkbook)
+    예시:
+        ex = ExcelHandler.from_file(file_path, columnar=True)
+        ex.autofill_d_column(formula="=U{row}+V{row}")
+        ex.save_file(file_path)
+    """
+
+    @classmethod
+    def from_file(cls, file_path, sheet_index=0, columnar=True):
+        wb = ColumnarWorkbook.load(file_path)
+        ws = wb.worksheets[sheet_index]
+        return cls(ws, wb)
+
+    @staticmethod
+    def _all_columns(ws: ColumnarSheet) -> range:
+        return range(1, ws.max_column + 1)
+
+    def set_auto_filter(self, ws=None):
+        if ws is None:
+            ws = self.ws
+        ws.auto_filter_ref = f"A1:{get_column_letter(ws.max_column)}{ws.max_row}"
+
+    def set_basic_format(self, ws=None, header_rgb="006100"):
+        if ws is None:
+            ws = self.ws
+        green_fill = PatternFill(start_color=header_rgb,
+                                 end_color=header_rgb, fill_type="solid")
+        ws.set_style(max_row=ws.max_row, cols=self._all_columns(ws),
+                     font=Font(name='맑은 고딕', size=9), alignment=Alignment(wrap_text=False))
+        ws.row_height = 15
+        ws.set_style(max_row=1, cols=self._all_columns(ws),
+                     fill=green_fill, alignment=Alignment(horizontal='center'))
+
+    def autofill_d_column(self, ws=None, start_row=2, end_row=None, formula=None):
+        if ws is None:
+            ws = self.ws
+        if not end_row:
+            end_row = self.last_row
+        if not formula:
+            formula = ws.get_value(2, 4)
+        d_values = ws.column(4)
+        rows = [row for row in range(start_row, min(end_row, ws.max_row) + 1) if d_values[row - 1] is not None]
+        if isinstance(formula, str) and '{row}' in formula:
+            for row in rows:
+                d_values[row - 1] = formula.format(row=row)
+        elif isinstance(formula, str) and '=' in formula:
+            for row in rows:
+                d_values[row - 1] = formula.replace('2', str(row))
+        else:
+            for row in rows:
+                d_values[row - 1] = formula
+        # D열 숫자 포맷 초기화
+        ws.set_style(min_row=start_row, max_row=end_row, cols=[4], number_format='General')
+
+    def set_row_number(self, ws=None, start_row=2, end_row=None):
+        if not end_row:
+            end_row = self.last_row
+        if ws is None:
+            ws = self.ws
+        row_count = max(end_row - start_row + 1, 0)
+        ws.ensure_size(end_row, 1)
+        ws.column(1)[start_row - 1:end_row] = ["=ROW()-1"] * row_count
+        ws.set_style(min_row=start_row, max_row=end_row, cols=[1], number_format='General')
+
+    def convert_formula_to_value(self):
+        # 값을 그대로 두는 처리라 열 목록에서는 할 일이 없음 (실제 값 변환은 Excel에서 처리)
+        return
+
+    def clear_borders(self, ws=None):
+        if ws is None:
+            ws = self.ws
+        ws.show_grid_lines = False
+        ws.set_style(max_row=ws.max_row, cols=self._all_columns(ws), border=Border())
+
+    def clear_fills_from_second_row(self):
+        self.ws.set_style(min_row=2, max_row=self.ws.max_row, cols=self._all_columns(self.ws),
+                          fill=PatternFill(fill_type=None))
+
+    def sum_prow_with_slash(self):
+        p_values = self.ws.column(16)
+        for index in range(1, self.ws.max_row):
+            p_raw = str(p_values[index] or "")
+            if "/" in p_raw:
+                nums = [float(n)
+                        for n in p_raw.split("/") if n.strip().isdigit()]
+                p_values[index] = sum(nums) if nums else 0
+            else:
+                p_values[index] = self.to_num(p_raw)
+
+    def convert_numeric_strings(self, ws=None, start_row: int = 2, end_row: int | None = None, cols: tuple[str, ...] | None = None) -> None:
+        if ws is None:
+            ws = self.ws
+        if end_row is None:
+            end_row = self.ws.max_row
+
+        # 변환 대상 열 결정 (없으면 1행 헤더가 있는 모든 열)
+        if cols:
+            target_cols = [column_index_from_string(col) for col in cols]
+        else:
+            target_cols = [col for col in self._all_columns(ws) if ws.get_value(1, col) is not None]
+
+        for col in target_cols:
+            values = ws.column(col)
+            for row in range(start_row, min(end_row, ws.max_row) + 1):
+                value = values[row - 1]
+                if not isinstance(value, str):
+                    continue
+                raw = value.strip()
+                # 숫자(0-9), 쉼표, 마침표 외 다른 문자가 섞여 있으면 변환하지 않음
+                if self._NUMERIC_STRING_RE.fullmatch(raw) and raw not in {"", ".", ","}:
+                    values[row - 1] = self.to_num(raw)
+                    ws.set_cell_style(row, col, number_format="0")
+
+    def set_column_alignment(self, ws=None):
+        if ws is None:
+            ws = self.ws
+        max_column = ws.max_column
+        ws.set_style(min_row=2, max_row=ws.max_row, cols=[col for col in (1, 2) if col <= max_column],
+                     alignment=Alignment(horizontal='center'))
+        ws.set_style(min_row=2, max_row=ws.max_row, cols=[col for col in (4, 5, 7) if col <= max_column],
+                     alignment=Alignment(horizontal='right'))
+
+    def sort_by_columns(self, key_columns: List[int], start_row: int = 2) -> None:
+        rows = list(self.ws.iter_rows(min_row=start_row, max_row=self.last_row, values_only=True))
+
+        # 정렬 키 함수: 각 열을 문자열로 변환하여 비교
+        rows.sort(key=lambda x: tuple(str(x[i-1]) for i in key_columns))
+
+        # 정렬된 데이터를 다시 쓰고, 행을 지우고 다시 쓴 것과 같게 해당 행 서식은 초기화
+        self.ws.write_rows(start_row, rows)
+        self.ws.reset_style(min_row=start_row, max_row=self.last_row)
+
+        # last_row 업데이트
+        self.last_row = self.ws.max_row
+
+    def highlight_column(self, col: str, light_color: PatternFill, ws=None, start_row: int = 2, last_row: int = None):
+        if ws is None:
+            ws = self.ws
+        if not last_row:
+            last_row = self.last_row
+        col_idx = column_index_from_string(col)
+        values = ws.column(col_idx)
+        for row in range(start_row, min(last_row, ws.max_row) + 1):
+            cell_value = values[row - 1]
+            txt = str(cell_value).strip() if cell_value else ""
+
+            if cell_value is not None and self._should_highlight(txt):
+                ws.set_cell_style(row, col_idx, fill=light_color)
+
+    def to_dataframe(self, ws=None, start_row=2, start_col=1, end_row=None, end_col=None):
+        ws = ws or self.ws
+        end_row = end_row or ws.max_row
+        end_col = end_col or ws.max_column
+        ws.ensure_size(end_row, end_col)
+
+        headers = []
+        for col in range(start_col, end_col + 1):
+            header = ws.get_value(1, col)
+            headers.append(header if header else f"Col{col}")
+
+        # 열 목록을 그대로 잘라서 DataFrame 으로 (헤더가 중복될 수 있어서 위치로 만든 뒤 이름을 붙임)
+        df = pd.DataFrame({
+            index: ws.column(col)[start_row - 1:end_row]
+            for index, col in enumerate(range(start_col, end_col + 1))
+        })
+        df.columns = headers
+        return df
+
+    def create_split_sheets(self, headers: list, sheet_names: list):
+        ws_map = {}
+        for sheet_name in sheet_names:
+            # 기존 시트 삭제
+            if sheet_name in self.wb.sheetnames:
+                del self.wb[sheet_name]
+            # 새 시트 생성
+            ws = self.wb.create_sheet(title=sheet_name)
+            # 열 너비 복사
+            for col in range(1, len(headers) + 1):
+                if col in self.ws.column_widths:
+                    ws.column_widths[col] = self.ws.column_widths[col]
+            ws.row_height = 15
+            ws_map[sheet_name] = ws
+
+        return ws_map
+
+    def split_sheets_by_site(self, df, ws_map, site_mapping):
+        # 시트별로 행을 모아서 한 번에 기록
+        site_rows = {sheet: [] for sheet in site_mapping.keys()}
+
+        for row_data in df.itertuples(index=False):
+            # 계정명 추출
+            site_value = str(getattr(row_data, '사이트')) if pd.notna(getattr(row_data, '사이트')) else ""
+            account_name = ""
+
+            if "]" in site_value and site_value.startswith("["):
+                account_name = site_value[1:site_value.index("]")]
+
+            # 매칭되는 시트 찾기
+            for sheet, filters in site_mapping.items():
+                if account_name in filters and sheet in ws_map:
+                    site_rows[sheet].append(tuple(row_data))
+                    break
+
+        font = Font(name='맑은 고딕', size=9)
+        for sheet, rows in site_rows.items():
+            if not rows:
+                continue
+            target_sheet = ws_map[sheet]
+            target_sheet.write_rows(2, rows)
+            target_sheet.set_style(min_row=2, max_row=len(rows) + 1,
+                                   cols=range(1, max(len(row) for row in rows) + 1), font=font)
+            target_sheet.row_height = 15
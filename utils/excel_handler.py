@@ -16,20 +16,28 @@ from openpyxl.utils import get_column_letter
 
 
 class ExcelHandler:
+    # 숫자(0-9), 쉼표, 마침표로만 된 문자열
+    _NUMERIC_STRING_RE = re.compile(r"[0-9,\.]+")
+
     def __init__(self, ws, wb=None):
         self.ws = ws
         self.wb = wb
         self.last_row = ws.max_row
 
     @classmethod
-    def from_file(cls, file_path, sheet_index=0):
+    def from_file(cls, file_path, sheet_index=0, columnar=False):
         """
         파일 경로로 부터 엑셀 파일 로드
+        columnar=True 이면 같은 메소드를 열 단위로 처리하는 ColumnarExcelHandler 로 로드
+        (read-only 로 값만 읽고 write-only 로 저장, 원본 서식은 유지되지 않음)
         예시:
             ex = ExcelHandler.from_file(file_path)
             ws = ex.ws
             wb = ex.wb
         """
+        if columnar:
+            from utils.columnar_excel_handler import ColumnarExcelHandler
+            return ColumnarExcelHandler.from_file(file_path, sheet_index)
         wb = openpyxl.load_workbook(file_path)
         ws = wb.worksheets[sheet_index]
         return cls(ws, wb)
@@ -258,7 +266,7 @@ class ExcelHandler:
                 if isinstance(cell.value, str):
                     raw = cell.value.strip()
                     # 숫자(0-9), 쉼표, 마침표 외 다른 문자가 섞여 있으면 변환하지 않음
-                    if re.fullmatch(r"[0-9,\.]+", raw):
+                    if self._NUMERIC_STRING_RE.fullmatch(raw):
                         num_val = self.to_num(raw)
                         # 0 도 유효 숫자로 인정
                         if raw not in {"", ".", ","}:
@@ -381,6 +389,29 @@ class ExcelHandler:
         elif l_val == "착불":
             self.ws[f'{l_col}{row}'].font = red_font
 
+    @staticmethod
+    def _should_highlight(txt: str) -> bool:
+        """
+        셀 값이 다음 조건 중 하나라도 만족하면 True:
+        - 빈 문자열
+        - 'none' (대소문자 무관)
+        - 모든 문자가 '#'
+        - 순수 숫자
+        - '숫자개' 패턴 (예: '3개')
+        """
+        if not txt or txt.strip() == "":
+            return True
+        txt = txt.strip()
+        if txt.lower() == "none":
+            return True
+        if all(c == '#' for c in txt):
+            return True
+        if txt.isdigit():
+            return True
+        if txt.endswith("개") and txt[:-1].isdigit():
+            return True
+        return False
+
     def highlight_column(self, col: str, light_color: PatternFill, ws=None, start_row: int = 2, last_row: int = None):
         """
         특정 열 하이라이트 처리
@@ -389,28 +420,6 @@ class ExcelHandler:
             - highlight_column(col='F', light_color=light_blue_fill, start_row=2, last_row=last_row)
         """
 
-        def _should_highlight(txt: str) -> bool:
-            """
-            셀 값이 다음 조건 중 하나라도 만족하면 True:
-            - 빈 문자열
-            - 'none' (대소문자 무관)
-            - 모든 문자가 '#'
-            - 순수 숫자
-            - '숫자개' 패턴 (예: '3개')
-            """
-            if not txt or txt.strip() == "":
-                return True
-            txt = txt.strip()
-            if txt.lower() == "none":
-                return True
-            if all(c == '#' for c in txt):
-                return True
-            if txt.isdigit():
-                return True
-            if txt.endswith("개") and txt[:-1].isdigit():
-                return True
-            return False
-
         if ws is None:
             ws = self.ws
         if not last_row:
@@ -419,7 +428,7 @@ class ExcelHandler:
             cell_value = ws[f'{col}{row}'].value
             txt = str(cell_value).strip() if cell_value else ""
 
-            if cell_value is not None and _should_highlight(txt):
+            if cell_value is not None and self._should_highlight(txt):
                 ws[f"{col}{row}"].fill = light_color
 
     def set_header_style(self, ws, headers: list, fill: PatternFill, font: Font, alignment: Alignment):
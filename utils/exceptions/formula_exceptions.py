@@ -0,0 +1,9 @@
+"""
+템플릿 수식(transform_config.source) 예외 클래스
+"""
+
+
+class FormulaSyntaxException(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,263 @@
+"""
+템플릿 수식(transform_config.source) 평가 엔진
+
+허용 문법
+- 필드 참조: sku_alias, sale_cnt ... (행에 없으면 None)
+- 상수: 문자열, 숫자, True/False/None
+- 산술: + - * / // % (단항 - + 포함)
+- 문자열 연결: 한쪽이라도 문자열이면 + 는 문자열 연결 (None 은 빈 문자열)
+- 함수: _FUNCTIONS / _CONTEXT_FUNCTIONS 에 등록된 함수만 호출 가능
+
+수식은 처음 한 번만 AST 로 파싱/검증하고 소스 문자열 기준으로 캐시함.
+평가는 행 목록 전체에 대해 컬럼 단위로 수행하며, 행 하나에서 오류가 나면 그 행만 None 이 됨.
+"""
+import ast
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+
+from utils.sabangnet_logger import get_logger
+from utils.exceptions.formula_exceptions import FormulaSyntaxException
+
+
+logger = get_logger(__name__)
+
+
+class _EvaluationError:
+    """행 단위 평가 실패 표시 (이후 연산에 그대로 전파됨)"""
+
+    def __repr__(self) -> str:
+        return "<평가 실패>"
+
+
+_ERROR = _EvaluationError()
+
+Column = List[Any]
+ColumnEvaluator = Callable[[List[Dict[str, Any]]], Column]
+
+
+# ---------------------------------------------------------------------------
+# 행 컨텍스트를 사용하는 변환 함수 (DataProcessingPipeline 변환 함수와 동일)
+# ---------------------------------------------------------------------------
+
+def convert_delivery_method(value: Any, context: Dict[str, Any]) -> str:
+    if not value:
+        return ""
+    mapping = {"credit": "선불", "cod": "착불", "prepaid": "선불"}
+    return mapping.get(str(value).lower(), str(value))
+
+
+def sku_quantity(value: Any, context: Dict[str, Any]) -> str:
+    sku_alias = context.get('sku_alias', '') or value or ''
+    sale_cnt = context.get('sale_cnt', 0) or 0
+    return f"{sku_alias} {sale_cnt}개" if sku_alias else ""
+
+
+def barcode_quantity(value: Any, context: Dict[str, Any]) -> str:
+    barcode = context.get('barcode', '') or value or ''
+    sale_cnt = context.get('sale_cnt', 0) or 0
+    return f"{barcode} {sale_cnt}개" if barcode else ""
+
+
+def calculate_service_fee(value: Any, context: Dict[str, Any]) -> int:
+    pay_cost = context.get('pay_cost', 0) or 0
+    mall_won_cost = context.get('mall_won_cost', 0) or 0
+    sale_cnt = context.get('sale_cnt', 0) or 0
+    return int(pay_cost - (mall_won_cost * sale_cnt))
+
+
+# 수식에서 fn() 또는 fn(value) 로 호출, 행 전체를 컨텍스트로 받음
+_CONTEXT_FUNCTIONS: Dict[str, Callable[[Any, Dict[str, Any]], Any]] = {
+    'convert_delivery_method': convert_delivery_method,
+    'sku_quantity': sku_quantity,
+    'barcode_quantity': barcode_quantity,
+    'calculate_service_fee': calculate_service_fee,
+}
+
+# 컨텍스트 함수가 행에서 읽는 필드 (수식이 참조하는 필드 계산용)
+_CONTEXT_FIELDS: Dict[str, tuple] = {
+    'convert_delivery_method': (),
+    'sku_quantity': ('sku_alias', 'sale_cnt'),
+    'barcode_quantity': ('barcode', 'sale_cnt'),
+    'calculate_service_fee': ('pay_cost', 'mall_won_cost', 'sale_cnt'),
+}
+
+# 인자만 받는 일반 함수
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    'str': lambda value='': '' if value is None else str(value),
+    'int': int,
+    'float': float,
+    'round': round,
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'len': len,
+}
+
+
+# ---------------------------------------------------------------------------
+# 연산자
+# ---------------------------------------------------------------------------
+
+def _to_text(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def _add(left: Any, right: Any) -> Any:
+    if isinstance(left, str) or isinstance(right, str):
+        return _to_text(left) + _to_text(right)
+    return left + right
+
+
+def _mul(left: Any, right: Any) -> Any:
+    # 문자열 반복은 허용하지 않음 (수식 하나로 메모리를 크게 쓰는 것 방지)
+    if isinstance(left, str) or isinstance(right, str):
+        raise TypeError("문자열은 곱할 수 없습니다.")
+    return left * right
+
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: _add,
+    ast.Sub: operator.sub,
+    ast.Mult: _mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+
+def _apply(function: Callable[..., Any], *args: Any) -> Any:
+    for arg in args:
+        if arg is _ERROR:
+            return _ERROR
+    try:
+        return function(*args)
+    except Exception:
+        return _ERROR
+
+
+# ---------------------------------------------------------------------------
+# AST -> 컬럼 평가 함수
+# ---------------------------------------------------------------------------
+
+def _compile_node(node: ast.AST, source: str) -> ColumnEvaluator:
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, source)
+
+    if isinstance(node, ast.Constant):
+        if not isinstance(node.value, (str, int, float, bool, type(None))):
+            raise FormulaSyntaxException(f"허용되지 않는 상수입니다: {node.value!r} (수식: {source})")
+        value = node.value
+        return lambda rows: [value] * len(rows)
+
+    if isinstance(node, ast.Name):
+        field = node.id
+        return lambda rows: [row.get(field) for row in rows]
+
+    if isinstance(node, ast.BinOp):
+        binary_operator = _BINARY_OPERATORS.get(type(node.op))
+        if binary_operator is None:
+            raise FormulaSyntaxException(f"허용되지 않는 연산자입니다: {type(node.op).__name__} (수식: {source})")
+        left = _compile_node(node.left, source)
+        right = _compile_node(node.right, source)
+        return lambda rows: [
+            _apply(binary_operator, left_value, right_value)
+            for left_value, right_value in zip(left(rows), right(rows))
+        ]
+
+    if isinstance(node, ast.UnaryOp):
+        unary_operator = _UNARY_OPERATORS.get(type(node.op))
+        if unary_operator is None:
+            raise FormulaSyntaxException(f"허용되지 않는 연산자입니다: {type(node.op).__name__} (수식: {source})")
+        operand = _compile_node(node.operand, source)
+        return lambda rows: [_apply(unary_operator, value) for value in operand(rows)]
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise FormulaSyntaxException(f"등록된 함수만 위치 인자로 호출할 수 있습니다. (수식: {source})")
+        name = node.func.id
+        args = [_compile_node(arg, source) for arg in node.args]
+        if name in _CONTEXT_FUNCTIONS:
+            if len(args) > 1:
+                raise FormulaSyntaxException(f"{name} 함수는 인자를 최대 1개만 받습니다. (수식: {source})")
+            context_function = _CONTEXT_FUNCTIONS[name]
+            if not args:
+                return lambda rows: [_apply(context_function, None, row) for row in rows]
+            value_column = args[0]
+            return lambda rows: [
+                _apply(context_function, value, row) for value, row in zip(value_column(rows), rows)
+            ]
+        if name in _FUNCTIONS:
+            function = _FUNCTIONS[name]
+            if not args:
+                return lambda rows: [_apply(function) for _ in rows]
+            return lambda rows: [
+                _apply(function, *values) for values in zip(*(arg(rows) for arg in args))
+            ]
+        raise FormulaSyntaxException(f"등록되지 않은 함수입니다: {name} (수식: {source})")
+
+    raise FormulaSyntaxException(f"허용되지 않는 문법입니다: {type(node).__name__} (수식: {source})")
+
+
+def _collect_fields(tree: ast.AST) -> frozenset:
+    """
+    수식이 행에서 읽는 필드 이름 (필드 참조 + 컨텍스트 함수가 읽는 필드)
+    """
+    function_nodes = set()
+    fields = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            function_nodes.add(id(node.func))
+            fields.update(_CONTEXT_FIELDS.get(node.func.id, ()))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and id(node) not in function_nodes:
+            fields.add(node.id)
+    return frozenset(fields)
+
+
+class Formula:
+    """
+    컴파일된 수식. evaluate_column 으로 행 목록 전체를 한 번에 평가함.
+    fields 는 수식이 행에서 읽는 필드 이름.
+    """
+
+    def __init__(self, source: str, evaluator: ColumnEvaluator, fields: frozenset = frozenset()):
+        self.source = source
+        self._evaluator = evaluator
+        self.fields = fields
+
+    def evaluate_column(self, rows: List[Dict[str, Any]]) -> Column:
+        values = self._evaluator(rows)
+        error_count = 0
+        for index, value in enumerate(values):
+            if value is _ERROR:
+                values[index] = None
+                error_count += 1
+        if error_count:
+            logger.warning(f"수식 평가 실패 {error_count}/{len(rows)}건 -> None 처리 (수식: {self.source})")
+        return values
+
+    def evaluate(self, row: Dict[str, Any]) -> Any:
+        return self.evaluate_column([row])[0]
+
+
+@lru_cache(maxsize=1024)
+def compile_formula(source: str) -> Formula:
+    """
+    수식 문자열을 파싱/검증하여 Formula 로 만듦. 같은 소스는 캐시된 결과를 재사용함.
+    Raises:
+        FormulaSyntaxException: 문법 오류 또는 허용되지 않는 문법/함수를 사용한 경우
+    """
+    if not isinstance(source, str):
+        raise FormulaSyntaxException(f"수식은 문자열이어야 합니다: {source!r}")
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise FormulaSyntaxException(f"수식 문법 오류: {e.msg} (수식: {source})")
+    return Formula(source, _compile_node(tree, source), _collect_fields(tree))
@@ -0,0 +1,82 @@
+import json
+from typing import Any, Iterator, TextIO
+
+
+_JSON_WHITESPACE = ' \t\n\r'
+_VALUE_TERMINATORS = _JSON_WHITESPACE + ',]'
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    최상위가 배열인 JSON 파일을 원소 단위로 하나씩 읽는 제너레이터.
+    chunk_size 만큼 읽어서 버퍼에 쌓고 JSONDecoder.raw_decode 로 완성된 원소만 꺼내므로,
+    파일 전체를 메모리에 올리지 않음. (메모리 사용량은 원소 하나 + 읽기 단위 수준)
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+
+    def _fill() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # 이미 처리한 앞부분은 버리고 새 청크를 붙임
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def _skip_whitespace() -> bool:
+        # 공백을 건너뛰고, 다음 문자가 버퍼에 있으면 True
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _JSON_WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return True
+            if not _fill():
+                return False
+
+    # UTF-8 BOM 이 있으면 제거
+    _fill()
+    if buffer.startswith('\ufeff'):
+        position = 1
+
+    if not _skip_whitespace() or buffer[position] != '[':
+        raise ValueError("JSON 배열 형식이 아닙니다.")
+    position += 1
+
+    expect_separator = False
+    while True:
+        if not _skip_whitespace():
+            raise ValueError("JSON 배열이 닫히지 않았습니다.")
+        char = buffer[position]
+        if char == ']':
+            return
+        if expect_separator:
+            if char != ',':
+                raise ValueError(f"JSON 배열 구분자(,)가 필요합니다. (위치 근처: {buffer[position:position + 20]!r})")
+            position += 1
+            if not _skip_whitespace():
+                raise ValueError("JSON 배열이 닫히지 않았습니다.")
+
+        # 원소 하나가 완성될 때까지 청크를 더 읽음
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if _fill():
+                    continue
+                raise
+            # 숫자는 "2." 처럼 잘린 앞부분도 디코딩되므로, 값 뒤에 구분 문자가 보일 때까지 더 읽음
+            if (end == len(buffer) or buffer[end] not in _VALUE_TERMINATORS) and _fill():
+                continue
+            break
+        position = end
+        expect_separator = True
+        yield item
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from datetime import datetime, date
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import Table, Numeric, Integer, Date, DateTime, String, Text
+
+from utils.sabangnet_logger import get_logger
+from models.order.receive_order import ReceiveOrder
+
+
+logger = get_logger(__name__)
+
+
+class ReceiveOrderConversionPlan:
+    """
+    receive_orders 테이블 메타데이터로 한 번만 만들어 두는 주문 행 변환 계획.
+    - 컬럼 타입별 변환 함수 매핑 (Numeric -> Decimal, Integer -> int, Date -> date)
+    - 적재용 컬럼 순서 (auto increment / 서버 기본값 컬럼 제외)
+    XML/JSON 수집과 COPY/INSERT 적재가 같은 계획을 공유함.
+    """
+
+    # 수집 시각으로 채우는 컬럼
+    _RECEIVE_DT_COLUMN = 'receive_dt'
+
+    def __init__(self, table: Table = ReceiveOrder.__table__):
+        self.columns = [
+            column for column in table.columns
+            if not column.primary_key and column.server_default is None
+        ]
+        self.column_names = [column.name for column in self.columns]
+        self._converters: list[tuple[str, Callable[[str, Any], Any]]] = []
+        for column in self.columns:
+            converter = self._get_converter(column.type)
+            if converter is not None:
+                self._converters.append((column.name, converter))
+        # 문자열 컬럼은 바이너리 COPY에서 str 타입만 허용하므로 적재 직전에 변환
+        self._text_indexes = [
+            index for index, column in enumerate(self.columns)
+            if isinstance(column.type, (String, Text))
+        ]
+
+    def _get_converter(self, column_type) -> Callable[[str, Any], Any] | None:
+        # DateTime 은 Date 의 하위 타입이 아니지만 순서를 명확히 하기 위해 먼저 확인
+        if isinstance(column_type, DateTime):
+            return None
+        if isinstance(column_type, Numeric):
+            return self._to_decimal
+        if isinstance(column_type, Integer):
+            return self._to_int
+        if isinstance(column_type, Date):
+            return self._to_date
+        return None
+
+    @staticmethod
+    def _to_decimal(field: str, value: Any) -> Decimal | None:
+        try:
+            return Decimal(value) if value != '' else None
+        except Exception as e:
+            logger.error(f"{field} Decimal 변환 실패: {value} ({e})")
+            return None
+
+    @staticmethod
+    def _to_int(field: str, value: Any) -> int | None:
+        try:
+            return int(value) if value != '' else None
+        except Exception as e:
+            logger.error(f"{field} int 변환 실패: {value} ({e})")
+            return None
+
+    @staticmethod
+    def _to_date(field: str, value: Any) -> date | None:
+        if not value:
+            return None
+        try:
+            if len(value) == 8:
+                return datetime.strptime(value, '%Y%m%d').date()
+            elif len(value) == 14:
+                return datetime.strptime(value, '%Y%m%d%H%M%S').date()
+            else:
+                return None
+        except Exception as e:
+            logger.error(f"{field} 변환 실패: {value} ({e})")
+            return None
+
+    def convert(self, order_detail: dict, receive_dt: datetime = None) -> dict:
+        """
+        주문 dict의 금액/수량/날짜 필드를 제자리에서 변환하고 수집 시각을 채워서 반환하는 함수.
+        """
+
+        order_detail[self._RECEIVE_DT_COLUMN] = receive_dt or datetime.now()
+        for field, converter in self._converters:
+            if field in order_detail:
+                order_detail[field] = converter(field, order_detail[field])
+        return order_detail
+
+    def to_records(self, orders: Iterable[dict]) -> list[list]:
+        """
+        변환된 주문 dict를 적재용 컬럼 순서의 행으로 만드는 함수. 없는 컬럼은 None 으로 채움.
+        """
+
+        column_names = self.column_names
+        text_indexes = self._text_indexes
+        records = []
+        for order in orders:
+            record = [order.get(name) for name in column_names]
+            for index in text_indexes:
+                value = record[index]
+                if value is not None and not isinstance(value, str):
+                    record[index] = str(value)
+            records.append(record)
+        return records
+
+
+RECEIVE_ORDER_CONVERSION_PLAN = ReceiveOrderConversionPlan()